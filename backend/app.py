@@ -3,26 +3,51 @@ import os
 load_dotenv()
 
 from flask import Flask
-from database import Base, engine
-from routes import user_bp, room_bp, booking_bp
+from database import Base, engine, replica_engines, dispose_engines
+from routes import user_bp, room_bp, booking_bp, admin_bp
 from config import Config
 from flask import jsonify
-from utils import init_cache, logger, limiter
+from utils import init_cache, compress, init_metrics, init_request_logging, logger, limiter, occupancy, check_schema_head
 from flask_cors import CORS
+from jobs.booking_lifecycle import start_scheduler
+from werkzeug.exceptions import HTTPException
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
-    Base.metadata.create_all(engine)
-    init_cache(app)
+    production = app.config["BOOT_MODE"] == "production"
+    if app.config["PROXY_FIX_X_FOR"]:
+        # Client addresses for anonymous rate limiting come from X-Forwarded-For
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+    if production:
+        # Schema changes go through Alembic only; refuse to serve an outdated schema
+        logger.info(f"Database schema at revision {check_schema_head(engine)}")
+    else:
+        Base.metadata.create_all(engine)
+    init_cache(app, background_probe=production)
+    compress.init_app(app)
     limiter.init_app(app)
+    # Prometheus scrapes must not count against (or be blocked by) the limits
+    limiter.exempt(init_metrics(app, engine, replica_engines))
+    init_request_logging(app)
+
+    # Build the in-memory occupancy calendar before serving requests; in
+    # production the first calendar request builds it (refresh_if_stale)
+    if not production:
+        with app.app_context():
+            occupancy.rebuild()
+
+    if app.config["BOOKING_JOB_INTERVAL"] > 0:
+        start_scheduler(app, app.config["BOOKING_JOB_INTERVAL"])
 
     #blueprint registeration
     app.register_blueprint(user_bp,url_prefix='/api')
     app.register_blueprint(room_bp,url_prefix='/api')
     app.register_blueprint(booking_bp, url_prefix='/api')
+    app.register_blueprint(admin_bp, url_prefix='/api')
 
   
     CORS(app)
@@ -31,8 +56,15 @@ def create_app():
 
     @app.errorhandler(Exception)
     def handle_general_error(err):
+      # Keep 404/405/429 etc. as-is so clients and metrics see the real status
+      if isinstance(err, HTTPException):
+        return err
       return jsonify({"error": "Server Error", "message": str(err)}), 500
 
+    if production:
+        # Workers forked from this process (gunicorn --preload) open their own connections
+        dispose_engines()
+
     return app
 
 
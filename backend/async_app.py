@@ -0,0 +1,64 @@
+"""
+Asyncio serving mode for the read-only catalog endpoints (rooms and
+bookings), on SQLAlchemy's AsyncEngine with asyncpg. One event loop serves
+many concurrent requests without a thread or pooled connection held per
+waiting request. Deploy it next to the WSGI app from create_app() and route
+GET catalog traffic to it, e.g.
+
+    hypercorn --workers 4 --bind 0.0.0.0:5001 "async_app:create_async_app()"
+
+Writes, auth and admin tooling stay on the WSGI app.
+"""
+from dotenv import load_dotenv
+load_dotenv()
+
+import redis
+from cachelib import RedisCache
+from quart import Quart, jsonify, request
+from werkzeug.exceptions import HTTPException
+from config import Config
+from async_database import async_engine
+from routes.async_routes import async_read_bp
+from utils.cache import KEY_PREFIX
+from utils.principals import principals
+from utils.pricing import pricing
+
+
+def create_async_app():
+    app = Quart(__name__)
+    app.config.from_object(Config)
+
+    app.register_blueprint(async_read_bp, url_prefix='/api')
+
+    # Flask-Caching needs a Flask app context, so the principal cache and the
+    # pricing engine reach the shared entries (the sync app's
+    # invalidate_principal, the pricing version) through a client of their
+    # own; lookups are single short Redis round trips
+    shared = RedisCache(
+        host=redis.Redis.from_url(app.config["REDIS_URL"], socket_connect_timeout=0.5, socket_timeout=0.5),
+        key_prefix=KEY_PREFIX,
+        default_timeout=Config.PRINCIPAL_CACHE_TTL
+    )
+    principals.use_shared(shared)
+    pricing.use_shared(shared)
+
+    @app.after_request
+    async def add_cors_headers(response):
+        # Mirrors flask_cors defaults on the WSGI app
+        response.headers.setdefault("Access-Control-Allow-Origin", "*")
+        if request.method == "OPTIONS":
+            response.headers["Access-Control-Allow-Headers"] = "Authorization, Content-Type"
+            response.headers["Access-Control-Allow-Methods"] = "GET, OPTIONS"
+        return response
+
+    @app.after_serving
+    async def dispose_engine():
+        await async_engine.dispose()
+
+    @app.errorhandler(Exception)
+    async def handle_general_error(err):
+        if isinstance(err, HTTPException):
+            return err
+        return jsonify({"error": "Server Error", "message": str(err)}), 500
+
+    return app
@@ -0,0 +1,27 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config import Config
+
+
+def to_async_url(url):
+    """Point a postgresql:// or postgresql+psycopg2:// URL at the asyncpg driver."""
+    scheme, _, rest = url.partition("://")
+    return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else url
+
+
+# Same pool shape and 30 second statement timeout as the sync engine; the
+# async path defaults to the primary unless ASYNC_DATABASE_URL is set
+async_engine = create_async_engine(
+    to_async_url(Config.ASYNC_DATABASE_URL or Config.SQLALCHEMY_DATABASE_URI),
+    echo=False,
+    pool_size=20,
+    max_overflow=40,
+    pool_timeout=30,
+    pool_recycle=3600,
+    pool_pre_ping=True,
+    connect_args={
+        "timeout": 10,
+        "server_settings": {"statement_timeout": "30000"}
+    }
+)
+
+AsyncSession = async_sessionmaker(async_engine, expire_on_commit=False)
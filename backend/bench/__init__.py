@@ -0,0 +1,19 @@
+"""
+Benchmark harness for the booking API.
+
+Run from the backend directory against a disposable database:
+
+    python -m bench.seed --rooms 1000 --users 20000 --bookings 5000000
+    python -m jobs.stats_backfill
+    python -m bench.run --scenario search-heavy --requests 5000 --save bench/baseline.json
+    python -m bench.run --scenario search-heavy --requests 5000 --compare bench/baseline.json
+
+bench.serialization times response encoding alone and connects to no
+database (DATABASE_URL must still be set, to any well-formed URL):
+
+    DATABASE_URL=postgresql://localhost/unused python -m bench.serialization --rows 100
+
+bench.startup times worker boot in the production mode (cold and forked):
+
+    python -m bench.startup --runs 20
+"""
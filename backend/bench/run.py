@@ -0,0 +1,217 @@
+"""
+Drive the real Flask app (create_app) in-process with a scripted request mix
+and report per-endpoint latency percentiles, throughput and SQL statements
+per request. Results can be saved as a baseline and later runs compared
+against it; the exit code is 1 when a run regresses beyond --tolerance.
+
+    python -m bench.run --scenario booking-burst --requests 2000 --concurrency 8
+    python -m bench.run --scenario search-heavy --save bench/baseline.json
+    python -m bench.run --scenario search-heavy --compare bench/baseline.json
+
+Requires a database seeded with bench.seed.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import jwt
+from sqlalchemy import event, func
+from app import create_app
+from config import Config
+from database import Session, engine
+from models import Booking, Room, User
+from utils import limiter
+from bench.scenarios import SCENARIOS
+from bench.seed import ADMIN_EMAIL
+from bench.stats import percentile
+
+_local = threading.local()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    _local.statements = getattr(_local, "statements", 0) + 1
+
+
+class Fixture:
+    """Ids and tokens from the seeded database that scenarios build requests from."""
+
+    def __init__(self, rng):
+        session = Session()
+        try:
+            self.room_ids = [room_id for (room_id,) in session.query(Room.room_id).order_by(Room.room_number)]
+            customer = session.query(User).filter_by(role="customer").first()
+            admin = session.query(User).filter_by(email=ADMIN_EMAIL).first()
+            booking_count = session.query(func.count(Booking.booking_id)).scalar()
+        finally:
+            session.close()
+
+        if not self.room_ids or customer is None or admin is None:
+            sys.exit("Database is not seeded; run `python -m bench.seed` first")
+
+        self.popular_room_ids = rng.sample(self.room_ids, min(20, len(self.room_ids)))
+        self.room_pages = max(1, (len(self.room_ids) + 49) // 50)
+        self.booking_pages = max(1, (booking_count + 99) // 100)
+        self.user_id = customer.user_id
+        self.customer_token = self._token(customer.user_id)
+        self.admin_token = self._token(admin.user_id)
+
+    @staticmethod
+    def _token(user_id):
+        return jwt.encode({
+            "user_id": str(user_id),
+            "exp": datetime.utcnow() + timedelta(hours=12)
+        }, Config.SECRET_KEY, algorithm="HS256")
+
+
+def run_worker(app, fixture, operations, token, count, seed, samples):
+    rng = random.Random(seed)
+    client = app.test_client()
+    headers = {"Authorization": f"Bearer {token}"}
+    weights = [weight for weight, _ in operations]
+    ops = [op for _, op in operations]
+
+    for _ in range(count):
+        op = rng.choices(ops, weights=weights)[0]
+        method, url, body = op(fixture, rng)
+
+        _local.statements = 0
+        started = time.perf_counter()
+        response = client.open(url, method=method, json=body, headers=headers)
+        elapsed = time.perf_counter() - started
+
+        samples.append((op.__name__, response.status_code, elapsed, _local.statements))
+
+
+def summarise(samples, wall_time):
+    by_op = defaultdict(list)
+    for sample in samples:
+        by_op[sample[0]].append(sample)
+
+    ops = {}
+    for name, rows in sorted(by_op.items()):
+        latencies = sorted(row[2] * 1000 for row in rows)
+        statuses = defaultdict(int)
+        for row in rows:
+            statuses[str(row[1])] += 1
+        ops[name] = {
+            "count": len(rows),
+            "errors": sum(1 for row in rows if row[1] >= 500),
+            "statuses": dict(statuses),
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "sql_per_request": round(sum(row[3] for row in rows) / len(rows), 2),
+        }
+
+    return {
+        "requests": len(samples),
+        "wall_time_s": round(wall_time, 3),
+        "throughput_rps": round(len(samples) / wall_time, 2) if wall_time else 0.0,
+        "ops": ops,
+    }
+
+
+def print_report(scenario, result):
+    print(f"\nScenario {scenario}: {result['requests']} requests in {result['wall_time_s']}s "
+          f"({result['throughput_rps']} req/s)\n")
+    print(f"{'operation':<24}{'count':>8}{'5xx':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'sql/req':>9}  statuses")
+    for name, op in result["ops"].items():
+        print(f"{name:<24}{op['count']:>8}{op['errors']:>6}{op['p50_ms']:>10}{op['p95_ms']:>10}"
+              f"{op['p99_ms']:>10}{op['sql_per_request']:>9}  {op['statuses']}")
+
+
+def compare(result, baseline, tolerance):
+    """Print deltas against baseline; return the list of regressions."""
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}):")
+
+    base_rps = baseline["throughput_rps"]
+    if base_rps and result["throughput_rps"] < base_rps * (1 - tolerance):
+        regressions.append(f"throughput {base_rps} -> {result['throughput_rps']} req/s")
+
+    for name, op in result["ops"].items():
+        base = baseline["ops"].get(name)
+        if base is None:
+            print(f"  {name}: not in baseline")
+            continue
+        for metric in ("p95_ms", "p99_ms", "sql_per_request"):
+            before, after = base[metric], op[metric]
+            change = (after - before) / before if before else 0.0
+            print(f"  {name:<24}{metric:<16}{before:>10} -> {after:<10} ({change:+.1%})")
+            if change > tolerance:
+                regressions.append(f"{name} {metric} {before} -> {after}")
+
+    for regression in regressions:
+        print(f"  REGRESSION: {regression}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="search-heavy")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--warmup", type=int, default=50, help="requests issued before measuring")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--save", metavar="PATH", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="allowed relative regression before failing (default 0.10)")
+    args = parser.parse_args()
+
+    app = create_app()
+    # The benchmark measures the handlers, not the per-IP quotas
+    limiter.enabled = False
+
+    rng = random.Random(args.seed)
+    fixture = Fixture(rng)
+    as_admin, operations = SCENARIOS[args.scenario]
+    token = fixture.admin_token if as_admin else fixture.customer_token
+
+    if args.warmup:
+        run_worker(app, fixture, operations, token, args.warmup, args.seed - 1, [])
+
+    samples = []
+    per_worker = [args.requests // args.concurrency] * args.concurrency
+    per_worker[0] += args.requests % args.concurrency
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        workers = [
+            pool.submit(run_worker, app, fixture, operations, token, count, args.seed + i, samples)
+            for i, count in enumerate(per_worker)
+        ]
+        for worker in workers:
+            worker.result()
+    wall_time = time.perf_counter() - started
+
+    result = summarise(samples, wall_time)
+    result.update(scenario=args.scenario, concurrency=args.concurrency, seed=args.seed)
+    print_report(args.scenario, result)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nBaseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("scenario") != args.scenario:
+            sys.exit(f"Baseline is for scenario {baseline.get('scenario')!r}, not {args.scenario!r}")
+        if compare(result, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
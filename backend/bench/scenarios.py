@@ -0,0 +1,76 @@
+"""
+Request mixes driven by bench.run. Each operation builds one request as
+(method, url, json_body) from the seeded fixture data; operations are
+picked at random according to their weight.
+"""
+from datetime import date, timedelta
+
+
+def _stay(rng, max_lead=180):
+    start = date.today() + timedelta(days=rng.randint(1, max_lead))
+    return start, start + timedelta(days=rng.randint(1, 7))
+
+
+def search_available(ctx, rng):
+    start, end = _stay(rng)
+    room_type = rng.choice(("", "&room_type=Single", "&room_type=Double", "&room_type=Suite"))
+    return "GET", f"/api/rooms/available?start={start}&end={end}{room_type}", None
+
+
+def list_rooms(ctx, rng):
+    return "GET", f"/api/rooms?page={rng.randint(1, ctx.room_pages)}", None
+
+
+def get_room(ctx, rng):
+    return "GET", f"/api/room/{rng.choice(ctx.room_ids)}", None
+
+
+def room_calendar(ctx, rng):
+    start = date.today() + timedelta(days=rng.randint(0, 60))
+    return "GET", f"/api/room/{rng.choice(ctx.room_ids)}/calendar?from={start}&to={start + timedelta(days=30)}", None
+
+
+def create_booking(ctx, rng):
+    # Concentrated on a few popular rooms so conflicts actually happen
+    start, end = _stay(rng, max_lead=60)
+    body = {"room_id": str(rng.choice(ctx.popular_room_ids)),
+            "start_date": start.isoformat(), "end_date": end.isoformat()}
+    return "POST", "/api/booking", body
+
+
+def own_bookings(ctx, rng):
+    return "GET", f"/api/user/{ctx.user_id}/bookings", None
+
+
+def admin_bookings_page(ctx, rng):
+    return "GET", f"/api/bookings?page={rng.randint(1, ctx.booking_pages)}&per_page=100", None
+
+
+def admin_bookings_cursor(ctx, rng):
+    return "GET", "/api/bookings?cursor=&per_page=100&estimate=true", None
+
+
+def admin_rooms_calendar(ctx, rng):
+    month = date.today() + timedelta(days=rng.randint(0, 90))
+    return "GET", f"/api/rooms/calendar?month={month:%Y-%m}", None
+
+
+# name -> (as_admin, [(weight, operation), ...])
+SCENARIOS = {
+    "search-heavy": (False, [
+        (60, search_available),
+        (20, list_rooms),
+        (10, get_room),
+        (10, room_calendar),
+    ]),
+    "booking-burst": (False, [
+        (70, create_booking),
+        (20, search_available),
+        (10, own_bookings),
+    ]),
+    "admin-reporting": (True, [
+        (40, admin_bookings_page),
+        (30, admin_bookings_cursor),
+        (30, admin_rooms_calendar),
+    ]),
+}
@@ -0,0 +1,126 @@
+"""
+Seed the database in DATABASE_URL with synthetic users, rooms and bookings.
+
+Rows are streamed with COPY so millions of bookings load in minutes. Each
+room gets a back-to-back sequence of short stays ending a few months in the
+future, so the data respects the booking overlap constraint.
+
+    python -m bench.seed --rooms 1000 --users 20000 --bookings 5000000 --truncate
+"""
+import argparse
+import io
+import random
+import uuid
+from datetime import date, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from werkzeug.security import generate_password_hash
+from config import Config
+from database import Base, engine
+
+ROOM_TYPES = (("Single", 80), ("Double", 120), ("Suite", 250))
+BENCH_PASSWORD = "bench-password"
+ADMIN_EMAIL = "bench-admin@example.com"
+CHUNK_ROWS = 100000
+
+
+def copy_rows(cursor, table, columns, rows):
+    """COPY rows into table in CHUNK_ROWS batches."""
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(str(value) for value in row))
+        buffer.write("\n")
+        count += 1
+        if count % CHUNK_ROWS == 0:
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+            buffer = io.StringIO()
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return count
+
+
+def seeded_uuid(rng):
+    """A version 4 UUID drawn from rng, so a given --seed always yields the same ids."""
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def generate_users(count, password_hash, rng):
+    yield (seeded_uuid(rng), "Bench Admin", ADMIN_EMAIL, "0000000000", password_hash, "admin")
+    for i in range(count):
+        yield (seeded_uuid(rng), f"Bench User {i}", f"bench-user-{i}@example.com",
+               f"{i:010d}", password_hash, "customer")
+
+
+def generate_rooms(count, rng):
+    for i in range(count):
+        room_type, price = ROOM_TYPES[i % len(ROOM_TYPES)]
+        yield (seeded_uuid(rng), f"B{i:05d}", room_type, price + rng.randint(0, 40), "available")
+
+
+def generate_bookings(rooms, user_ids, count, rng):
+    """Back-to-back stays per room, walking backwards from ~90 days ahead."""
+    per_room = max(1, count // len(rooms))
+    horizon = date.today() + timedelta(days=90)
+    produced = 0
+    for room_id, price in rooms:
+        end = horizon - timedelta(days=rng.randint(0, 30))
+        for _ in range(per_room):
+            if produced >= count:
+                return
+            nights = rng.randint(1, 6)
+            start = end - timedelta(days=nights)
+            status = "cancelled" if rng.random() < 0.08 else "active"
+            yield (seeded_uuid(rng), rng.choice(user_ids), room_id, start, end, status, nights * price)
+            end = start - timedelta(days=rng.randint(0, 3))
+            produced += 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible data")
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(engine)
+
+    # Hash once; every bench user shares the password
+    password_hash = generate_password_hash(BENCH_PASSWORD, method=Config.PASSWORD_HASH_METHOD)
+    users = list(generate_users(args.users, password_hash, rng))
+    rooms = list(generate_rooms(args.rooms, rng))
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        if args.truncate:
+            cursor.execute("TRUNCATE bookings, rooms, users")
+
+        copy_rows(cursor, "users", ("user_id", "name", "email", "phone", "password", "role"), users)
+        copy_rows(cursor, "rooms", ("room_id", "room_number", "room_type", "price_per_night", "status"), rooms)
+        booked = copy_rows(
+            cursor, "bookings",
+            ("booking_id", "user_id", "room_id", "start_date", "end_date", "status", "total_price"),
+            generate_bookings([(r[0], r[3]) for r in rooms], [u[0] for u in users[1:]], args.bookings, rng)
+        )
+        connection.commit()
+
+        # Fresh planner statistics, as a long-running database would have
+        cursor.execute("ANALYZE users")
+        cursor.execute("ANALYZE rooms")
+        cursor.execute("ANALYZE bookings")
+        connection.commit()
+    finally:
+        connection.close()
+
+    print(f"Seeded {len(users)} users, {len(rooms)} rooms, {booked} bookings")
+
+
+if __name__ == "__main__":
+    main()
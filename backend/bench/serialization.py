@@ -0,0 +1,108 @@
+"""
+Micro-benchmark of list-endpoint serialization: the marshmallow path
+(Schema(many=True).dump of ORM objects + jsonify) against the fast path
+(column rows + RowSerializer + orjson json_response). Both encode the same
+synthetic page; the bodies are checked to be byte-identical first.
+Opens no database connection, but importing the models still needs
+DATABASE_URL set (any well-formed URL will do).
+
+    python -m bench.serialization --rows 100 --iterations 2000
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import date, timedelta
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from flask import Flask, jsonify
+from sqlalchemy.engine.result import result_tuple
+from config import Config
+from models import Booking, Room
+from schemas import BookingSchema, RoomSchema
+from utils import RowSerializer, json_response
+from bench.stats import percentile
+
+PAGINATION = {"page": 1, "per_page": 100, "total": 100000, "pages": 1000}
+
+
+def make_bookings(count, rng):
+    room_ids = [uuid.uuid4() for _ in range(20)]
+    bookings = []
+    for _ in range(count):
+        start_date = date(2026, 1, 1) + timedelta(days=rng.randrange(365))
+        nights = rng.randint(1, 7)
+        bookings.append(Booking(
+            booking_id=uuid.uuid4(), user_id=uuid.uuid4(), room_id=rng.choice(room_ids),
+            start_date=start_date, end_date=start_date + timedelta(days=nights),
+            status=rng.choice(("active", "completed", "cancelled")), total_price=nights * 120
+        ))
+    return bookings
+
+
+def make_rooms(count, rng):
+    return [
+        Room(room_id=uuid.uuid4(), room_number=f"R{i:04d}", room_type=rng.choice(("Single", "Double", "Suite")),
+             price_per_night=rng.randint(80, 300), status=rng.choice(("available", "booked")))
+        for i in range(count)
+    ]
+
+
+def as_rows(objects, serializer):
+    """The rows a column query for serializer.columns would return."""
+    names = [column.key for column in serializer.columns]
+    make_row = result_tuple(names)
+    return [make_row([getattr(obj, name) for name in names]) for obj in objects]
+
+
+def timed(fn, iterations):
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100, help="rows per page (default 100, the max per_page)")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    cases = [
+        ("bookings", BookingSchema, make_bookings(args.rows, rng), RowSerializer(BookingSchema, Booking)),
+        ("rooms", RoomSchema, make_rooms(args.rows, rng), RowSerializer(RoomSchema, Room)),
+    ]
+
+    with app.app_context():
+        print(f"{args.rows} rows per page, {args.iterations} iterations, debug={app.debug}\n")
+        print(f"{'payload':<10}{'path':<12}{'p50 ms':>10}{'p95 ms':>10}{'speedup':>10}")
+        for name, schema_cls, objects, serializer in cases:
+            rows = as_rows(objects, serializer)
+
+            def marshmallow_path():
+                return jsonify({"data": schema_cls(many=True).dump(objects), "pagination": PAGINATION})
+
+            def fast_path():
+                return json_response({"data": serializer.dump(rows), "pagination": PAGINATION})
+
+            if marshmallow_path().get_data() != fast_path().get_data():
+                raise SystemExit(f"{name}: fast path output differs from the marshmallow path")
+
+            slow = timed(marshmallow_path, args.iterations)
+            fast = timed(fast_path, args.iterations)
+            speedup = percentile(slow, 50) / percentile(fast, 50)
+            print(f"{name:<10}{'marshmallow':<12}{percentile(slow, 50):>10.3f}{percentile(slow, 95):>10.3f}")
+            print(f"{'':<10}{'fast':<12}{percentile(fast, 50):>10.3f}{percentile(fast, 95):>10.3f}{speedup:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Worker start-up time in the production boot mode (BOOT_MODE=production),
+which bounds how fast the worker pool can grow during a traffic spike:
+
+- cold: a fresh interpreter imports the app and runs create_app(), like a
+  gunicorn worker without --preload
+- fork: a child forked from an already booted app answers its first request
+  and opens its first database connection, like a --preload worker
+
+    python -m bench.startup --runs 20
+    python -m bench.startup --runs 20 --budget 0.5
+
+Requires a database migrated to the Alembic head; Redis is optional. Cold
+boots are dominated by imports and reported for comparison; the exit code is
+1 when the p95 of a forked worker exceeds --budget seconds.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+os.environ["BOOT_MODE"] = "production"
+
+from sqlalchemy import text
+from app import create_app
+from database import engine
+from bench.stats import percentile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+COLD_BOOT = "import time; from app import create_app; create_app(); print(time.time(), flush=True)"
+
+
+def time_cold_boot():
+    started = time.time()
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_BOOT], cwd=BACKEND_DIR, env=os.environ,
+        capture_output=True, text=True, check=True
+    )
+    # The last stdout line is the child's clock once create_app() returned
+    return float(result.stdout.strip().splitlines()[-1]) - started
+
+
+def time_forked_worker(app):
+    read_fd, write_fd = os.pipe()
+    started = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            os.close(read_fd)
+            response = app.test_client().get("/metrics")
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            os.write(write_fd, str(response.status_code).encode())
+            status = 0
+        finally:
+            os._exit(status)
+
+    os.close(write_fd)
+    reply = os.read(read_fd, 16)
+    elapsed = time.perf_counter() - started
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    if reply != b"200":
+        raise SystemExit("Forked worker failed to serve its first request")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--budget", type=float, default=1.0, help="max p95 seconds for a forked worker (default 1.0)")
+    args = parser.parse_args()
+
+    preload_started = time.perf_counter()
+    app = create_app()
+    preload = time.perf_counter() - preload_started
+
+    results = {
+        "cold": sorted(time_cold_boot() for _ in range(args.runs)),
+        "fork": sorted(time_forked_worker(app) for _ in range(args.runs)),
+    }
+
+    print(f"{args.runs} runs per mode; create_app() in this process took {preload * 1000:.1f} ms\n")
+    print(f"{'mode':<8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for mode, samples in results.items():
+        print(f"{mode:<8}{percentile(samples, 50) * 1000:>10.1f}{percentile(samples, 95) * 1000:>10.1f}{samples[-1] * 1000:>10.1f}")
+
+    if percentile(results["fork"], 95) > args.budget:
+        print(f"\np95 forked worker start-up exceeds the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
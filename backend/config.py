@@ -3,4 +3,107 @@ import os
 class Config:
     DEBUG = True
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
-    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
\ No newline at end of file
+    SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
+
+    # "production" boots without DDL: create_all is skipped and the database
+    # must already be at the Alembic head, the occupancy calendar is built on
+    # first use and the Redis probe runs in the background, so a (pre-forked)
+    # worker starts serving at once
+    BOOT_MODE = os.getenv("BOOT_MODE", "development")
+
+    # Authenticated principals cached per process (seconds / entries); other
+    # workers may see a role or name change for up to the TTL
+    PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 60))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+
+    # Window of the in-memory occupancy calendar, relative to today
+    OCCUPANCY_PAST_DAYS = int(os.getenv("OCCUPANCY_PAST_DAYS", 365))
+    OCCUPANCY_FUTURE_DAYS = int(os.getenv("OCCUPANCY_FUTURE_DAYS", 730))
+
+    # Optional read replicas (comma-separated URLs) for read-only endpoints
+    DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+    REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", 2))
+    REPLICA_LAG_CHECK_INTERVAL = float(os.getenv("REPLICA_LAG_CHECK_INTERVAL", 5))
+    # Reads stay on the primary this long after a user's own write
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", 5))
+
+    # Database for the asyncio read path (async_app); defaults to DATABASE_URL
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+
+    # Completing past bookings / reconciling room status (jobs.booking_lifecycle);
+    # an interval > 0 also runs it in-process from create_app()
+    BOOKING_JOB_INTERVAL = int(os.getenv("BOOKING_JOB_INTERVAL", 0))
+    BOOKING_JOB_CHUNK_SIZE = int(os.getenv("BOOKING_JOB_CHUNK_SIZE", 1000))
+
+    # Password hashing: werkzeug method string (e.g. "pbkdf2:sha256:600000" or
+    # "scrypt:32768:8:1"); hashes made with other parameters are upgraded on
+    # the user's next login. Hashing runs in a per-worker process pool that
+    # admits at most PASSWORD_HASH_MAX_PENDING jobs, then answers 503.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256:600000")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 8))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", 5))
+
+    # Logging: records go through a queue to a writer thread as JSON lines;
+    # LOG_SAMPLE_RATES keeps a fraction of records per level, e.g. "INFO=0.1"
+    # (unlisted levels are all kept). LOG_ROTATION "external" (the default)
+    # appends to logs/app.log from every worker and leaves rotation to
+    # logrotate; "size" or "time" rotate in-process, one app.<pid>.log each.
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+    LOG_ROTATION = os.getenv("LOG_ROTATION", "external")
+    LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 50 * 1024 * 1024))
+    LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "midnight")
+    LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 7))
+
+    # Rate limits are counted in Redis so every worker shares them; while it is
+    # unreachable each worker falls back to counting in memory
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", REDIS_URL)
+    RATELIMIT_STORAGE_OPTIONS = {"socket_connect_timeout": 2, "socket_timeout": 2}
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    RATELIMIT_KEY_PREFIX = "hotel_booking_rl"
+    # Per-user budget shared by all routes; each request costs its weight
+    # (COST_READ / COST_WRITE / COST_EXPORT in utils.limiter)
+    RATELIMIT_BUDGET = os.getenv("RATELIMIT_BUDGET", "600 per minute")
+    # Number of reverse proxies in front of the app whose X-Forwarded-For is trusted
+    PROXY_FIX_X_FOR = int(os.getenv("PROXY_FIX_X_FOR", 0))
+
+    # shared_cached: how long stale entries are served while one request
+    # refreshes them, the refresh lock's lifetime, and how long concurrent
+    # misses wait for the request computing the entry (seconds)
+    CACHE_STALE_SECONDS = int(os.getenv("CACHE_STALE_SECONDS", 30))
+    CACHE_LOCK_SECONDS = int(os.getenv("CACHE_LOCK_SECONDS", 10))
+    CACHE_WAIT_SECONDS = float(os.getenv("CACHE_WAIT_SECONDS", 2))
+
+    # Booking exports stream from a server-side cursor in batches of this many
+    # rows; their transaction gets its own statement_timeout (ms, 0 = none)
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 2000))
+    EXPORT_STATEMENT_TIMEOUT = int(os.getenv("EXPORT_STATEMENT_TIMEOUT", 600000))
+
+    # Response compression (Flask-Compress), negotiated from Accept-Encoding;
+    # bodies under COMPRESS_MIN_SIZE bytes are sent as-is. Streamed responses
+    # (booking exports gzip themselves) are never buffered to be compressed.
+    COMPRESS_ALGORITHM = ["br", "gzip"]
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+    COMPRESS_BR_LEVEL = int(os.getenv("COMPRESS_BR_LEVEL", 4))
+    COMPRESS_STREAMS = False
+
+    # Nightly prices (utils.pricing) are precomputed per room for this many
+    # days from today; stays reaching further are priced night by night
+    PRICING_WINDOW_DAYS = int(os.getenv("PRICING_WINDOW_DAYS", 730))
+
+    # Room holds during checkout: how long a hold lasts, how many a guest may
+    # keep at once, and the hold store's write lock (lifetime / max wait, s)
+    HOLD_SECONDS = int(os.getenv("HOLD_SECONDS", 300))
+    HOLD_MAX_PER_USER = int(os.getenv("HOLD_MAX_PER_USER", 3))
+    HOLD_LOCK_SECONDS = int(os.getenv("HOLD_LOCK_SECONDS", 5))
+    HOLD_WAIT_SECONDS = float(os.getenv("HOLD_WAIT_SECONDS", 2))
+
+    # Idempotency-Key on write routes: how long a response is kept for
+    # replay, the in-flight marker's lifetime, and how long a concurrent
+    # duplicate waits for the first request's response (seconds)
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 86400))
+    IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", 30))
+    IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", 10))
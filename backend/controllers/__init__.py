@@ -1,11 +1,23 @@
 from controllers.user_controller import  register_user, login_user, get_user, update_user
 
-from controllers.room_controller import get_all_rooms, get_room , create_room, update_room, delete_room
+from controllers.room_controller import get_all_rooms, get_available_rooms, get_room , create_room, update_room, delete_room, get_room_calendar, get_rooms_calendar, flag_held_rooms
 
-from controllers.booking_controller import create_booking, get_booking, get_all_bookings, get_user_bookings, update_booking, delete_booking, cancel_booking
+from controllers.booking_controller import create_booking, create_bookings_batch, get_booking, get_all_bookings, get_user_bookings, update_booking, delete_booking, cancel_booking, export_bookings
+
+from controllers.stats_controller import get_admin_stats
+
+from controllers.hold_controller import hold_room, release_hold
+
+from controllers.pricing_controller import create_quotes, get_rate_rules, create_rate_rule, delete_rate_rule, get_stay_discounts, create_stay_discount, delete_stay_discount
 
 __all__ = ['register_user', 'login_user', 'get_user', 'update_user']
 
-__all__.extend(['get_all_rooms', 'get_room', 'create_room', 'update_room', 'delete_room'])
+__all__.extend(['get_all_rooms', 'get_available_rooms', 'get_room', 'create_room', 'update_room', 'delete_room', 'get_room_calendar', 'get_rooms_calendar', 'flag_held_rooms'])
+
+__all__.extend(['create_booking', 'create_bookings_batch', 'get_booking', 'get_all_bookings', 'get_user_bookings', 'update_booking', 'delete_booking', 'cancel_booking', 'export_bookings'])
+
+__all__.extend(['get_admin_stats'])
+
+__all__.extend(['create_quotes', 'get_rate_rules', 'create_rate_rule', 'delete_rate_rule', 'get_stay_discounts', 'create_stay_discount', 'delete_stay_discount'])
 
-__all__.extend(['create_booking', 'get_booking', 'get_all_bookings', 'get_user_bookings', 'update_booking', 'delete_booking', 'cancel_booking'])
\ No newline at end of file
+__all__.extend(['hold_room', 'release_hold'])
\ No newline at end of file
@@ -0,0 +1,185 @@
+import asyncio
+import uuid
+from datetime import date
+from quart import jsonify, request, g
+from sqlalchemy import select
+from models import Booking as B, Room as R
+from async_database import AsyncSession
+from schemas import BookingSchema, RoomSchema
+from utils import logger, pricing
+from utils.pagination import paginate_async
+
+# Async counterparts of the read-only room and booking controllers. They
+# return the same payloads; BookingSchema only dumps columns, so no
+# relationship loading is needed.
+
+async def get_all_rooms():
+    async with AsyncSession() as session:
+        try:
+            status = request.args.get('status', None, type=str)
+            room_type = request.args.get('room_type', None, type=str)
+
+            stmt = select(R)
+            if status:
+                stmt = stmt.filter_by(status=status)
+            if room_type:
+                stmt = stmt.filter_by(room_type=room_type)
+
+            rooms, pagination = await paginate_async(session, stmt, [R.room_number], request.args)
+
+            schema = RoomSchema(many=True)
+            logger.info(f"User {g.current_user.user_id} fetched rooms (page {pagination.get('page', 'cursor')})")
+
+            return jsonify({
+                "data": schema.dump(rooms),
+                "pagination": pagination
+            }), 200
+        except ValueError as ve:
+            return jsonify({"message": str(ve)}), 400
+        except Exception as e:
+            logger.error(f"Error fetching all rooms: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+async def get_available_rooms():
+    try:
+        start_date = date.fromisoformat(request.args.get('start', ''))
+        end_date = date.fromisoformat(request.args.get('end', ''))
+    except ValueError:
+        return jsonify({"message": "start and end must be dates in YYYY-MM-DD format"}), 400
+
+    nights = (end_date - start_date).days
+    if nights <= 0:
+        return jsonify({"message": "end must be after start"}), 400
+
+    async with AsyncSession() as session:
+        try:
+            room_type = request.args.get('room_type', None, type=str)
+            min_price = request.args.get('min_price', None, type=int)
+            max_price = request.args.get('max_price', None, type=int)
+
+            overlapping = select(B.booking_id).where(
+                B.room_id == R.room_id,
+                B.status == 'active',
+                B.start_date < end_date,
+                B.end_date > start_date
+            )
+            stmt = select(R).where(~overlapping.exists())
+
+            if room_type:
+                stmt = stmt.where(R.room_type == room_type)
+            if min_price is not None:
+                stmt = stmt.where(R.price_per_night >= min_price)
+            if max_price is not None:
+                stmt = stmt.where(R.price_per_night <= max_price)
+
+            rooms, pagination = await paginate_async(session, stmt, [R.room_number], request.args)
+
+            schema = RoomSchema(many=True)
+            data = schema.dump(rooms)
+            # Same rate calendar as the sync search; it may query on a rebuild, so off the loop
+            quotes = await asyncio.to_thread(pricing.quote_many, [(room.room_id, start_date, end_date) for room in rooms])
+            for item, room, quote in zip(data, rooms, quotes):
+                item['total_price'] = quote.total_price if quote else nights * room.price_per_night
+
+            logger.info(f"User {g.current_user.user_id} searched available rooms {start_date} - {end_date} (page {pagination.get('page', 'cursor')})")
+
+            return jsonify({
+                "data": data,
+                "pagination": pagination
+            }), 200
+        except ValueError as ve:
+            return jsonify({"message": str(ve)}), 400
+        except Exception as e:
+            logger.error(f"Error searching available rooms: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+async def get_room(room_id):
+    try:
+        room_id = uuid.UUID(str(room_id))
+    except ValueError:
+        return jsonify({"message": "Invalid room ID format"}), 400
+
+    async with AsyncSession() as session:
+        try:
+            room = await session.get(R, room_id)
+            if room:
+                logger.info(f"User {g.current_user.user_id} fetched room {room_id}")
+                return RoomSchema().dump(room), 200
+            else:
+                return jsonify({"message": "Room not found"}), 404
+        except Exception as e:
+            logger.error(f"Error fetching room {room_id}: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+async def get_booking(booking_id):
+    async with AsyncSession() as session:
+        try:
+            booking = await session.get(B, booking_id)
+            if not booking:
+                return jsonify({"message": "Booking not found"}), 404
+
+            logger.info(f"Booking {booking_id} fetched by user {g.current_user.user_id}")
+            return BookingSchema().dump(booking), 200
+        except Exception as e:
+            logger.error(f"Error fetching booking {booking_id}: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+async def get_all_bookings():
+    async with AsyncSession() as session:
+        try:
+            status = request.args.get('status', None, type=str)
+
+            stmt = select(B)
+            if status:
+                stmt = stmt.filter_by(status=status)
+
+            bookings, pagination = await paginate_async(
+                session, stmt, [B.start_date, B.booking_id], request.args
+            )
+
+            schema = BookingSchema(many=True)
+            logger.info(f"Admin fetched bookings (page {pagination.get('page', 'cursor')})")
+
+            return jsonify({
+                "data": schema.dump(bookings),
+                "pagination": pagination
+            }), 200
+        except ValueError as ve:
+            return jsonify({"message": str(ve)}), 400
+        except Exception as e:
+            logger.error(f"Error fetching all bookings: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+async def get_user_bookings(user_id):
+    try:
+        user_id = uuid.UUID(str(user_id))
+    except ValueError:
+        return jsonify({"message": "Invalid user ID format"}), 400
+
+    if g.current_user.user_id != user_id and g.current_user.role != 'admin':
+        return jsonify({"message": "You are not allowed to view these bookings"}), 403
+
+    async with AsyncSession() as session:
+        try:
+            status = request.args.get('status', None, type=str)
+
+            stmt = select(B).filter_by(user_id=user_id)
+            if status:
+                stmt = stmt.filter_by(status=status)
+
+            bookings, pagination = await paginate_async(
+                session, stmt, [B.start_date, B.booking_id], request.args
+            )
+
+            schema = BookingSchema(many=True)
+            logger.info(f"User {g.current_user.user_id} fetched bookings for user {user_id} (page {pagination.get('page', 'cursor')})")
+
+            return jsonify({
+                "data": schema.dump(bookings),
+                "pagination": pagination
+            }), 200
+        except ValueError as ve:
+            return jsonify({"message": str(ve)}), 400
+        except Exception as e:
+            logger.error(f"Error fetching bookings for user {user_id}: {str(e)}")
+            return jsonify({"message": "Server Error", "error": str(e)}), 500
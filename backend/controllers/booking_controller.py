@@ -1,11 +1,54 @@
-from flask import jsonify, request, g
-from models import Booking as B, Room as R
-from database import Session
+import csv
+import io
+import zlib
+import orjson
+from datetime import date
+from flask import Response, jsonify, request, g, stream_with_context
+from models import Booking as B
+from database import Session, ReadSession
+from config import Config
 from schemas import BookingSchema
 from marshmallow import ValidationError
-from utils import cache, logger
+from controllers.user_controller import server_busy
+from utils import invalidate, logger, paginate, occupancy, pricing, holds, HoldStoreBusy, add_booking_stats, remove_booking_stats, RowSerializer, json_response
 import uuid
+from sqlalchemy import Integer, Date, and_, column, insert, select, text, values
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+
+# SQLSTATE raised by the excl_booking_room_dates exclusion constraint
+EXCLUSION_VIOLATION = '23P01'
+
+# Statuses whose nights count as taken in the occupancy calendar
+OCCUPYING_STATUSES = ('active', 'completed')
+
+# List endpoints select BookingSchema's columns as rows instead of Booking objects
+booking_rows = RowSerializer(BookingSchema, B)
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+BOOKING_STATUSES = ('active', 'completed', 'cancelled')
+
+BATCH_MODES = ('all_or_nothing', 'partial')
+MAX_BATCH_SIZE = 500
+BATCH_INSERT_ATTEMPTS = 3
+
+def is_overlap_violation(error):
+    return getattr(error.orig, 'pgcode', None) == EXCLUSION_VIOLATION
+
+def invalidate_booking_caches(user_id, booking_ids=()):
+    """
+    Invalidate only what a booking write can change: the availability
+    search, the owner's booking lists, the admin booking list and stats, and
+    the bookings themselves.
+    """
+    invalidate(
+        'bookings',
+        'stats',
+        'availability',
+        f'user_{user_id}_bookings',
+        *(f'booking_{booking_id}' for booking_id in booking_ids)
+    )
 
 def existing_booking(booking_id):
     session = Session()
@@ -19,32 +62,34 @@ def create_booking():
     try:
         booking_data = schema.load(request.json)
 
-        existing = session.query(B).filter(
-            B.room_id == booking_data['room_id'],
-            B.status == 'active',
-            B.start_date < booking_data['end_date'],
-            B.end_date > booking_data['start_date']
-        ).first()
-
-        if existing:
-            return jsonify({"message": "Room is already booked for this date range"}), 400
-        
-        total_price = calculate_total_price(session, booking_data['room_id'],
-                                            booking_data['start_date'], booking_data['end_date'])
-        if total_price is None:
+        # Overlaps are rejected by the exclusion constraint on insert, so there
+        # is no separate check-then-insert race to lose
+        quote = pricing.quote(booking_data['room_id'], booking_data['start_date'], booking_data['end_date'])
+        if quote is None:
             return jsonify({"message": "Room not found"}), 404
+        stay = (booking_data['room_id'], booking_data['start_date'], booking_data['end_date'])
 
-        new_booking = B(
-            user_id=g.current_user.user_id,
-            room_id=booking_data['room_id'],
-            start_date=booking_data['start_date'],
-            end_date=booking_data['end_date'],
-            total_price=total_price
-        )
+        # The room's hold lock covers the hold check, the commit and the convert
+        with holds.claim([stay], g.current_user.user_id) as claim:
+            if claim.conflicts:
+                return jsonify({"message": "Room is held by another guest for these dates"}), 409
 
-        session.add(new_booking)
-        session.commit()
-        cache.clear()
+            new_booking = B(
+                user_id=g.current_user.user_id,
+                room_id=booking_data['room_id'],
+                start_date=booking_data['start_date'],
+                end_date=booking_data['end_date'],
+                total_price=quote.total_price
+            )
+
+            session.add(new_booking)
+            session.flush()
+            add_booking_stats(session, [new_booking.booking_id])
+            session.commit()
+            claim.convert([stay])
+
+        invalidate_booking_caches(new_booking.user_id)
+        occupancy.book(new_booking.room_id, new_booking.start_date, new_booking.end_date)
         logger.info(f"Booking created successfully by user {g.current_user.user_id}")
 
         return jsonify({
@@ -54,6 +99,15 @@ def create_booking():
 
     except ValidationError as ve:
         return jsonify({"message": "Validation Error", "errors": ve.messages}), 400
+    except HoldStoreBusy:
+        session.rollback()
+        return server_busy()
+    except IntegrityError as ie:
+        session.rollback()
+        if is_overlap_violation(ie):
+            return jsonify({"message": "Room is already booked for this date range"}), 409
+        logger.error(f"Error creating booking: {str(ie)}")
+        return jsonify({"message": "Server Error", "error": str(ie)}), 500
     except Exception as e:
         session.rollback()
         logger.error(f"Error creating booking: {str(e)}")
@@ -61,8 +115,179 @@ def create_booking():
     finally:
         session.close()
 
-def get_booking(booking_id):
+def create_bookings_batch():
+    payload = request.json or {}
+    mode = payload.get('mode', 'all_or_nothing')
+    items = payload.get('bookings')
+
+    if mode not in BATCH_MODES:
+        return jsonify({"message": f"mode must be one of: {', '.join(BATCH_MODES)}"}), 400
+    if not isinstance(items, list) or not items:
+        return jsonify({"message": "bookings must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({"message": f"A batch may contain at most {MAX_BATCH_SIZE} bookings"}), 400
+
+    schema = BookingSchema(many=True)
+    rejected = {}
+    try:
+        booking_data = schema.load(items)
+    except ValidationError as ve:
+        booking_data = ve.valid_data
+        for index, errors in ve.messages.items():
+            rejected[index] = {"index": index, "status": "rejected",
+                               "message": "Validation Error", "errors": errors}
+
+    for index, data in enumerate(booking_data):
+        if index not in rejected and data['end_date'] <= data['start_date']:
+            rejected[index] = {"index": index, "status": "rejected",
+                               "message": "Validation Error",
+                               "errors": {"end_date": ["Must be after start_date."]}}
+
+    if rejected and mode == 'all_or_nothing':
+        return jsonify({"message": "Batch rejected", "results": list(rejected.values())}), 400
+
+    pending = [i for i in range(len(booking_data)) if i not in rejected]
+    stays = [(booking_data[i]['room_id'], booking_data[i]['start_date'], booking_data[i]['end_date']) for i in pending]
+
     session = Session()
+    try:
+        # The batch's rooms stay hold-locked from the hold check to the convert
+        with holds.claim(stays, g.current_user.user_id) as claim:
+            held = {pending[k] for k in claim.conflicts}
+
+            # A concurrent writer can still take a room between the overlap query
+            # and the insert; the exclusion constraint catches that and we re-plan
+            for attempt in range(BATCH_INSERT_ATTEMPTS):
+                results, rows = plan_batch(session, booking_data, rejected, held)
+                conflicts = len(results) - len(rows) - len(rejected)
+
+                if mode == 'all_or_nothing' and conflicts:
+                    session.rollback()
+                    return jsonify({"message": "Batch rejected", "results": results}), 409
+                if not rows:
+                    session.rollback()
+                    return jsonify({"message": "No bookings created", "results": results}), 409
+
+                try:
+                    session.execute(insert(B).values(rows))
+                    add_booking_stats(session, [row['booking_id'] for row in rows])
+                    session.commit()
+                    break
+                except IntegrityError as ie:
+                    session.rollback()
+                    if not is_overlap_violation(ie) or attempt == BATCH_INSERT_ATTEMPTS - 1:
+                        raise
+
+            claim.convert([(row['room_id'], row['start_date'], row['end_date']) for row in rows])
+
+        invalidate_booking_caches(g.current_user.user_id)
+        for row in rows:
+            occupancy.book(row['room_id'], row['start_date'], row['end_date'])
+        logger.info(f"Batch of {len(rows)} bookings created by user {g.current_user.user_id}")
+
+        return jsonify({
+            "message": "Bookings created successfully",
+            "created": len(rows),
+            "rejected": len(results) - len(rows),
+            "results": results
+        }), 201
+
+    except HoldStoreBusy:
+        session.rollback()
+        return server_busy()
+    except IntegrityError as ie:
+        if is_overlap_violation(ie):
+            return jsonify({"message": "Rooms in this batch are being booked concurrently, please retry"}), 409
+        logger.error(f"Error creating booking batch: {str(ie)}")
+        return jsonify({"message": "Server Error", "error": str(ie)}), 500
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error creating booking batch: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def plan_batch(session, booking_data, rejected, held):
+    """
+    Price every valid batch item in one pricing call and overlap-check them
+    with one VALUES join against bookings; indexes in held are rejected as
+    held by another guest. Returns the per-item results and the rows to
+    insert for the accepted items.
+    """
+    pending = [i for i in range(len(booking_data)) if i not in rejected]
+    results = dict(rejected)
+    if not pending:
+        # Nothing to check; an empty VALUES list is not valid SQL
+        return [results[i] for i in range(len(booking_data))], []
+
+    quotes = dict(zip(pending, pricing.quote_many([
+        (booking_data[i]['room_id'], booking_data[i]['start_date'], booking_data[i]['end_date'])
+        for i in pending
+    ])))
+
+    candidates = values(
+        column('idx', Integer),
+        column('room_id', UUID(as_uuid=True)),
+        column('start_date', Date),
+        column('end_date', Date),
+        name='candidates'
+    ).data([
+        (i, booking_data[i]['room_id'], booking_data[i]['start_date'], booking_data[i]['end_date'])
+        for i in pending
+    ])
+    conflicting = {
+        idx for (idx,) in session.query(candidates.c.idx).select_from(candidates).join(
+            B, and_(
+                B.room_id == candidates.c.room_id,
+                B.status == 'active',
+                B.start_date < candidates.c.end_date,
+                B.end_date > candidates.c.start_date
+            )
+        ).distinct()
+    }
+
+    rows = []
+    accepted = {}
+    for i in pending:
+        data = booking_data[i]
+        room_id, start_date, end_date = data['room_id'], data['start_date'], data['end_date']
+
+        if quotes[i] is None:
+            results[i] = {"index": i, "status": "rejected", "message": "Room not found"}
+            continue
+        if i in conflicting:
+            results[i] = {"index": i, "status": "rejected",
+                          "message": "Room is already booked for this date range"}
+            continue
+        if i in held:
+            results[i] = {"index": i, "status": "rejected",
+                          "message": "Room is held by another guest for these dates"}
+            continue
+        if any(start_date < other_end and end_date > other_start
+               for other_start, other_end in accepted.get(room_id, [])):
+            results[i] = {"index": i, "status": "rejected",
+                          "message": "Overlaps another booking in this batch"}
+            continue
+
+        accepted.setdefault(room_id, []).append((start_date, end_date))
+        booking_id = uuid.uuid4()
+        total_price = quotes[i].total_price
+        rows.append({
+            "booking_id": booking_id,
+            "user_id": g.current_user.user_id,
+            "room_id": room_id,
+            "start_date": start_date,
+            "end_date": end_date,
+            "status": 'active',
+            "total_price": total_price
+        })
+        results[i] = {"index": i, "status": "created",
+                      "booking_id": str(booking_id), "total_price": total_price}
+
+    return [results[i] for i in range(len(booking_data))], rows
+
+def get_booking(booking_id):
+    session = ReadSession()
     try:
         booking = session.query(B).options(
             joinedload(B.room),
@@ -83,45 +308,28 @@ def get_booking(booking_id):
         session.close()
 
 def get_all_bookings():
-    session = Session()
+    session = ReadSession()
     try:
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
         status = request.args.get('status', None, type=str)
         
-        # Limit per_page to prevent abuse
-        per_page = min(per_page, 100)
-        
-        # Build query with eager loading
-        query = session.query(B).options(
-            joinedload(B.room),
-            joinedload(B.user)
-        )
+        # Build query
+        query = session.query(*booking_rows.columns)
         
         # Apply filters
         if status:
-            query = query.filter_by(status=status)
-        
-        # Get total count for pagination info
-        total_count = query.count()
+            query = query.filter(B.status == status)
         
-        # Apply pagination
-        offset = (page - 1) * per_page
-        bookings = query.offset(offset).limit(per_page).all()
+        # Offset or keyset pagination on the (start_date, booking_id) index
+        bookings, pagination = paginate(session, query, [B.start_date, B.booking_id])
         
-        schema = BookingSchema(many=True)
-        logger.info(f"Admin fetched bookings (page {page})")
+        logger.info(f"Admin fetched bookings (page {pagination.get('page', 'cursor')})")
         
-        return jsonify({
-            "data": schema.dump(bookings),
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total_count,
-                "pages": (total_count + per_page - 1) // per_page
-            }
+        return json_response({
+            "data": booking_rows.dump(bookings),
+            "pagination": pagination
         }), 200
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
     except Exception as e:
         logger.error(f"Error fetching all bookings: {str(e)}")
         return jsonify({"message": "Server Error", "error": str(e)}), 500
@@ -140,25 +348,51 @@ def update_booking(booking_id):
 
         schema = BookingSchema(partial=True)
         booking_data = schema.load(request.json)
+        previous = (booking.room_id, booking.start_date, booking.end_date, booking.status)
+        remove_booking_stats(session, [booking.booking_id])
 
         for key, value in booking_data.items():
             setattr(booking, key, value)
 
-        if any(key in booking_data for key in ['start_date', 'end_date', 'room_id']):
-            total_price = calculate_total_price(session, booking.room_id,
-                                                booking.start_date, booking.end_date)
-            if total_price is None:
+        moved = any(key in booking_data for key in ['start_date', 'end_date', 'room_id'])
+        if moved:
+            quote = pricing.quote(booking.room_id, booking.start_date, booking.end_date)
+            if quote is None:
+                session.rollback()
                 return jsonify({"message": "Room not found"}), 404
-            booking.total_price = total_price
+            booking.total_price = quote.total_price
 
-        session.commit()
-        cache.clear()
+        # Moving an occupying booking checks and converts holds under the room's hold lock
+        stays = [(booking.room_id, booking.start_date, booking.end_date)]
+        with holds.claim(stays if moved and booking.status in OCCUPYING_STATUSES else [], booking.user_id) as claim:
+            if claim.conflicts:
+                session.rollback()
+                return jsonify({"message": "Room is held by another guest for these dates"}), 409
+
+            add_booking_stats(session, [booking.booking_id])
+            session.commit()
+            claim.convert(stays)
+
+        invalidate_booking_caches(booking.user_id, [booking_id])
+        if previous[3] in OCCUPYING_STATUSES:
+            occupancy.release(*previous[:3])
+        if booking.status in OCCUPYING_STATUSES:
+            occupancy.book(booking.room_id, booking.start_date, booking.end_date)
         logger.info(f"Booking {booking_id} updated by user {g.current_user.user_id}")
         return jsonify({"message": "Booking updated successfully"}), 200
 
     except ValidationError as ve:
         session.rollback()
         return jsonify({"message": "Validation Error", "errors": ve.messages}), 400
+    except HoldStoreBusy:
+        session.rollback()
+        return server_busy()
+    except IntegrityError as ie:
+        session.rollback()
+        if is_overlap_violation(ie):
+            return jsonify({"message": "Room is already booked for this date range"}), 409
+        logger.error(f"Error updating booking {booking_id}: {str(ie)}")
+        return jsonify({"message": "Server Error", "error": str(ie)}), 500
     except Exception as e:
         session.rollback()
         logger.error(f"Error updating booking {booking_id}: {str(e)}")
@@ -176,9 +410,12 @@ def delete_booking(booking_id):
         if booking.user_id != g.current_user.user_id and g.current_user.role != 'admin':
             return jsonify({"message": "You are not allowed to delete this booking"}), 403
 
+        remove_booking_stats(session, [booking.booking_id])
         session.delete(booking)
         session.commit()
-        cache.clear()
+        invalidate_booking_caches(booking.user_id, [booking_id])
+        if booking.status in OCCUPYING_STATUSES:
+            occupancy.release(booking.room_id, booking.start_date, booking.end_date)
         logger.info(f"Booking {booking_id} deleted by user {g.current_user.user_id}")
         return jsonify({"message": "Booking deleted successfully"}), 200
 
@@ -199,9 +436,14 @@ def cancel_booking(booking_id):
         if booking.user_id != g.current_user.user_id and g.current_user.role != 'admin':
             return jsonify({"message": "You are not allowed to cancel this booking"}), 403
 
+        was_active = booking.status in OCCUPYING_STATUSES
+        remove_booking_stats(session, [booking.booking_id])
         booking.status = 'cancelled'
+        add_booking_stats(session, [booking.booking_id])
         session.commit()
-        cache.clear()
+        invalidate_booking_caches(booking.user_id, [booking_id])
+        if was_active:
+            occupancy.release(booking.room_id, booking.start_date, booking.end_date)
         logger.info(f"Booking {booking_id} cancelled by user {g.current_user.user_id}")
         return jsonify({"message": "Booking cancelled successfully"}), 200
 
@@ -213,7 +455,7 @@ def cancel_booking(booking_id):
         session.close()
 
 def get_user_bookings(user_id):
-    session = Session()
+    session = ReadSession()
     try:
         user_id = uuid.UUID(str(user_id))
     except ValueError:
@@ -224,53 +466,99 @@ def get_user_bookings(user_id):
         if g.current_user.user_id != user_id and g.current_user.role != 'admin':
             return jsonify({"message": "You are not allowed to view these bookings"}), 403
 
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
         status = request.args.get('status', None, type=str)
         
-        # Limit per_page to prevent abuse
-        per_page = min(per_page, 100)
-        
-        # Build query with eager loading
-        query = session.query(B).options(
-            joinedload(B.room)
-        ).filter_by(user_id=user_id)
+        # Build query
+        query = session.query(*booking_rows.columns).filter(B.user_id == user_id)
         
         # Apply filters
         if status:
-            query = query.filter_by(status=status)
-        
-        # Get total count for pagination info
-        total_count = query.count()
+            query = query.filter(B.status == status)
         
-        # Apply pagination
-        offset = (page - 1) * per_page
-        bookings = query.offset(offset).limit(per_page).all()
+        # Offset or keyset pagination on the (user_id, start_date, booking_id) index
+        bookings, pagination = paginate(session, query, [B.start_date, B.booking_id])
         
-        schema = BookingSchema(many=True)
-        logger.info(f"User {g.current_user.user_id} fetched bookings for user {user_id} (page {page})")
+        logger.info(f"User {g.current_user.user_id} fetched bookings for user {user_id} (page {pagination.get('page', 'cursor')})")
         
-        return jsonify({
-            "data": schema.dump(bookings),
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total_count,
-                "pages": (total_count + per_page - 1) // per_page
-            }
+        return json_response({
+            "data": booking_rows.dump(bookings),
+            "pagination": pagination
         }), 200
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
     except Exception as e:
         logger.error(f"Error fetching bookings for user {user_id}: {str(e)}")
         return jsonify({"message": "Server Error", "error": str(e)}), 500
     finally:
         session.close()
 
-def calculate_total_price(session, room_id, start_date, end_date):
-    room = session.query(R).filter_by(room_id=room_id).first()
-    if not room:
-        return None
-    period = (end_date - start_date).days
-    if period <= 0:
-        return None
-    return period * room.price_per_night
+def export_bookings():
+    export_format = request.args.get('format', 'csv', type=str)
+    status = request.args.get('status', None, type=str)
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"message": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+    if status and status not in BOOKING_STATUSES:
+        return jsonify({"message": f"status must be one of: {', '.join(BOOKING_STATUSES)}"}), 400
+
+    try:
+        start_date = date.fromisoformat(request.args['from']) if 'from' in request.args else None
+        last_date = date.fromisoformat(request.args['to']) if 'to' in request.args else None
+    except ValueError:
+        return jsonify({"message": "from and to must be dates in YYYY-MM-DD format"}), 400
+
+    # Bookings whose stay starts in [from, to], both optional and inclusive
+    stmt = select(*booking_rows.columns).order_by(B.start_date, B.booking_id)
+    if start_date:
+        stmt = stmt.where(B.start_date >= start_date)
+    if last_date:
+        stmt = stmt.where(B.start_date <= last_date)
+    if status:
+        stmt = stmt.where(B.status == status)
+
+    compress = 'gzip' in request.headers.get('Accept-Encoding', '')
+    encode = encode_csv_rows if export_format == 'csv' else encode_ndjson_rows
+
+    def generate():
+        session = ReadSession()
+        compressor = zlib.compressobj(wbits=31) if compress else None
+        count = 0
+        try:
+            # SET LOCAL ends with this transaction, so the pooled connection
+            # goes back with the normal 30s statement_timeout
+            session.execute(text(f"SET LOCAL statement_timeout = {int(Config.EXPORT_STATEMENT_TIMEOUT)}"))
+            result = session.execute(stmt.execution_options(yield_per=Config.EXPORT_BATCH_SIZE))
+
+            if export_format == 'csv':
+                chunk = encode_csv_rows([[c.key for c in booking_rows.columns]])
+                yield compressor.compress(chunk) if compressor else chunk
+
+            for rows in result.partitions():
+                count += len(rows)
+                chunk = encode(rows)
+                yield compressor.compress(chunk) if compressor else chunk
+
+            if compressor:
+                yield compressor.flush()
+            logger.info(f"Admin {g.current_user.user_id} exported {count} bookings as {export_format}")
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated body
+            logger.error(f"Error exporting bookings after {count} rows: {str(e)}")
+            raise
+        finally:
+            session.close()
+
+    filename = f"bookings-{start_date or 'all'}-{last_date or 'all'}.{export_format}"
+    response = Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[export_format])
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if compress:
+        response.headers['Content-Encoding'] = 'gzip'
+        response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+def encode_csv_rows(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+def encode_ndjson_rows(rows):
+    return b"".join(orjson.dumps(row._asdict()) + b"\n" for row in rows)
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+from flask import jsonify, request, g
+from models import Room as R, Booking as B
+from database import Session
+from schemas import HoldSchema
+from marshmallow import ValidationError
+from utils import logger, pricing, holds, HoldConflict, HoldStoreBusy
+from controllers.user_controller import server_busy
+
+# Holds are enforced when placing holds and booking; the availability search
+# reads them per request (flag_held_rooms), so placing or releasing one
+# invalidates no cached page
+
+def hold_room(room_id):
+    session = Session()
+    try:
+        data = HoldSchema().load(request.json or {})
+        start_date, end_date = data['start_date'], data['end_date']
+
+        if session.get(R, room_id) is None:
+            return jsonify({"message": "Room not found"}), 404
+
+        # Holding dates that are already booked would only delay the 409
+        booked = session.query(B.booking_id).filter(
+            B.room_id == room_id,
+            B.status == 'active',
+            B.start_date < end_date,
+            B.end_date > start_date
+        ).first()
+        if booked:
+            return jsonify({"message": "Room is already booked for this date range"}), 409
+
+        hold = holds.place(room_id, g.current_user.user_id, start_date, end_date)
+        quote = pricing.quote(room_id, start_date, end_date)
+        logger.info(f"User {g.current_user.user_id} held room {room_id} {start_date} - {end_date}")
+
+        return jsonify({
+            "message": "Room held",
+            "hold_id": hold["hold_id"],
+            "room_id": hold["room_id"],
+            "start_date": hold["start_date"],
+            "end_date": hold["end_date"],
+            "expires_at": datetime.fromtimestamp(hold["expires_at"], timezone.utc).isoformat(timespec="seconds"),
+            "total_price": quote.total_price if quote else None
+        }), 201
+
+    except ValidationError as ve:
+        return jsonify({"message": "Validation Error", "errors": ve.messages}), 400
+    except HoldConflict as hc:
+        return jsonify({"message": str(hc)}), 409
+    except HoldStoreBusy:
+        return server_busy()
+    except Exception as e:
+        logger.error(f"Error holding room {room_id}: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def release_hold(hold_id):
+    try:
+        hold = holds.release(hold_id, g.current_user.user_id)
+        if hold is None:
+            return jsonify({"message": "Hold not found"}), 404
+
+        logger.info(f"User {g.current_user.user_id} released hold {hold_id}")
+        return jsonify({"message": "Hold released"}), 200
+
+    except HoldStoreBusy:
+        return server_busy()
+    except Exception as e:
+        logger.error(f"Error releasing hold {hold_id}: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
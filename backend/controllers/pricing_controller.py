@@ -0,0 +1,162 @@
+from flask import jsonify, request, g
+from models import RateRule, StayDiscount
+from database import Session, ReadSession
+from schemas import RateRuleSchema, StayDiscountSchema, QuoteSchema
+from marshmallow import ValidationError
+from utils import invalidate, logger, pricing
+
+MAX_QUOTE_STAYS = 500
+
+def invalidate_pricing():
+    """Rates feed every quote and the totals shown by availability search."""
+    pricing.invalidate()
+    invalidate('availability')
+
+def create_quotes():
+    stays = (request.json or {}).get('stays')
+    if not isinstance(stays, list) or not stays:
+        return jsonify({"message": "stays must be a non-empty list"}), 400
+    if len(stays) > MAX_QUOTE_STAYS:
+        return jsonify({"message": f"A quote request may contain at most {MAX_QUOTE_STAYS} stays"}), 400
+
+    schema = QuoteSchema(many=True)
+    results = {}
+    try:
+        stay_data = schema.load(stays)
+    except ValidationError as ve:
+        stay_data = ve.valid_data
+        for index, errors in ve.messages.items():
+            results[index] = {"index": index, "status": "rejected",
+                              "message": "Validation Error", "errors": errors}
+
+    for index, data in enumerate(stay_data):
+        if index not in results and data['end_date'] <= data['start_date']:
+            results[index] = {"index": index, "status": "rejected",
+                              "message": "Validation Error",
+                              "errors": {"end_date": ["Must be after start_date."]}}
+
+    try:
+        pending = [i for i in range(len(stays)) if i not in results]
+        quotes = pricing.quote_many([
+            (stay_data[i]['room_id'], stay_data[i]['start_date'], stay_data[i]['end_date'])
+            for i in pending
+        ])
+
+        item_schema = QuoteSchema()
+        for i, quote in zip(pending, quotes):
+            if quote is None:
+                results[i] = {"index": i, "status": "rejected", "message": "Room not found"}
+            else:
+                results[i] = {"index": i, "status": "quoted",
+                              **item_schema.dump({**stay_data[i], **quote._asdict()})}
+
+        logger.info(f"User {g.current_user.user_id} requested {len(stays)} quotes")
+        return jsonify({"quotes": [results[i] for i in range(len(stays))]}), 200
+
+    except Exception as e:
+        logger.error(f"Error quoting stays: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+def get_rate_rules():
+    session = ReadSession()
+    try:
+        rules = session.query(RateRule).order_by(RateRule.start_date, RateRule.priority).all()
+        return jsonify({"data": RateRuleSchema(many=True).dump(rules)}), 200
+    except Exception as e:
+        logger.error(f"Error fetching rate rules: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def create_rate_rule():
+    session = Session()
+    schema = RateRuleSchema()
+    try:
+        rule = RateRule(**schema.load(request.json))
+        session.add(rule)
+        session.commit()
+        invalidate_pricing()
+        logger.info(f"Admin {g.current_user.user_id} created rate rule {rule.rule_id}")
+        return schema.dump(rule), 201
+
+    except ValidationError as err:
+        session.rollback()
+        return jsonify({"message": "Validation Error", "errors": err.messages}), 400
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error creating rate rule: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def delete_rate_rule(rule_id):
+    session = Session()
+    try:
+        rule = session.get(RateRule, rule_id)
+        if not rule:
+            return jsonify({"message": "Rate rule not found"}), 404
+
+        session.delete(rule)
+        session.commit()
+        invalidate_pricing()
+        logger.info(f"Admin {g.current_user.user_id} deleted rate rule {rule_id}")
+        return jsonify({"message": "Rate rule deleted successfully"}), 200
+
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error deleting rate rule {rule_id}: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def get_stay_discounts():
+    session = ReadSession()
+    try:
+        discounts = session.query(StayDiscount).order_by(StayDiscount.min_nights).all()
+        return jsonify({"data": StayDiscountSchema(many=True).dump(discounts)}), 200
+    except Exception as e:
+        logger.error(f"Error fetching stay discounts: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def create_stay_discount():
+    session = Session()
+    schema = StayDiscountSchema()
+    try:
+        discount = StayDiscount(**schema.load(request.json))
+        session.add(discount)
+        session.commit()
+        invalidate_pricing()
+        logger.info(f"Admin {g.current_user.user_id} created stay discount {discount.discount_id}")
+        return schema.dump(discount), 201
+
+    except ValidationError as err:
+        session.rollback()
+        return jsonify({"message": "Validation Error", "errors": err.messages}), 400
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error creating stay discount: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def delete_stay_discount(discount_id):
+    session = Session()
+    try:
+        discount = session.get(StayDiscount, discount_id)
+        if not discount:
+            return jsonify({"message": "Stay discount not found"}), 404
+
+        session.delete(discount)
+        session.commit()
+        invalidate_pricing()
+        logger.info(f"Admin {g.current_user.user_id} deleted stay discount {discount_id}")
+        return jsonify({"message": "Stay discount deleted successfully"}), 200
+
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error deleting stay discount {discount_id}: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
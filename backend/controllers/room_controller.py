@@ -1,11 +1,19 @@
 from flask import jsonify, request, g
-from models import Room as R
-from database import Session
+from models import Room as R, Booking as B
+from database import Session, ReadSession
 from schemas import RoomSchema
 from marshmallow import ValidationError
 import uuid
-from utils import cache, logger
+import orjson
+from utils import invalidate, logger, paginate, occupancy, pricing, holds, to_calendar_string, add_room_stats, remove_room_stats, RowSerializer, json_response
 from sqlalchemy.orm import joinedload
+from datetime import date, timedelta
+
+# Longest range a calendar request may span, in days
+MAX_CALENDAR_DAYS = 366
+
+# List endpoints select RoomSchema's columns as rows instead of Room objects
+room_rows = RowSerializer(RoomSchema, R)
 
 def existing_room(room_number):
     session = Session()
@@ -16,53 +24,121 @@ def existing_room(room_number):
         session.close()
 
 def get_all_rooms():
-    session = Session()
+    session = ReadSession()
     try:
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 50, type=int)
         status = request.args.get('status', None, type=str)
         room_type = request.args.get('room_type', None, type=str)
         
-        # Limit per_page to prevent abuse
-        per_page = min(per_page, 100)
-        
         # Build query
-        query = session.query(R)
+        query = session.query(*room_rows.columns)
         
         # Apply filters
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(R.status == status)
         if room_type:
-            query = query.filter_by(room_type=room_type)
+            query = query.filter(R.room_type == room_type)
         
-        # Get total count for pagination info
-        total_count = query.count()
+        # Offset or keyset pagination on the unique room_number index
+        rooms, pagination = paginate(session, query, [R.room_number])
         
-        # Apply pagination
-        offset = (page - 1) * per_page
-        rooms = query.offset(offset).limit(per_page).all()
+        logger.info(f"User {g.current_user.user_id} fetched rooms (page {pagination.get('page', 'cursor')})")
         
-        schema = RoomSchema(many=True)
-        logger.info(f"User {g.current_user.user_id} fetched rooms (page {page})")
-        
-        return jsonify({
-            "data": schema.dump(rooms),
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": total_count,
-                "pages": (total_count + per_page - 1) // per_page
-            }
+        return json_response({
+            "data": room_rows.dump(rooms),
+            "pagination": pagination
         }), 200
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
     except Exception as e:
         logger.error(f"Error fetching all rooms: {str(e)}")
         return jsonify({"message": "Server Error", "error": str(e)}), 500
     finally:
         session.close()
 
+def get_available_rooms():
+    session = ReadSession()
+    try:
+        start_date = date.fromisoformat(request.args.get('start', ''))
+        end_date = date.fromisoformat(request.args.get('end', ''))
+    except ValueError:
+        return jsonify({"message": "start and end must be dates in YYYY-MM-DD format"}), 400
+
+    nights = (end_date - start_date).days
+    if nights <= 0:
+        return jsonify({"message": "end must be after start"}), 400
+
+    try:
+        room_type = request.args.get('room_type', None, type=str)
+        min_price = request.args.get('min_price', None, type=int)
+        max_price = request.args.get('max_price', None, type=int)
+
+        # Correlated anti-join: a room is free when no active booking overlaps
+        # the requested range (served by idx_booking_room_dates)
+        overlapping = session.query(B.booking_id).filter(
+            B.room_id == R.room_id,
+            B.status == 'active',
+            B.start_date < end_date,
+            B.end_date > start_date
+        )
+        query = session.query(*room_rows.columns).filter(~overlapping.exists())
+
+        # Apply filters
+        if room_type:
+            query = query.filter(R.room_type == room_type)
+        if min_price is not None:
+            query = query.filter(R.price_per_night >= min_price)
+        if max_price is not None:
+            query = query.filter(R.price_per_night <= max_price)
+
+        rooms, pagination = paginate(session, query, [R.room_number])
+
+        # Totals come from the rate calendar, so they match what booking charges
+        data = room_rows.dump(rooms)
+        quotes = pricing.quote_many([(item['room_id'], start_date, end_date) for item in data])
+        for item, quote in zip(data, quotes):
+            item['total_price'] = quote.total_price if quote else nights * item['price_per_night']
+
+        logger.info(f"User {g.current_user.user_id} searched available rooms {start_date} - {end_date} (page {pagination.get('page', 'cursor')})")
+
+        return json_response({
+            "data": data,
+            "pagination": pagination
+        }), 200
+    except ValueError as ve:
+        return jsonify({"message": str(ve)}), 400
+    except Exception as e:
+        logger.error(f"Error searching available rooms: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
+
+def flag_held_rooms(body):
+    """
+    shared_cached annotate hook for the availability search: rooms on the
+    cached page that another guest holds for the searched dates get
+    "held": true. Holds come and go far more often than rooms or bookings,
+    so they are read per request instead of invalidating the page; the
+    caller's own holds are not flagged. None when nothing on the page is held.
+    """
+    try:
+        start_date = date.fromisoformat(request.args.get('start', ''))
+        end_date = date.fromisoformat(request.args.get('end', ''))
+    except ValueError:
+        return None
+
+    payload = orjson.loads(body)
+    data = payload.get('data') or []
+    held = holds.held([item['room_id'] for item in data], start_date, end_date, g.current_user.user_id)
+    if not held:
+        return None
+
+    for item in data:
+        if item['room_id'] in held:
+            item['held'] = True
+    return json_response(payload).get_data()
+
 def get_room(room_id):
-    session = Session()
+    session = ReadSession()
     schema = RoomSchema()
     try:
         room_id = uuid.UUID(str(room_id))
@@ -100,7 +176,9 @@ def create_room():
 
         session.add(new_room)
         session.commit()
-        cache.clear() 
+        invalidate('rooms')
+        occupancy.invalidate()
+        pricing.invalidate()
         logger.info(f"User {g.current_user.user_id} created room {new_room.room_number}")
 
         return schema.dump(new_room), 201
@@ -129,11 +207,22 @@ def update_room(room_id):
             return jsonify({"message": "Room not found"}), 404
 
         data = schema.load(request.json)
+        # Re-file the room's bookings under the new type in the stats rollup
+        retyped = 'room_type' in data and data['room_type'] != room.room_type
+        if retyped:
+            remove_room_stats(session, room_id)
+
         for key, value in data.items():
             setattr(room, key, value)
 
+        if retyped:
+            add_room_stats(session, room_id)
         session.commit()
-        cache.clear()  
+        invalidate('rooms', f'room_{room_id}')
+        if 'room_number' in data:
+            occupancy.invalidate()
+        if 'price_per_night' in data or retyped:
+            pricing.invalidate()
         logger.info(f"User {g.current_user.user_id} updated room {room_id}")
 
         return schema.dump(room), 200
@@ -162,7 +251,9 @@ def delete_room(room_id):
 
         session.delete(room)
         session.commit()
-        cache.clear()  
+        invalidate('rooms', f'room_{room_id}')
+        occupancy.invalidate()
+        pricing.invalidate()
         logger.info(f"User {g.current_user.user_id} deleted room {room_id}")
 
         return jsonify({"message": "Room deleted successfully"}), 200
@@ -173,3 +264,70 @@ def delete_room(room_id):
         return jsonify({"message": "Server Error", "error": str(e)}), 500
     finally:
         session.close()
+
+def get_room_calendar(room_id):
+    try:
+        room_id = uuid.UUID(str(room_id))
+        start_date = date.fromisoformat(request.args.get('from', ''))
+        last_date = date.fromisoformat(request.args.get('to', ''))
+    except ValueError:
+        return jsonify({"message": "from and to must be dates in YYYY-MM-DD format"}), 400
+
+    # 'to' is the last calendar day shown, inclusive
+    end_date = last_date + timedelta(days=1)
+    if not 0 < (end_date - start_date).days <= MAX_CALENDAR_DAYS:
+        return jsonify({"message": f"Calendar range must cover 1 to {MAX_CALENDAR_DAYS} days"}), 400
+
+    try:
+        occupancy.refresh_if_stale()
+        if not occupancy.covers(start_date, end_date):
+            return jsonify({"message": "Requested range is outside the calendar window"}), 400
+        if not occupancy.has_room(room_id):
+            return jsonify({"message": "Room not found"}), 404
+
+        days = occupancy.room_calendar(room_id, start_date, end_date)
+        logger.info(f"User {g.current_user.user_id} fetched calendar for room {room_id}")
+
+        return jsonify({
+            "room_id": str(room_id),
+            "from": start_date.isoformat(),
+            "to": last_date.isoformat(),
+            "occupancy": to_calendar_string(days)
+        }), 200
+    except Exception as e:
+        logger.error(f"Error fetching calendar for room {room_id}: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+
+def get_rooms_calendar():
+    try:
+        year, month = (int(part) for part in request.args.get('month', '').split('-'))
+        start_date = date(year, month, 1)
+    except ValueError:
+        return jsonify({"message": "month must be in YYYY-MM format"}), 400
+
+    end_date = date(year + month // 12, month % 12 + 1, 1)
+
+    try:
+        occupancy.refresh_if_stale()
+        if not occupancy.covers(start_date, end_date):
+            return jsonify({"message": "Requested month is outside the calendar window"}), 400
+
+        rooms = [
+            {
+                "room_id": str(room_id),
+                "room_number": room_number,
+                "occupancy": to_calendar_string(days)
+            }
+            for room_id, room_number, days in occupancy.grid(start_date, end_date)
+        ]
+        logger.info(f"User {g.current_user.user_id} fetched rooms calendar for {start_date:%Y-%m}")
+
+        return jsonify({
+            "month": f"{start_date:%Y-%m}",
+            "from": start_date.isoformat(),
+            "to": (end_date - timedelta(days=1)).isoformat(),
+            "rooms": rooms
+        }), 200
+    except Exception as e:
+        logger.error(f"Error fetching rooms calendar: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
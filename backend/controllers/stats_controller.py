@@ -0,0 +1,109 @@
+from flask import jsonify, request, g
+from models import DailyBookingStats as S, Room as R
+from database import ReadSession
+from utils import logger
+from sqlalchemy import Date, func
+from datetime import date, timedelta
+
+STATS_GROUPS = ('day', 'week', 'room_type')
+# Longest range a stats request may span, in days
+MAX_STATS_DAYS = 731
+DEFAULT_STATS_DAYS = 30
+
+def _summary(revenue, room_nights, cancellations, capacity):
+    return {
+        "revenue": int(revenue or 0),
+        "room_nights": int(room_nights or 0),
+        "cancellations": int(cancellations or 0),
+        "occupancy_rate": round(room_nights / capacity, 4) if capacity and room_nights else 0.0
+    }
+
+def get_admin_stats():
+    group_by = request.args.get('group_by', 'day', type=str)
+    if group_by not in STATS_GROUPS:
+        return jsonify({"message": f"group_by must be one of: {', '.join(STATS_GROUPS)}"}), 400
+
+    try:
+        last_date = date.fromisoformat(request.args['to']) if 'to' in request.args else date.today()
+        start_date = (date.fromisoformat(request.args['from']) if 'from' in request.args
+                      else last_date - timedelta(days=DEFAULT_STATS_DAYS - 1))
+    except ValueError:
+        return jsonify({"message": "from and to must be dates in YYYY-MM-DD format"}), 400
+
+    # 'to' is inclusive
+    days = (last_date - start_date).days + 1
+    if not 0 < days <= MAX_STATS_DAYS:
+        return jsonify({"message": f"Stats range must cover 1 to {MAX_STATS_DAYS} days"}), 400
+
+    session = ReadSession()
+    try:
+        # Capacity uses today's rooms; the room table is small next to bookings
+        rooms_by_type = {}
+        rooms_by_status = {'available': 0, 'booked': 0}
+        for room_type, status, count in session.query(R.room_type, R.status, func.count()).group_by(R.room_type, R.status):
+            rooms_by_type[room_type] = rooms_by_type.get(room_type, 0) + count
+            rooms_by_status[status] += count
+        total_rooms = sum(rooms_by_type.values())
+
+        if group_by == 'week':
+            bucket = func.date_trunc('week', S.day).cast(Date)
+        elif group_by == 'room_type':
+            bucket = S.room_type
+        else:
+            bucket = S.day
+
+        rows = session.query(
+            bucket,
+            func.sum(S.revenue),
+            func.sum(S.room_nights),
+            func.sum(S.cancellations)
+        ).filter(
+            S.day >= start_date,
+            S.day <= last_date
+        ).group_by(bucket).order_by(bucket).all()
+        totals = _summary(
+            sum(row[1] or 0 for row in rows),
+            sum(row[2] or 0 for row in rows),
+            sum(row[3] or 0 for row in rows),
+            total_rooms * days
+        )
+
+        data = []
+        if group_by == 'room_type':
+            found = {row[0]: row for row in rows}
+            for room_type in sorted(set(rooms_by_type) | set(found)):
+                _, revenue, room_nights, cancellations = found.get(room_type, (room_type, 0, 0, 0))
+                capacity = rooms_by_type.get(room_type, 0) * days
+                data.append({"room_type": room_type, **_summary(revenue, room_nights, cancellations, capacity)})
+        else:
+            # Emit every bucket in the range, including ones with no bookings
+            found = {row[0]: row for row in rows}
+            step = 7 if group_by == 'week' else 1
+            first = start_date - timedelta(days=start_date.weekday()) if group_by == 'week' else start_date
+            current = first
+            while current <= last_date:
+                covered = (min(current + timedelta(days=step - 1), last_date) - max(current, start_date)).days + 1
+                _, revenue, room_nights, cancellations = found.get(current, (current, 0, 0, 0))
+                data.append({group_by: current.isoformat(),
+                             **_summary(revenue, room_nights, cancellations, total_rooms * covered)})
+                current += timedelta(days=step)
+
+        logger.info(f"Admin {g.current_user.user_id} fetched stats {start_date} - {last_date} by {group_by}")
+
+        return jsonify({
+            "from": start_date.isoformat(),
+            "to": last_date.isoformat(),
+            "group_by": group_by,
+            "data": data,
+            "totals": totals,
+            "rooms": {
+                "total": total_rooms,
+                **rooms_by_status,
+                "by_type": rooms_by_type
+            }
+        }), 200
+    except Exception as e:
+        logger.error(f"Error fetching admin stats: {str(e)}")
+        return jsonify({"message": "Server Error", "error": str(e)}), 500
+    finally:
+        session.close()
@@ -1,6 +1,6 @@
 from flask import jsonify, request, g
 from models import User as U
-from database import Session
+from database import Session, ReadSession
 from schemas import (
     UserRegisterSchema,
     UserLoginSchema,
@@ -12,7 +12,12 @@ import jwt
 from datetime import datetime, timedelta
 from config import Config
 import uuid
-from utils import cache, logger
+from utils import invalidate, invalidate_principal, logger, passwords, HasherBusy
+
+def server_busy():
+    response = jsonify({"message": "Server is busy, please retry shortly"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
 
 def check_existing_user(email):
     session = Session()
@@ -36,11 +41,10 @@ def register_user():
             email=data['email'],
             phone=data.get('phone'),
         )
-        new_user.set_password(data['password'])
+        new_user.password = passwords.hash(data['password'])
 
         session.add(new_user)
         session.commit()
-        cache.clear() 
         logger.info(f"User registered: {new_user.email}")
 
         return jsonify(schema.dump(new_user)), 201
@@ -48,6 +52,9 @@ def register_user():
     except ValidationError as err:
         session.rollback()
         return jsonify(err.messages), 400
+    except HasherBusy:
+        session.rollback()
+        return server_busy()
     except Exception as e:
         session.rollback()
         logger.error(f"Error in user registration: {str(e)}")
@@ -61,8 +68,13 @@ def login_user():
     try:
         data = schema.load(request.json)
         user = session.query(U).filter_by(email=data['email']).first()
+        # Give the connection back to the pool while the password is checked
+        session.commit()
+
+        if user and passwords.verify(user.password, data['password']):
+            if passwords.needs_rehash(user.password):
+                rehash_password(session, user, data['password'])
 
-        if user and user.check_password(data['password']):
             token = jwt.encode({
                 "user_id": str(user.user_id),
                 "exp": datetime.utcnow() + timedelta(hours=1)
@@ -75,14 +87,28 @@ def login_user():
 
     except ValidationError as err:
         return jsonify(err.messages), 400
+    except HasherBusy:
+        return server_busy()
     except Exception as e:
         logger.error(f"Error in user login: {str(e)}")
         return jsonify({"message": "Server Error", "error": str(e)}), 500
     finally:
         session.close()
 
+def rehash_password(session, user, password):
+    """Upgrade a hash made with old parameters; skipped if the pool is busy or the write fails."""
+    try:
+        user.password = passwords.hash(password)
+        session.commit()
+        logger.info(f"Password hash upgraded for user {user.user_id}")
+    except HasherBusy:
+        session.rollback()
+    except Exception as e:
+        session.rollback()
+        logger.error(f"Error upgrading password hash for user {user.user_id}: {str(e)}")
+
 def get_user(user_id):
-    session = Session()
+    session = ReadSession()
     schema = UserReadSchema()
     current_user = g.current_user
 
@@ -132,16 +158,20 @@ def update_user(user_id):
         if 'phone' in data:
             user.phone = data['phone']
         if 'password' in data:
-            user.set_password(data['password'])
+            user.password = passwords.hash(data['password'])
 
         session.commit()
-        cache.clear()  
+        invalidate(f'user_{user_id}')
+        invalidate_principal(user_id)
         logger.info(f"User {user_id} updated by user {current_user.user_id}")
         return jsonify(schema.dump(user)), 200
 
     except ValidationError as err:
         session.rollback()
         return jsonify(err.messages), 400
+    except HasherBusy:
+        session.rollback()
+        return server_busy()
     except Exception as e:
         session.rollback()
         logger.error(f"Error updating user {user_id}: {str(e)}")
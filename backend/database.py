@@ -1,29 +1,175 @@
-from sqlalchemy import create_engine, event
-from sqlalchemy.orm import declarative_base, sessionmaker
+import os
+import random
+import threading
+import time
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import declarative_base, sessionmaker, Session as BaseSession
 from sqlalchemy.pool import QueuePool
 from config import Config
 
-# Optimized engine with connection pooling for better performance
-engine = create_engine(
-    Config.SQLALCHEMY_DATABASE_URI,
-    echo=False,  # Disable SQL echo in production for performance
-    pool_size=10,  # Number of connections to keep open
-    max_overflow=20,  # Max connections beyond pool_size
-    pool_timeout=30,  # Timeout for getting connection from pool
-    pool_recycle=3600,  # Recycle connections after 1 hour
-    pool_pre_ping=True,  # Verify connections before using
-    poolclass=QueuePool,
-    connect_args={
-        "connect_timeout": 10,
-        "options": "-c statement_timeout=30000"  # 30 second query timeout
-    }
-)
+def create_db_engine(url):
+    # Optimized engine with connection pooling for better performance
+    return create_engine(
+        url,
+        echo=False,  # Disable SQL echo in production for performance
+        pool_size=10,  # Number of connections to keep open
+        max_overflow=20,  # Max connections beyond pool_size
+        pool_timeout=30,  # Timeout for getting connection from pool
+        pool_recycle=3600,  # Recycle connections after 1 hour
+        pool_pre_ping=True,  # Verify connections before using
+        poolclass=QueuePool,
+        connect_args={
+            "connect_timeout": 10,
+            "options": "-c statement_timeout=30000"  # 30 second query timeout
+        }
+    )
+
+# Engines open no connection until first use, so each process fills its own pool
+engine = create_db_engine(Config.SQLALCHEMY_DATABASE_URI)
+replica_engines = [create_db_engine(url) for url in Config.DATABASE_REPLICA_URLS]
+
+
+def dispose_engines(close=True):
+    """
+    Drop every pooled connection. close=False only forgets them, for a
+    forked child whose pool still references the parent's sockets.
+    """
+    for pooled in (engine, *replica_engines):
+        pooled.dispose(close=close)
+
+
+# A forked worker (gunicorn --preload) must never use the parent's connections
+os.register_at_fork(after_in_child=lambda: dispose_engines(close=False))
 
 Base = declarative_base()
 
-Session = sessionmaker(bind=engine, expire_on_commit=False)
+# Seconds the replica is behind the primary; 0 when it has replayed all it received
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """
+    Picks a replica for read-only sessions. Each replica's lag is sampled at
+    most every check_interval seconds; replicas that lag more than max_lag
+    or cannot be reached are skipped, falling back to the primary.
+    """
+
+    def __init__(self, engines, max_lag, check_interval):
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        healthy = [replica for replica in self.engines if self._is_healthy(replica)]
+        return random.choice(healthy) if healthy else engine
+
+    def _is_healthy(self, replica):
+        now = time.monotonic()
+        with self._lock:
+            due = now - self._checked_at.get(replica, float("-inf")) >= self.check_interval
+            if due:
+                # Claim the check so concurrent requests keep using the last sample
+                self._checked_at[replica] = now
+        if due:
+            self._lag[replica] = self._measure(replica)
+        lag = self._lag.get(replica)
+        return lag is not None and lag <= self.max_lag
+
+    @staticmethod
+    def _measure(replica):
+        try:
+            with replica.connect() as conn:
+                return float(conn.execute(REPLICA_LAG_SQL).scalar())
+        except Exception:
+            return None
+
+
+replicas = ReplicaRouter(
+    replica_engines,
+    max_lag=Config.REPLICA_MAX_LAG_SECONDS,
+    check_interval=Config.REPLICA_LAG_CHECK_INTERVAL
+)
+
+
+def _current_user_id():
+    from flask import g, has_request_context
+    if has_request_context() and getattr(g, "current_user", None) is not None:
+        return g.current_user.user_id
+    return None
+
+
+def _pinned_to_primary():
+    # Set by utils.cache.tag_versions when a tag the request reads under was just bumped
+    from flask import g, has_request_context
+    return has_request_context() and g.get("read_primary", False)
+
+
+def mark_recent_write(user_id):
+    """Pin user_id's reads to the primary for REPLICA_STICKY_SECONDS."""
+    from utils.cache import cache
+    try:
+        cache.set(f"recent_write_{user_id}", 1, timeout=Config.REPLICA_STICKY_SECONDS)
+    except Exception:
+        pass
+
+
+def has_recent_write(user_id):
+    from utils.cache import cache
+    try:
+        return cache.get(f"recent_write_{user_id}") is not None
+    except Exception:
+        # Cannot tell, so be safe and read from the primary
+        return True
+
+
+class RoutingSession(BaseSession):
+    """
+    Session that sends read-only work (sessions created by ReadSession) to a
+    replica and everything else, including any flush, to the primary. Reads
+    of a user who wrote within the last few seconds stay on the primary so
+    they see their own writes, as do reads cached or validated under a tag
+    version younger than the replica lag bound.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if not replica_engines or not self.info.get("read_only") or self._flushing:
+            return engine
+        if "replica" not in self.info:
+            user_id = _current_user_id()
+            sticky = _pinned_to_primary() or (user_id is not None and has_recent_write(user_id))
+            self.info["replica"] = engine if sticky else replicas.choose()
+        return self.info["replica"]
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _flagged_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _flagged_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
 
 
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_write(session):
+    if session.info.pop("wrote", False) and replica_engines:
+        user_id = _current_user_id()
+        if user_id is not None:
+            mark_recent_write(user_id)
 
 
+Session = sessionmaker(bind=engine, class_=RoutingSession, expire_on_commit=False)
 
+# For read-only controller work; routed to a replica when any are configured
+ReadSession = sessionmaker(bind=engine, class_=RoutingSession, expire_on_commit=False,
+                           info={"read_only": True})
@@ -0,0 +1,12 @@
+"""
+Background maintenance jobs for the booking API.
+
+Run from the backend directory:
+
+    python -m jobs.booking_lifecycle
+    python -m jobs.booking_lifecycle --loop --interval 300
+    python -m jobs.stats_backfill
+
+The booking lifecycle job can also run in-process in create_app() by
+setting BOOKING_JOB_INTERVAL (seconds).
+"""
@@ -0,0 +1,172 @@
+"""
+Move bookings whose stay has ended from 'active' to 'completed' and
+recompute Room.status from today's occupancy.
+
+Bookings are completed in chunks of set-based UPDATEs, each its own short
+transaction, so the job never holds locks on the whole backlog. Only the
+cache entries of the touched bookings, their owners' lists and the rooms
+whose status changed are invalidated.
+"""
+import argparse
+import threading
+import time
+from datetime import date
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import text
+from config import Config
+from database import Session, engine
+from utils import invalidate, logger
+
+# Arbitrary application-wide key so only one worker/process runs the job at a time
+JOB_LOCK_ID = 7312001
+
+COMPLETE_CHUNK_SQL = text("""
+    UPDATE bookings AS b
+    SET status = 'completed'
+    FROM (
+        SELECT booking_id FROM bookings
+        WHERE status = 'active' AND end_date < :today
+        ORDER BY end_date
+        LIMIT :chunk_size
+        FOR UPDATE SKIP LOCKED
+    ) AS due
+    WHERE b.booking_id = due.booking_id
+    RETURNING b.booking_id, b.user_id
+""")
+
+# 'booked' while an active booking covers tonight, otherwise 'available'
+RECONCILE_ROOMS_SQL = text("""
+    UPDATE rooms AS r
+    SET status = occupied.status
+    FROM (
+        SELECT rooms.room_id,
+               CASE WHEN EXISTS (
+                   SELECT 1 FROM bookings
+                   WHERE bookings.room_id = rooms.room_id
+                     AND bookings.status = 'active'
+                     AND bookings.start_date <= :today
+                     AND bookings.end_date > :today
+               ) THEN 'booked' ELSE 'available' END::room_status AS status
+        FROM rooms
+    ) AS occupied
+    WHERE r.room_id = occupied.room_id AND r.status <> occupied.status
+    RETURNING r.room_id
+""")
+
+
+def complete_past_bookings(today=None, chunk_size=None):
+    """Complete every active booking that ended before today; returns the count."""
+    today = today or date.today()
+    chunk_size = chunk_size or Config.BOOKING_JOB_CHUNK_SIZE
+    completed = 0
+
+    while True:
+        session = Session()
+        try:
+            rows = session.execute(COMPLETE_CHUNK_SQL, {"today": today, "chunk_size": chunk_size}).all()
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        if not rows:
+            return completed
+
+        completed += len(rows)
+        # Past stays leave future availability and the room list unchanged
+        invalidate(
+            'bookings',
+            *{f'user_{user_id}_bookings' for _, user_id in rows},
+            *(f'booking_{booking_id}' for booking_id, _ in rows)
+        )
+        if len(rows) < chunk_size:
+            return completed
+
+
+def reconcile_room_status(today=None):
+    """Set Room.status from today's occupancy in one statement; returns the changed room ids."""
+    today = today or date.today()
+    session = Session()
+    try:
+        room_ids = session.execute(RECONCILE_ROOMS_SQL, {"today": today}).scalars().all()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    if room_ids:
+        invalidate('rooms', *(f'room_{room_id}' for room_id in room_ids))
+    return room_ids
+
+
+def run_once(today=None, chunk_size=None):
+    """Run both steps unless another process holds the job lock; returns (completed, rooms changed) or None."""
+    with engine.connect() as conn:
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:id)"), {"id": JOB_LOCK_ID}).scalar():
+            logger.info("Booking lifecycle job already running elsewhere, skipping")
+            return None
+        # The lock is session-level; don't sit idle in a transaction while working
+        conn.commit()
+        try:
+            completed = complete_past_bookings(today, chunk_size)
+            rooms = reconcile_room_status(today)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": JOB_LOCK_ID})
+            conn.commit()
+
+    logger.info(f"Booking lifecycle job completed {completed} bookings, updated status of {len(rooms)} rooms")
+    return completed, len(rooms)
+
+
+def start_scheduler(app, interval):
+    """Run the job every interval seconds on a daemon thread of this process."""
+    def loop():
+        while True:
+            try:
+                with app.app_context():
+                    run_once()
+            except Exception as e:
+                logger.error(f"Booking lifecycle job failed: {str(e)}")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="booking-lifecycle", daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=Config.BOOKING_JOB_CHUNK_SIZE)
+    parser.add_argument("--loop", action="store_true", help="keep running every --interval seconds")
+    parser.add_argument("--interval", type=int, default=Config.BOOKING_JOB_INTERVAL or 300)
+    args = parser.parse_args()
+
+    # Only the cache is needed for invalidation; skip the rest of create_app()
+    from flask import Flask
+    from utils import init_cache
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    init_cache(app)
+
+    with app.app_context():
+        while True:
+            try:
+                run_once(chunk_size=args.chunk_size)
+            except Exception as e:
+                logger.error(f"Booking lifecycle job failed: {str(e)}")
+                if not args.loop:
+                    raise
+            if not args.loop:
+                break
+            time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Rebuild the booking_daily_stats rollup from the bookings table.
+
+The rollup is kept current by every booking write; run this after upgrading
+to the migration that adds it, after bulk loads (bench.seed uses COPY and
+bypasses the application), or to repair drift.
+
+    python -m jobs.stats_backfill
+"""
+import argparse
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from sqlalchemy import func
+from database import Session
+from models import DailyBookingStats
+from utils import logger, rebuild_stats
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    session = Session()
+    try:
+        rebuild_stats(session)
+        days = session.query(func.count(func.distinct(DailyBookingStats.day))).scalar()
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+    # Cached /admin/stats responses expire within their 60s timeout
+    logger.info(f"Rebuilt booking stats rollup covering {days} days")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,7 +30,7 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from database import Base
-from models import Booking, User, Room  # Import your models here
+from models import Booking, User, Room, DailyBookingStats, RateRule, StayDiscount  # Import your models here
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,40 @@
+"""add booking overlap exclusion constraint
+
+Revision ID: 3c9d2e7a41b8
+Revises: performance_indexes_001
+Create Date: 2026-10-18 09:12:40.311482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d2e7a41b8'
+down_revision: Union[str, Sequence[str], None] = 'performance_indexes_001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # btree_gist is needed for the "room_id WITH =" part of the constraint.
+    # Existing overlapping active bookings must be resolved before upgrading.
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+    op.execute(
+        """
+        ALTER TABLE bookings
+        ADD CONSTRAINT excl_booking_room_dates
+        EXCLUDE USING gist (
+            room_id WITH =,
+            daterange(start_date, end_date) WITH &&
+        )
+        WHERE (status = 'active')
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('excl_booking_room_dates', 'bookings')
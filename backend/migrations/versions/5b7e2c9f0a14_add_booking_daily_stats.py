@@ -0,0 +1,37 @@
+"""add booking daily stats rollup
+
+Revision ID: 5b7e2c9f0a14
+Revises: 8e4f1a6b2d93
+Create Date: 2026-10-18 11:26:05.518830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2c9f0a14'
+down_revision: Union[str, Sequence[str], None] = '8e4f1a6b2d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Populate with `python -m jobs.stats_backfill` after upgrading
+    op.create_table(
+        'booking_daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('room_type', postgresql.ENUM('Single', 'Double', 'Suite', name='room_types', create_type=False), nullable=False),
+        sa.Column('revenue', sa.BigInteger(), nullable=False),
+        sa.Column('room_nights', sa.Integer(), nullable=False),
+        sa.Column('cancellations', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('day', 'room_type')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('booking_daily_stats')
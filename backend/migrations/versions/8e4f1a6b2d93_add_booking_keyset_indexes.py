@@ -0,0 +1,30 @@
+"""add booking keyset pagination indexes
+
+Revision ID: 8e4f1a6b2d93
+Revises: 3c9d2e7a41b8
+Create Date: 2026-10-18 10:02:17.904215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f1a6b2d93'
+down_revision: Union[str, Sequence[str], None] = '3c9d2e7a41b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Cursor pagination orders bookings by (start_date, booking_id)
+    op.create_index('idx_booking_start_id', 'bookings', ['start_date', 'booking_id'])
+    op.create_index('idx_booking_user_start_id', 'bookings', ['user_id', 'start_date', 'booking_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_booking_user_start_id', 'bookings')
+    op.drop_index('idx_booking_start_id', 'bookings')
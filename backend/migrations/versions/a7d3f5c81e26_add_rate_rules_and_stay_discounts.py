@@ -0,0 +1,55 @@
+"""add rate rules and stay discounts
+
+Revision ID: a7d3f5c81e26
+Revises: 5b7e2c9f0a14
+Create Date: 2026-10-18 14:12:43.381207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3f5c81e26'
+down_revision: Union[str, Sequence[str], None] = '5b7e2c9f0a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    room_types = postgresql.ENUM('Single', 'Double', 'Suite', name='room_types', create_type=False)
+
+    op.create_table(
+        'rate_rules',
+        sa.Column('rule_id', sa.UUID(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('room_type', room_types, nullable=True),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('end_date', sa.Date(), nullable=False),
+        sa.Column('weekdays', sa.Integer(), nullable=False),
+        sa.Column('percent', sa.Integer(), nullable=True),
+        sa.Column('price_per_night', sa.Integer(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.CheckConstraint('end_date > start_date', name='ck_rate_rules_dates'),
+        sa.CheckConstraint('(percent IS NULL) <> (price_per_night IS NULL)', name='ck_rate_rules_one_price'),
+        sa.PrimaryKeyConstraint('rule_id')
+    )
+    op.create_table(
+        'stay_discounts',
+        sa.Column('discount_id', sa.UUID(), nullable=False),
+        sa.Column('room_type', room_types, nullable=True),
+        sa.Column('min_nights', sa.Integer(), nullable=False),
+        sa.Column('percent_off', sa.Integer(), nullable=False),
+        sa.CheckConstraint('min_nights > 0', name='ck_stay_discounts_min_nights'),
+        sa.CheckConstraint('percent_off BETWEEN 1 AND 100', name='ck_stay_discounts_percent'),
+        sa.PrimaryKeyConstraint('discount_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stay_discounts')
+    op.drop_table('rate_rules')
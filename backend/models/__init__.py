@@ -1,5 +1,7 @@
 from models.booking_model import Booking
 from models.user_model import User
 from models.room_model import Room
+from models.stats_model import DailyBookingStats
+from models.rate_model import RateRule, StayDiscount
 
-__all__ = ['Booking', 'User', 'Room']
\ No newline at end of file
+__all__ = ['Booking', 'User', 'Room', 'DailyBookingStats', 'RateRule', 'StayDiscount']
@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, Date, Integer, Enum, ForeignKey, Index
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Date, Integer, Enum, ForeignKey, Index, DDL, event, func, text
+from sqlalchemy.dialects.postgresql import UUID, ExcludeConstraint
 from sqlalchemy.orm import relationship
 from database import Base  
 
@@ -23,7 +23,27 @@ class Booking(Base):
         Index('idx_booking_user_status', 'user_id', 'status'),
         Index('idx_booking_room_dates', 'room_id', 'start_date', 'end_date'),
         Index('idx_booking_dates', 'start_date', 'end_date'),
+        # Keyset pagination order for admin and per-user booking listings
+        Index('idx_booking_start_id', 'start_date', 'booking_id'),
+        Index('idx_booking_user_start_id', 'user_id', 'start_date', 'booking_id'),
+        # No two active bookings of the same room may overlap; enforced by
+        # the database so concurrent inserts cannot both pass a pre-check
+        ExcludeConstraint(
+            (room_id, '='),
+            (func.daterange(start_date, end_date), '&&'),
+            name='excl_booking_room_dates',
+            using='gist',
+            where=text("status = 'active'"),
+        ),
     )
 
     def __repr__(self):
         return f"<Booking(user_id={self.user_id}, room_id={self.room_id}, status={self.status})>"
+
+
+# btree_gist provides the GiST equality operator for room_id
+event.listen(
+    Booking.__table__,
+    'before_create',
+    DDL('CREATE EXTENSION IF NOT EXISTS btree_gist')
+)
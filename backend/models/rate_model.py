@@ -0,0 +1,51 @@
+import uuid
+from sqlalchemy import Column, String, Integer, Date, Enum, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from database import Base
+
+
+class RateRule(Base):
+    """
+    A nightly rate for a season (start_date to the exclusive end_date),
+    optionally only on some weekdays (bit 0 = Monday) and for one room type.
+    It either fixes the price or takes a percentage of the room's
+    price_per_night. Each night uses the matching rule with the highest
+    priority; on a tie a room-type rule beats one for every type.
+    """
+    __tablename__ = 'rate_rules'
+
+    rule_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    name = Column(String(100), nullable=False)
+    room_type = Column(Enum('Single', 'Double', 'Suite', name='room_types'), nullable=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    weekdays = Column(Integer, nullable=False, default=127)
+    percent = Column(Integer, nullable=True)
+    price_per_night = Column(Integer, nullable=True)
+    priority = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        CheckConstraint('end_date > start_date', name='ck_rate_rules_dates'),
+        CheckConstraint('(percent IS NULL) <> (price_per_night IS NULL)', name='ck_rate_rules_one_price'),
+    )
+
+    def __repr__(self):
+        return f"<RateRule(name={self.name}, room_type={self.room_type})>"
+
+
+class StayDiscount(Base):
+    """Percentage off a stay of at least min_nights, for one room type or all of them."""
+    __tablename__ = 'stay_discounts'
+
+    discount_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, nullable=False)
+    room_type = Column(Enum('Single', 'Double', 'Suite', name='room_types'), nullable=True)
+    min_nights = Column(Integer, nullable=False)
+    percent_off = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        CheckConstraint('min_nights > 0', name='ck_stay_discounts_min_nights'),
+        CheckConstraint('percent_off BETWEEN 1 AND 100', name='ck_stay_discounts_percent'),
+    )
+
+    def __repr__(self):
+        return f"<StayDiscount(min_nights={self.min_nights}, percent_off={self.percent_off})>"
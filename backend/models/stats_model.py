@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Date, Integer, BigInteger, Enum
+from database import Base
+
+
+class DailyBookingStats(Base):
+    """
+    Per-day, per-room-type rollup of bookings, maintained by every booking
+    write (utils.rollups) so admin statistics never scan the bookings table.
+    A stay contributes one room-night and its nightly share of total_price
+    to each night it covers; a cancellation counts on its start date.
+    """
+    __tablename__ = 'booking_daily_stats'
+
+    day = Column(Date, primary_key=True)
+    room_type = Column(Enum('Single', 'Double', 'Suite', name='room_types'), primary_key=True)
+    revenue = Column(BigInteger, nullable=False, default=0)
+    room_nights = Column(Integer, nullable=False, default=0)
+    cancellations = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyBookingStats(day={self.day}, room_type={self.room_type})>"
@@ -4,6 +4,7 @@ from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from werkzeug.security import generate_password_hash, check_password_hash
 from database import Base  
+from config import Config
 
 class User(Base):
     __tablename__ = 'users'
@@ -23,7 +24,7 @@ class User(Base):
     )
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = generate_password_hash(password, method=Config.PASSWORD_HASH_METHOD)
 
     def check_password(self, password):
         return check_password_hash(self.password, password)
@@ -1,6 +1,7 @@
 from routes.user_routes import user_bp
 from routes.room_routes import room_bp
 from routes.booking_routes import booking_bp
+from routes.admin_routes import admin_bp
 
 
-__all__ = ['user_bp', 'room_bp', 'booking_bp']
\ No newline at end of file
+__all__ = ['user_bp', 'room_bp', 'booking_bp', 'admin_bp']
\ No newline at end of file
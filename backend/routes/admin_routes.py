@@ -0,0 +1,58 @@
+from flask import Blueprint, request
+from controllers import (
+    get_admin_stats, get_rate_rules, create_rate_rule, delete_rate_rule,
+    get_stay_discounts, create_stay_discount, delete_stay_discount
+)
+from utils import token_required, admin_required, shared_cached, budget, COST_WRITE
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/admin/stats')
+@token_required
+@admin_required
+@budget()
+@shared_cached(60, 'stats', 'rooms')
+def get_admin_stats_route():
+    return get_admin_stats()
+
+@admin_bp.route('/admin/rate-rules', methods=['GET'])
+@token_required
+@admin_required
+@budget()
+def get_rate_rules_route():
+    return get_rate_rules()
+
+@admin_bp.route('/admin/rate-rules', methods=['POST'])
+@token_required
+@admin_required
+@budget(COST_WRITE)
+def create_rate_rule_route():
+    return create_rate_rule()
+
+@admin_bp.route('/admin/rate-rules/<uuid:rule_id>', methods=['DELETE'])
+@token_required
+@admin_required
+@budget(COST_WRITE)
+def delete_rate_rule_route(rule_id):
+    return delete_rate_rule(rule_id)
+
+@admin_bp.route('/admin/stay-discounts', methods=['GET'])
+@token_required
+@admin_required
+@budget()
+def get_stay_discounts_route():
+    return get_stay_discounts()
+
+@admin_bp.route('/admin/stay-discounts', methods=['POST'])
+@token_required
+@admin_required
+@budget(COST_WRITE)
+def create_stay_discount_route():
+    return create_stay_discount()
+
+@admin_bp.route('/admin/stay-discounts/<uuid:discount_id>', methods=['DELETE'])
+@token_required
+@admin_required
+@budget(COST_WRITE)
+def delete_stay_discount_route(discount_id):
+    return delete_stay_discount(discount_id)
@@ -0,0 +1,39 @@
+from quart import Blueprint
+from controllers.async_read_controller import (
+    get_all_rooms, get_available_rooms, get_room,
+    get_booking, get_all_bookings, get_user_bookings
+)
+from utils.async_auth import async_token_required, async_admin_required
+
+async_read_bp = Blueprint('async_read', __name__)
+
+@async_read_bp.route('/rooms')
+@async_token_required
+async def get_all_rooms_route():
+    return await get_all_rooms()
+
+@async_read_bp.route('/rooms/available')
+@async_token_required
+async def get_available_rooms_route():
+    return await get_available_rooms()
+
+@async_read_bp.route('/room/<uuid:room_id>')
+@async_token_required
+async def get_room_route(room_id):
+    return await get_room(room_id)
+
+@async_read_bp.route('/bookings')
+@async_token_required
+@async_admin_required
+async def get_all_bookings_route():
+    return await get_all_bookings()
+
+@async_read_bp.route('/booking/<uuid:booking_id>')
+@async_token_required
+async def get_booking_route(booking_id):
+    return await get_booking(booking_id)
+
+@async_read_bp.route('/user/<uuid:user_id>/bookings')
+@async_token_required
+async def get_user_bookings_route(user_id):
+    return await get_user_bookings(user_id)
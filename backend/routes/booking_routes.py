@@ -1,58 +1,85 @@
 from flask import Blueprint, request, jsonify, g
 from controllers import (
     get_all_bookings, get_booking, get_user_bookings,
-    create_booking, update_booking,
-    delete_booking, cancel_booking
+    create_booking, create_bookings_batch, update_booking,
+    delete_booking, cancel_booking, export_bookings, create_quotes
 )
-from utils import token_required, admin_required, cache, limiter
+from utils import token_required, admin_required, limiter, shared_cached, conditional, idempotent, budget, batch_cost, quote_cost, COST_WRITE, COST_EXPORT
 
 booking_bp = Blueprint('booking', __name__)
 
 @booking_bp.route('/bookings', methods=['GET'])
 @token_required
 @admin_required
-@cache.cached(timeout=20)
+@budget()
+@shared_cached(20, 'bookings')
 def get_all_bookings_route():
     return get_all_bookings()
 
+@booking_bp.route('/bookings/export', methods=['GET'])
+@token_required
+@admin_required
+@budget(COST_EXPORT)
+@limiter.limit("5/minute")
+def export_bookings_route():
+    return export_bookings()
+
 @booking_bp.route('/booking/<uuid:booking_id>', methods=['GET'])
 @token_required
-@cache.cached(
-    timeout=20,
-    key_prefix=lambda: f"user_{g.current_user.user_id}_booking_{request.view_args.get('booking_id')}"
-)
+@budget()
+@conditional(lambda: f"booking_{request.view_args.get('booking_id')}")
+@shared_cached(20, lambda: f"booking_{request.view_args.get('booking_id')}", per_user=True)
 def get_booking_route(booking_id):
     return get_booking(booking_id)
 
 @booking_bp.route('/booking', methods=['POST'])
 @token_required
+@idempotent
+@budget(COST_WRITE)
 @limiter.limit("2/30minutes")
 def create_booking_route():
     return create_booking()
 
+@booking_bp.route('/bookings/batch', methods=['POST'])
+@token_required
+@budget(batch_cost)
+@limiter.limit("10/minute")
+def create_bookings_batch_route():
+    return create_bookings_batch()
+
+@booking_bp.route('/quotes', methods=['POST'])
+@token_required
+@budget(quote_cost)
+def create_quotes_route():
+    return create_quotes()
+
 @booking_bp.route('/booking/<uuid:booking_id>', methods=['PUT'])
 @token_required
+@idempotent
+@budget(COST_WRITE)
 @limiter.limit("2/30minutes")
 def update_booking_route(booking_id):
     return update_booking(booking_id)
 
 @booking_bp.route('/booking/<uuid:booking_id>', methods=['DELETE'])
 @token_required
+@budget(COST_WRITE)
 @limiter.limit("2/30minutes")
 def delete_booking_route(booking_id):
     return delete_booking(booking_id)
 
 @booking_bp.route('/booking/<uuid:booking_id>/cancel', methods=['POST'])
 @token_required
+@idempotent
+@budget(COST_WRITE)
 @limiter.limit("2/30minutes")
 def cancel_booking_route(booking_id):
     return cancel_booking(booking_id)
 
 @booking_bp.route('/user/<uuid:user_id>/bookings', methods=['GET'])
 @token_required
-@cache.cached(
-    timeout=20,
-    key_prefix=lambda: f"user_{g.current_user.user_id}_user_bookings_{request.view_args.get('user_id')}"
-)
+@budget()
+@conditional(lambda: f"user_{request.view_args.get('user_id')}_bookings")
+@shared_cached(20, lambda: f"user_{request.view_args.get('user_id')}_bookings", per_user=True)
 def get_user_bookings_route(user_id):
     return get_user_bookings(user_id)
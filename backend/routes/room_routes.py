@@ -1,26 +1,58 @@
 from flask import Blueprint, request, jsonify, g
-from controllers import get_all_rooms, get_room, create_room, update_room, delete_room
-from utils import token_required, admin_required, limiter, cache
+from controllers import (
+    get_all_rooms, get_available_rooms, get_room, create_room, update_room, delete_room,
+    get_room_calendar, get_rooms_calendar, hold_room, release_hold, flag_held_rooms
+)
+from utils import token_required, admin_required, limiter, shared_cached, conditional, idempotent, budget, COST_WRITE
 
 room_bp = Blueprint('room', __name__)
 
+# Limiter decorators go together above conditional/shared_cached: they are
+# checked where the innermost one wraps the view, so a limit below a cache
+# layer would let cache hits and 304s skip every limit of the route
+
 @room_bp.route('/rooms')
 @token_required
-@cache.cached(timeout=15, key_prefix=lambda: f"user_{g.current_user.user_id}_rooms")
+@budget()
 @limiter.limit("10 per hour")
+@conditional('rooms')
+@shared_cached(15, 'rooms')
 def get_all_rooms_route():
     return get_all_rooms()
 
+@room_bp.route('/rooms/available')
+@token_required
+@budget()
+@shared_cached(15, 'rooms', 'availability', annotate=flag_held_rooms)
+def get_available_rooms_route():
+    return get_available_rooms()
+
 @room_bp.route('/room/<uuid:room_id>')
 @token_required
-@cache.cached(timeout=15, key_prefix=lambda: f"user_{g.current_user.user_id}_room_{request.view_args.get('room_id')}")
+@budget()
 @limiter.limit("10 per hour")
+@conditional(lambda: f"room_{request.view_args.get('room_id')}")
+@shared_cached(15, lambda: f"room_{request.view_args.get('room_id')}")
 def get_room_route(room_id):
     return get_room(room_id)
 
+@room_bp.route('/room/<uuid:room_id>/calendar')
+@token_required
+@budget()
+def get_room_calendar_route(room_id):
+    return get_room_calendar(room_id)
+
+@room_bp.route('/rooms/calendar')
+@token_required
+@admin_required
+@budget()
+def get_rooms_calendar_route():
+    return get_rooms_calendar()
+
 @room_bp.route('/room', methods=['POST'])
 @token_required
 @admin_required
+@idempotent
 @limiter.exempt
 def create_room_route():
     return create_room()    
@@ -38,3 +70,16 @@ def update_room_route(room_id):
 @limiter.exempt
 def delete_room_route(room_id):
     return delete_room(room_id)
+
+@room_bp.route('/room/<uuid:room_id>/hold', methods=['POST'])
+@token_required
+@budget(COST_WRITE)
+@limiter.limit("20/minute")
+def hold_room_route(room_id):
+    return hold_room(room_id)
+
+@room_bp.route('/hold/<uuid:hold_id>', methods=['DELETE'])
+@token_required
+@budget()
+def release_hold_route(hold_id):
+    return release_hold(hold_id)
@@ -1,11 +1,12 @@
 from flask import Blueprint, request, jsonify, g
 from controllers import register_user, login_user, get_user, update_user
-from utils import token_required, limiter, cache
+from utils import token_required, limiter, shared_cached, budget, COST_WRITE
 from flask_limiter.util import get_remote_address
 
 user_bp = Blueprint('user', __name__)
 
 @user_bp.route('/user/register', methods=['POST'])
+@budget(COST_WRITE)
 def register_route():
     return register_user()
 
@@ -16,12 +17,14 @@ def login_route():
 
 @user_bp.route('/user/<uuid:user_id>')
 @token_required
-@cache.cached(timeout=15, key_prefix=lambda: f"user_{g.current_user.user_id}")
+@budget()
+@shared_cached(15, lambda: f"user_{request.view_args.get('user_id')}", per_user=True)
 def get_user_route(user_id):
     return get_user(user_id)
 
 @user_bp.route('/user/update/<uuid:user_id>', methods=['PUT'])
 @token_required
+@budget(COST_WRITE)
 @limiter.limit("10 per hour") 
 def update_user_route(user_id):
     return update_user(user_id)
@@ -4,4 +4,8 @@ from schemas.room_schema import RoomSchema
 
 from schemas.booking_schema import BookingSchema
 
-_all__ = ['UserBaseSchema', 'UserRegisterSchema', 'UserLoginSchema', 'UserReadSchema', 'UserUpdateSchema', 'RoomSchema', 'BookingSchema']
\ No newline at end of file
+from schemas.rate_schema import RateRuleSchema, StayDiscountSchema, QuoteSchema
+
+from schemas.hold_schema import HoldSchema
+
+_all__ = ['UserBaseSchema', 'UserRegisterSchema', 'UserLoginSchema', 'UserReadSchema', 'UserUpdateSchema', 'RoomSchema', 'BookingSchema', 'RateRuleSchema', 'StayDiscountSchema', 'QuoteSchema', 'HoldSchema']
\ No newline at end of file
@@ -0,0 +1,13 @@
+from marshmallow import Schema, fields, validates_schema, ValidationError
+
+class HoldSchema(Schema):
+    start_date = fields.Date(required=True)
+    end_date = fields.Date(required=True)
+
+    @validates_schema
+    def validate_dates(self, data, **kwargs):
+        if data['end_date'] <= data['start_date']:
+            raise ValidationError("Must be after start_date.", "end_date")
+
+    class Meta:
+        ordered = True
@@ -0,0 +1,46 @@
+from marshmallow import Schema, fields, validate, validates_schema, ValidationError
+
+ROOM_TYPES = ['Single', 'Double', 'Suite']
+
+class RateRuleSchema(Schema):
+    rule_id = fields.UUID(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
+    room_type = fields.Str(allow_none=True, load_default=None, validate=validate.OneOf(ROOM_TYPES))
+    start_date = fields.Date(required=True)
+    end_date = fields.Date(required=True)
+    # Bit 0 = Monday ... bit 6 = Sunday; 127 is every day, 48 Saturday and Sunday
+    weekdays = fields.Int(load_default=127, validate=validate.Range(min=1, max=127))
+    percent = fields.Int(allow_none=True, load_default=None, validate=validate.Range(min=1, max=1000))
+    price_per_night = fields.Int(allow_none=True, load_default=None, validate=validate.Range(min=0))
+    priority = fields.Int(load_default=0)
+
+    @validates_schema
+    def validate_rate(self, data, **kwargs):
+        if data['end_date'] <= data['start_date']:
+            raise ValidationError("Must be after start_date.", "end_date")
+        if (data['percent'] is None) == (data['price_per_night'] is None):
+            raise ValidationError("Set exactly one of percent or price_per_night.", "percent")
+
+    class Meta:
+        ordered = True
+
+class StayDiscountSchema(Schema):
+    discount_id = fields.UUID(dump_only=True)
+    room_type = fields.Str(allow_none=True, load_default=None, validate=validate.OneOf(ROOM_TYPES))
+    min_nights = fields.Int(required=True, validate=validate.Range(min=1))
+    percent_off = fields.Int(required=True, validate=validate.Range(min=1, max=100))
+
+    class Meta:
+        ordered = True
+
+class QuoteSchema(Schema):
+    room_id = fields.UUID(required=True)
+    start_date = fields.Date(required=True)
+    end_date = fields.Date(required=True)
+    nights = fields.Int(dump_only=True)
+    subtotal = fields.Int(dump_only=True)
+    discount = fields.Int(dump_only=True)
+    total_price = fields.Int(dump_only=True)
+
+    class Meta:
+        ordered = True
@@ -0,0 +1,20 @@
+import time
+
+from flask import g
+
+from config import Config
+from utils.cache import cache, invalidate, tag_versions
+
+
+def test_fresh_bump_pins_reads_to_primary(app, monkeypatch):
+    monkeypatch.setattr(Config, "DATABASE_REPLICA_URLS", ["postgresql://replica/hotel_booking"])
+    cache.set("tag_rooms", f"{int(time.time() - Config.REPLICA_MAX_LAG_SECONDS - 5):x}-00000000", timeout=0)
+
+    with app.test_request_context():
+        tag_versions("rooms")
+        assert not g.get("read_primary")
+
+    invalidate("rooms")
+    with app.test_request_context():
+        tag_versions("rooms")
+        assert g.read_primary
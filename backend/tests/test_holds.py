@@ -0,0 +1,68 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from utils.holds import HoldConflict, HoldStore
+
+ROOM = uuid.uuid4()
+GUEST, OTHER_GUEST = uuid.uuid4(), uuid.uuid4()
+START, END = date(2030, 5, 1), date(2030, 5, 4)
+
+
+@pytest.fixture
+def store(app):
+    return HoldStore(ttl=60, max_per_user=2, lock_seconds=5, wait_seconds=0.2)
+
+
+def test_hold_blocks_other_guests(store):
+    store.place(ROOM, GUEST, START, END)
+
+    with pytest.raises(HoldConflict):
+        store.place(ROOM, OTHER_GUEST, date(2030, 5, 3), date(2030, 5, 6))
+    # Back-to-back stays do not overlap
+    store.place(ROOM, OTHER_GUEST, END, date(2030, 5, 6))
+
+    assert store.held([ROOM], START, END, OTHER_GUEST) == {str(ROOM)}
+    assert store.held([ROOM], START, END, GUEST) == set()
+
+
+def test_rehold_replaces_own_hold(store):
+    first = store.place(ROOM, GUEST, START, END)
+    second = store.place(ROOM, GUEST, date(2030, 5, 2), date(2030, 5, 5))
+
+    assert store.release(first["hold_id"], GUEST) is None
+    assert store.release(second["hold_id"], GUEST) == second
+
+
+def test_max_holds_per_guest(store):
+    for _ in range(2):
+        store.place(uuid.uuid4(), GUEST, START, END)
+
+    with pytest.raises(HoldConflict):
+        store.place(uuid.uuid4(), GUEST, START, END)
+
+
+def test_claim_conflicts_and_convert(store):
+    hold = store.place(ROOM, GUEST, START, END)
+    stays = [(ROOM, START, END)]
+
+    with store.claim(stays, OTHER_GUEST) as claim:
+        assert claim.conflicts == {0}
+
+    with store.claim(stays, GUEST) as claim:
+        assert claim.conflicts == set()
+        claim.convert(stays)
+
+    assert store.held([ROOM], START, END) == set()
+    assert store.release(hold["hold_id"], GUEST) is None
+    store.place(ROOM, OTHER_GUEST, START, END)
+
+
+def test_release_frees_dates(store):
+    hold = store.place(ROOM, GUEST, START, END)
+
+    assert store.release(hold["hold_id"], OTHER_GUEST) is None
+    assert store.release(hold["hold_id"], GUEST) == hold
+    assert store.held([ROOM], START, END) == set()
+    store.place(ROOM, OTHER_GUEST, START, END)
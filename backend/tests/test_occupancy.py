@@ -0,0 +1,75 @@
+import threading
+import uuid
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from utils.cache import cache
+from utils.occupancy import CHANGE_KEY, VERSION_KEY, OccupancyIndex
+
+ROOM = uuid.uuid4()
+START = date.today() + timedelta(days=10)
+END = START + timedelta(days=3)
+
+
+def built(index):
+    # What rebuild() would load for one room without bookings
+    index.epoch = date.today() - timedelta(days=index.past_days)
+    index._rooms = {ROOM: np.zeros(index.past_days + index.future_days, dtype=np.uint8)}
+    index._room_numbers = {ROOM: 101}
+    index.version = cache.get(VERSION_KEY) or 0
+    return index
+
+
+@pytest.fixture
+def workers(app, monkeypatch):
+    rebuilt = threading.Event()
+    monkeypatch.setattr(OccupancyIndex, "rebuild", lambda self: rebuilt.set())
+    return built(OccupancyIndex(30, 60)), built(OccupancyIndex(30, 60)), rebuilt
+
+
+def test_other_workers_writes_are_replayed(workers):
+    writer, reader, rebuilt = workers
+    writer.book(ROOM, START, END)
+    writer.release(ROOM, START, START + timedelta(days=1))
+
+    reader.refresh_if_stale()
+
+    assert reader.room_calendar(ROOM, START, END).tolist() == [0, 1, 1]
+    assert reader.version == writer.version == 2
+    assert not rebuilt.is_set()
+
+
+def test_own_write_during_a_gap_is_replayed_in_order(workers):
+    writer, reader, rebuilt = workers
+    writer.book(ROOM, START, END)
+    reader.release(ROOM, START, END)
+    assert reader.version == 0
+
+    reader.refresh_if_stale()
+
+    assert reader.room_calendar(ROOM, START, END).tolist() == [0, 0, 0]
+    assert reader.version == 2
+    assert not rebuilt.is_set()
+
+
+def test_lost_change_rebuilds_in_background(workers):
+    writer, reader, rebuilt = workers
+    writer.book(ROOM, START, END)
+    cache.delete(f"{CHANGE_KEY}_1")
+
+    reader.refresh_if_stale()
+
+    # The current index keeps serving while the rebuild runs
+    assert reader.room_calendar(ROOM, START, END).tolist() == [0, 0, 0]
+    assert rebuilt.wait(1)
+
+
+def test_room_change_rebuilds_before_the_read(workers):
+    writer, reader, rebuilt = workers
+    writer.invalidate()
+
+    reader.refresh_if_stale()
+
+    assert rebuilt.is_set()
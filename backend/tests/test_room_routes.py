@@ -0,0 +1,84 @@
+import uuid
+from datetime import date
+
+import jwt
+import pytest
+from flask import Flask
+
+import routes.room_routes as room_routes
+from config import Config
+from routes import room_bp
+from utils import holds, json_response, limiter
+from utils.cache import cache
+from utils.principals import Principal, principals
+
+GUEST, OTHER_GUEST = uuid.uuid4(), uuid.uuid4()
+ROOMS = [str(uuid.uuid4()) for _ in range(2)]
+SEARCH = "/api/rooms/available?start=2030-05-01&end=2030-05-04"
+
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {jwt.encode({'user_id': str(user_id)}, Config.SECRET_KEY, algorithm='HS256')}"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(
+        CACHE_TYPE="SimpleCache",
+        RATELIMIT_STORAGE_URI="memory://",
+        RATELIMIT_BUDGET="100 per minute"
+    )
+    cache.init_app(app)
+    limiter.init_app(app)
+    app.register_blueprint(room_bp, url_prefix="/api")
+
+    monkeypatch.setattr(principals, "get", lambda user_id: Principal(user_id, "user", "Guest"))
+    searches = []
+
+    def get_available_rooms():
+        searches.append(1)
+        return json_response({"data": [{"room_id": room_id, "total_price": 300} for room_id in ROOMS], "pagination": {}}), 200
+
+    monkeypatch.setattr(room_routes, "get_available_rooms", get_available_rooms)
+    monkeypatch.setattr(room_routes, "get_all_rooms", lambda: get_available_rooms())
+    monkeypatch.setattr(room_routes, "get_room", lambda room_id: ({"room_id": str(room_id)}, 200))
+    app.searches = searches
+
+    with app.app_context():
+        cache.clear()
+    return app.test_client()
+
+
+def test_search_flags_rooms_held_by_others(client):
+    first = client.get(SEARCH, headers=auth(OTHER_GUEST))
+    assert [room.get("held") for room in first.json["data"]] == [None, None]
+
+    with client.application.app_context():
+        holds.place(ROOMS[0], GUEST, date(2030, 5, 2), date(2030, 5, 3))
+
+    seen_by_other = client.get(SEARCH, headers=auth(OTHER_GUEST))
+    assert [room.get("held") for room in seen_by_other.json["data"]] == [True, None]
+    # The holder does not see their own hold, and the page came from the cache
+    seen_by_holder = client.get(SEARCH, headers=auth(GUEST))
+    assert [room.get("held") for room in seen_by_holder.json["data"]] == [None, None]
+    assert len(client.application.searches) == 1
+
+    # A validator issued before the hold does not revalidate the flagged page
+    revalidated = client.get(SEARCH, headers={**auth(OTHER_GUEST), "If-None-Match": f'"{first.get_etag()[0]}"'})
+    assert revalidated.status_code == 200
+    assert revalidated.json["data"][0]["held"] is True
+    assert client.get(SEARCH, headers={**auth(OTHER_GUEST), "If-None-Match": f'"{revalidated.get_etag()[0]}"'}).status_code == 304
+
+
+@pytest.mark.parametrize("path", ["/api/rooms", f"/api/room/{ROOMS[0]}"])
+def test_cached_reads_consume_budget(client, path):
+    client.application.config["RATELIMIT_BUDGET"] = "3 per minute"
+    headers = auth(GUEST)
+
+    etag = client.get(path, headers=headers).get_etag()[0]
+    assert client.get(path, headers=headers).status_code == 200
+    assert client.get(path, headers={**headers, "If-None-Match": f'"{etag}"'}).status_code == 304
+    assert client.get(path, headers=headers).status_code == 429
+    assert len(client.application.searches) <= 1
@@ -1,9 +1,35 @@
 from utils.auth import token_required, admin_required
 
-from utils.cache import cache, init_cache
+from utils.cache import cache, init_cache, tagged_key, invalidate, shared_cached
 
-from utils.logger import logger
+from utils.conditional import conditional
 
-from utils.limiter import limiter
+from utils.idempotency import idempotent
 
-__all__ = ['token_required','admin_required', 'cache', 'init_cache', 'logger', 'limiter']
\ No newline at end of file
+from utils.compression import compress
+
+from utils.logger import logger, init_request_logging, start_log_listener
+
+from utils.limiter import limiter, budget, batch_cost, quote_cost, COST_READ, COST_WRITE, COST_EXPORT
+
+from utils.pagination import paginate
+
+from utils.principals import invalidate_principal
+
+from utils.passwords import passwords, HasherBusy
+
+from utils.occupancy import occupancy, to_calendar_string
+
+from utils.pricing import pricing
+
+from utils.holds import holds, HoldConflict, HoldStoreBusy
+
+from utils.metrics import init_metrics
+
+from utils.rollups import add_booking_stats, remove_booking_stats, add_room_stats, remove_room_stats, rebuild_stats
+
+from utils.serialization import RowSerializer, json_response
+
+from utils.schema_version import check_schema_head, SchemaOutdated
+
+__all__ = ['token_required','admin_required', 'cache', 'init_cache', 'tagged_key', 'invalidate', 'shared_cached', 'conditional', 'idempotent', 'compress', 'logger', 'init_request_logging', 'start_log_listener', 'limiter', 'budget', 'batch_cost', 'quote_cost', 'COST_READ', 'COST_WRITE', 'COST_EXPORT', 'paginate', 'invalidate_principal', 'passwords', 'HasherBusy', 'occupancy', 'to_calendar_string', 'pricing', 'holds', 'HoldConflict', 'HoldStoreBusy', 'init_metrics', 'add_booking_stats', 'remove_booking_stats', 'add_room_stats', 'remove_room_stats', 'rebuild_stats', 'RowSerializer', 'json_response', 'check_schema_head', 'SchemaOutdated']
\ No newline at end of file
@@ -0,0 +1,43 @@
+import asyncio
+from functools import wraps
+from quart import request, jsonify, g
+from models import User
+from async_database import AsyncSession
+from utils.auth import user_id_from_token
+from utils.principals import Principal, principals
+
+def async_admin_required(f):
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        user = getattr(g, "current_user", None)
+        if not user or getattr(user, "role", None) != "admin":
+            return jsonify({"message": "Admin access required"}), 403
+        return await f(*args, **kwargs)
+    return decorated
+
+def async_token_required(f):
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        user_uuid, error = user_id_from_token(request.headers.get("Authorization", None))
+        if error:
+            return jsonify({"message": error}), 401
+
+        # Shares the principal cache with the sync app's token_required; the
+        # shared lookup is a blocking Redis round trip, so it runs off the loop
+        current_user = principals.get_local(user_uuid)
+        if current_user is None:
+            current_user = await asyncio.to_thread(principals.get, user_uuid)
+        if current_user is None:
+            async with AsyncSession() as session:
+                user = await session.get(User, user_uuid)
+
+            if not user:
+                return jsonify({"message": "User not found"}), 401
+
+            current_user = Principal(user.user_id, user.role, user.name)
+            await asyncio.to_thread(principals.set, current_user)
+
+        g.current_user = current_user
+        return await f(*args, **kwargs)
+
+    return decorated
@@ -5,6 +5,7 @@ import jwt
 from config import Config
 from models import User
 from database import Session
+from utils.principals import Principal, principals
 
 def admin_required(f):
     @wraps(f)
@@ -15,38 +16,51 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated
 
+def user_id_from_token(header):
+    """
+    Validate an Authorization header value ("Bearer <jwt>").
+    Returns (user_uuid, None) on success or (None, error_message).
+    """
+    if not header:
+        return None, "Token is missing"
+
+    try:
+        parts = header.split()
+        if len(parts) != 2 or parts[0].lower() != "bearer":
+            return None, "Invalid token header format"
+
+        data = jwt.decode(parts[1], Config.SECRET_KEY, algorithms=["HS256"])
+
+        try:
+            return uuid.UUID(data["user_id"]), None
+        except (ValueError, AttributeError, KeyError):
+            return None, "Invalid token data"
+
+    except jwt.ExpiredSignatureError:
+        return None, "Token has expired"
+    except jwt.InvalidTokenError:
+        return None, "Token is invalid"
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = request.headers.get("Authorization", None)
-        if not token:
-            return jsonify({"message": "Token is missing"}), 401
+        user_uuid, error = user_id_from_token(request.headers.get("Authorization", None))
+        if error:
+            return jsonify({"message": error}), 401
 
-        try:
-            parts = token.split()
-            if len(parts) != 2 or parts[0].lower() != "bearer":
-                return jsonify({"message": "Invalid token header format"}), 401
-
-            token = parts[1]
-            data = jwt.decode(token, Config.SECRET_KEY, algorithms=["HS256"])
-            
- 
+        current_user = principals.get(user_uuid)
+        if current_user is None:
+            session = Session()
             try:
-                user_uuid = uuid.UUID(data["user_id"])
-            except (ValueError, AttributeError):
-                return jsonify({"message": "Invalid token data"}), 401
-
-        except jwt.ExpiredSignatureError:
-            return jsonify({"message": "Token has expired"}), 401
-        except jwt.InvalidTokenError:
-            return jsonify({"message": "Token is invalid"}), 401
+                user = session.get(User, user_uuid)
+            finally:
+                session.close()
 
-        session = Session()
-        current_user = session.query(User).get(user_uuid)
-        session.close()
+            if not user:
+                return jsonify({"message": "User not found"}), 401
 
-        if not current_user:
-            return jsonify({"message": "User not found"}), 401
+            current_user = Principal(user.user_id, user.role, user.name)
+            principals.set(current_user)
 
         g.current_user = current_user
         return f(*args, **kwargs)
@@ -1,41 +1,316 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, g, has_request_context, make_response, request
+from cachelib import RedisCache
 from flask_caching import Cache
+from config import Config
 
-cache = Cache()
 
-def init_cache(app):
+class MeteredCache(Cache):
+    """Cache that flags the request when a cache.cached view has to run (a miss)."""
+
+    def _call_fn(self, fn, *args, **kwargs):
+        if has_request_context():
+            g.cache_miss = True
+        return super()._call_fn(fn, *args, **kwargs)
+
+
+cache = MeteredCache()
+
+# Prefix of every shared cache key, also used by clients outside Flask-Caching
+KEY_PREFIX = "hotel_booking_"
+
+def init_cache(app, background_probe=False):
     """
     Initialize cache with optimized settings.
-    Falls back to SimpleCache if Redis is not available.
+    Falls back to SimpleCache if Redis is not available. With
+    background_probe the Redis check runs in a thread, so boot does not
+    wait on its connect timeout; until it fails, Redis is assumed up.
     """
+    # Try Redis first for production performance
+    app.config["CACHE_TYPE"] = "RedisCache"
+    # Same Redis as the rate limiter storage
+    app.config["CACHE_REDIS_URL"] = app.config["REDIS_URL"]
+    app.config["CACHE_DEFAULT_TIMEOUT"] = 300  # 5 minutes
+    app.config["CACHE_KEY_PREFIX"] = KEY_PREFIX
+
+    # Connection pool settings for better performance
+    app.config["CACHE_OPTIONS"] = {
+        "socket_connect_timeout": 2,
+        "socket_timeout": 2,
+        "max_connections": 50,
+        "retry_on_timeout": True
+    }
+
+    cache.init_app(app)
+
+    if background_probe:
+        _start_probe(app)
+    else:
+        _probe_redis(app)
+
+
+_pending_probe = None  # app whose background probe has not finished
+
+
+def _probe_redis(app):
+    global _pending_probe
     try:
-        # Try Redis first for production performance
-        app.config["CACHE_TYPE"] = "RedisCache"
-        app.config["CACHE_REDIS_HOST"] = "localhost"
-        app.config["CACHE_REDIS_PORT"] = 6379
-        app.config["CACHE_REDIS_DB"] = 0
-        app.config["CACHE_DEFAULT_TIMEOUT"] = 300  # 5 minutes
-        app.config["CACHE_KEY_PREFIX"] = "hotel_booking_"
-        
-        # Connection pool settings for better performance
-        app.config["CACHE_OPTIONS"] = {
-            "socket_connect_timeout": 2,
-            "socket_timeout": 2,
-            "max_connections": 50,
-            "retry_on_timeout": True
-        }
-        
-        cache.init_app(app)
-        
         # Test Redis connection
-        cache.get("test")
+        with app.app_context():
+            cache.get("test")
         print("✓ Redis cache initialized successfully")
-        
     except Exception as e:
         print(f"⚠ Redis not available ({str(e)}), falling back to SimpleCache")
-        
+
         # Fallback to SimpleCache (in-memory)
         app.config["CACHE_TYPE"] = "SimpleCache"
         app.config["CACHE_DEFAULT_TIMEOUT"] = 300
         app.config["CACHE_THRESHOLD"] = 500  # Max items to store
-        
+        # The Redis connection options are not SimpleCache arguments
+        app.config.pop("CACHE_OPTIONS", None)
+
         cache.init_app(app)
+    finally:
+        _pending_probe = None
+
+
+def _start_probe(app):
+    global _pending_probe
+    _pending_probe = app
+    threading.Thread(target=_probe_redis, args=(app,), name="cache-probe", daemon=True).start()
+
+
+def _resume_probe_after_fork():
+    # Threads do not survive a fork; a child forked mid-probe runs its own
+    if _pending_probe is not None:
+        _start_probe(_pending_probe)
+
+
+os.register_at_fork(after_in_child=_resume_probe_after_fork)
+
+
+def _new_version():
+    # Hex seconds since the epoch, then a random part: unique per bump and
+    # still tells when the tag last changed (see version_time)
+    return f"{int(time.time()):x}-{uuid.uuid4().hex[:8]}"
+
+
+_counter_lock = threading.Lock()
+
+
+def bump_counter(key):
+    """
+    Increment a shared counter that never expires and return its new value.
+    Redis INCR leaves the key without a TTL, but the other backends' inc
+    re-sets it with the default timeout, after which the counter would read
+    as changed; those (per-process) backends are incremented here instead.
+    """
+    backend = cache.cache
+    if isinstance(backend, RedisCache):
+        return backend.inc(key)
+    with _counter_lock:
+        value = (backend.get(key) or 0) + 1
+        backend.set(key, value, timeout=0)
+        return value
+
+
+def version_time(version):
+    """When a tag version was issued, or None for a malformed token."""
+    try:
+        return datetime.fromtimestamp(int(str(version).split("-", 1)[0], 16), timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def tag_versions(*tags):
+    """
+    Current version token of every tag. A tag that has never been bumped (or
+    was evicted) gets a fresh token, so a lost version can only orphan
+    entries, never resurrect stale ones.
+
+    In a request, a token issued within the replica lag bound pins the
+    request's reads to the primary (see _pin_recent), so a body cached or
+    validated under the new version is never read from a replica that has
+    not replayed the write behind it yet.
+    """
+    keys = [f"tag_{tag}" for tag in tags]
+    versions = cache.get_many(*keys)
+
+    missing = [key for key, version in zip(keys, versions) if version is None]
+    if missing:
+        for key in missing:
+            cache.add(key, _new_version(), timeout=0)
+        # Re-read so concurrent initialisers agree on the winning token
+        versions = cache.get_many(*keys)
+    _pin_recent(versions)
+    return versions
+
+
+def _pin_recent(versions):
+    # Replicas lagging more than REPLICA_MAX_LAG_SECONDS are not read from,
+    # so a bump older than that (plus the token's one-second resolution) is
+    # visible on all of them
+    if not Config.DATABASE_REPLICA_URLS or not has_request_context():
+        return
+    horizon = time.time() - Config.REPLICA_MAX_LAG_SECONDS - 1
+    for version in versions:
+        issued = version_time(version)
+        if issued is None or issued.timestamp() >= horizon:
+            g.read_primary = True
+            return
+
+
+def tagged_key(key, *tags):
+    """
+    Cache key for an entry that depends on tags. The key embeds every tag's
+    version, so invalidate() orphans the entry instead of deleting it.
+    """
+    return f"{key}@{'.'.join(str(v) for v in tag_versions(*tags))}"
+
+
+def invalidate(*tags):
+    """Bump the version of each tag, invalidating only the entries keyed on them."""
+    if tags:
+        cache.set_many({f"tag_{tag}": _new_version() for tag in set(tags)}, timeout=0)
+
+
+def normalized_query():
+    """The request's query string with parameters sorted, so equal queries share a key."""
+    return urlencode(sorted(request.args.items(multi=True)))
+
+
+def etag_matches(etag):
+    """
+    The If-None-Match tag naming etag, either as issued or with the
+    ":<encoding>" suffix Flask-Compress puts on compressed variants, or None.
+    """
+    if not request.if_none_match:
+        return None
+    encodings = current_app.config.get("COMPRESS_ALGORITHM", [])
+    for tag in (etag, *(f"{etag}:{encoding}" for encoding in encodings)):
+        if request.if_none_match.contains(tag):
+            return tag
+    return None
+
+
+def _serve_compressed(key, entry):
+    # Lets utils.compression reuse this entry's compressed bytes. A refresh
+    # rewrites the entry under the same key, so the variants are keyed by the
+    # body's ETag too; entries without one are compressed on the fly
+    if len(entry) < 5:
+        return
+    g.compress_cache_key = f"{key}:{entry[4]}"
+    g.compress_cache_timeout = max(int(entry[0] - time.time()), 0) + current_app.config["CACHE_STALE_SECONDS"]
+
+
+def _body_etag(body):
+    return hashlib.sha256(body).hexdigest()[:32]
+
+
+def _cached_response(key, entry, annotate=None):
+    _, body, status, mimetype = entry[:4]
+    # Entries written before ETags were stored have none
+    etag = entry[4] if len(entry) > 4 else None
+
+    annotated = annotate(body) if annotate else None
+    if annotated is not None:
+        # Per-request body: validated on its own hash, compressed on the fly
+        body, etag = annotated, _body_etag(annotated)
+
+    matched = etag and etag_matches(etag)
+    if matched:
+        response = current_app.response_class(status=304)
+        response.set_etag(matched)
+        return response
+
+    response = current_app.response_class(body, status=status, mimetype=mimetype)
+    if etag:
+        response.set_etag(etag)
+    if annotated is None:
+        _serve_compressed(key, entry)
+    return response
+
+
+def shared_cached(timeout, *tags, per_user=False, annotate=None):
+    """
+    Cache a GET view's 200 responses under its path and normalized query,
+    versioned by tags (strings or per-request callables, see tagged_key).
+    Entries are shared by every caller unless per_user is set, so use it
+    for anything that depends on who is asking.
+
+    annotate, if given, is called with the cached body on every request
+    and returns a replacement body, or None to serve it unchanged. It is
+    for small per-request overlays on a shared page (state too volatile to
+    version with tags); an annotated body gets its own ETag.
+
+    Misses are single-flight: one request recomputes under a short lock,
+    concurrent ones wait up to CACHE_WAIT_SECONDS for its result. For
+    CACHE_STALE_SECONDS after an entry goes stale it is still served while
+    one request refreshes it.
+
+    Each entry stores a strong ETag of its body (If-None-Match on a hit gets
+    a 304), and its gzip/brotli bodies are cached alongside it by
+    utils.compression, so a hot page is compressed once per encoding.
+    """
+    def decorator(f):
+        def make_cache_key():
+            resolved = [tag() if callable(tag) else tag for tag in tags]
+            scope = f"user_{g.current_user.user_id}_" if per_user else ""
+            return tagged_key(f"view_{scope}{request.path}?{normalized_query()}", *resolved)
+
+        def refresh(key, lock_key, args, kwargs):
+            try:
+                g.cache_miss = True
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    body = response.get_data()
+                    entry = (time.time() + timeout, body, 200, response.mimetype, _body_etag(body))
+                    cache.set(key, entry, timeout=timeout + current_app.config["CACHE_STALE_SECONDS"])
+                    return _cached_response(key, entry, annotate)
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            key = make_cache_key()
+            lock_key = f"lock_{key}"
+            lock_timeout = current_app.config["CACHE_LOCK_SECONDS"]
+
+            entry = cache.get(key)
+            if entry is not None:
+                if entry[0] > time.time() or not cache.add(lock_key, 1, timeout=lock_timeout):
+                    # Fresh, or stale with another request already refreshing it
+                    return _cached_response(key, entry, annotate)
+                return refresh(key, lock_key, args, kwargs)
+
+            if cache.add(lock_key, 1, timeout=lock_timeout):
+                return refresh(key, lock_key, args, kwargs)
+
+            # Another request is computing this entry; wait for it
+            deadline = time.monotonic() + current_app.config["CACHE_WAIT_SECONDS"]
+            while time.monotonic() < deadline:
+                time.sleep(0.025)
+                entry = cache.get(key)
+                if entry is not None:
+                    return _cached_response(key, entry, annotate)
+
+            g.cache_miss = True
+            response = make_response(f(*args, **kwargs))
+            if annotate and response.status_code == 200 and not response.is_streamed:
+                annotated = annotate(response.get_data())
+                if annotated is not None:
+                    response.set_data(annotated)
+            return response
+
+        # Lets the metrics hook count hits and misses as for cache.cached
+        decorated.make_cache_key = make_cache_key
+        return decorated
+    return decorator
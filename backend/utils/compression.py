@@ -0,0 +1,28 @@
+from flask import g
+from flask_compress import Compress
+from utils.cache import cache
+
+
+class CachedCompress(Compress):
+    """
+    Flask-Compress, except that a response served from a shared_cached entry
+    is compressed once per encoding: the compressed bytes are cached next to
+    the entry (its key and body ETag plus the encoding) and live exactly as
+    long as it.
+    Every other response is compressed on the fly.
+    """
+
+    def compress(self, app, response, algorithm):
+        entry_key = g.get("compress_cache_key")
+        if entry_key is None:
+            return super().compress(app, response, algorithm)
+
+        key = f"{entry_key}:{algorithm}"
+        body = cache.get(key)
+        if body is None:
+            body = super().compress(app, response, algorithm)
+            cache.set(key, body, timeout=g.compress_cache_timeout)
+        return body
+
+
+compress = CachedCompress()
@@ -0,0 +1,57 @@
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from flask import g, make_response, request
+from utils.cache import etag_matches, tag_versions, version_time
+
+
+def conditional(*tags):
+    """
+    Strong ETag and Last-Modified for a GET view, derived from the version
+    tokens of tags (strings, or callables evaluated per request, like the
+    cache.cached key lambdas) which invalidate() bumps on every write.
+    A matching If-None-Match gets a 304 from one cache lookup, before any
+    cached body, query or serializer runs. If-Modified-Since is ignored:
+    Last-Modified has whole-second resolution, so it cannot tell apart two
+    writes in the same second and would revalidate stale copies.
+
+    The validator covers the caller and full path, so place it after
+    token_required; an ETag is never valid for another user. Right after a
+    bump the view reads from the primary (see tag_versions), so the body
+    sent under a new ETag is never a lagging replica's.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            resolved = [tag() if callable(tag) else tag for tag in tags]
+            versions = tag_versions(*resolved)
+
+            user = getattr(g.get("current_user"), "user_id", None)
+            digest = hashlib.sha256(f"{user}|{request.full_path}|{'.'.join(map(str, versions))}".encode())
+            etag = digest.hexdigest()[:32]
+
+            issued = [version_time(version) for version in versions]
+            # A token without a time is treated as just issued
+            last_modified = max(
+                (time or datetime.now(timezone.utc) for time in issued),
+                default=datetime.now(timezone.utc)
+            ).replace(microsecond=0)
+
+            # Compressed responses carry "<etag>:gzip" etc.; answer with the tag the client holds
+            matched = etag_matches(etag)
+            not_modified = matched is not None
+            etag = matched or etag
+
+            if not_modified:
+                response = make_response("", 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return decorated
+    return decorator
@@ -0,0 +1,245 @@
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import date
+from config import Config
+from utils.cache import cache
+
+# Live holds are kept per room ({hold_id: hold}) and indexed per guest, each
+# in a cache entry that expires with the last of its holds; expired holds are
+# dropped whenever an entry is read, so nothing ever has to sweep for them.
+# Locks are always taken rooms first (in sorted order), then the guest.
+
+
+def _room_key(room_id):
+    return f"room_holds_{room_id}"
+
+
+def _user_key(user_id):
+    return f"user_holds_{user_id}"
+
+
+class HoldConflict(Exception):
+    """The dates are held by another guest, or the guest has too many holds."""
+
+
+class HoldStoreBusy(Exception):
+    """A hold lock could not be taken in time; the caller should answer 503."""
+
+
+def _overlaps(hold, start_date, end_date):
+    return (date.fromisoformat(hold["start_date"]) < end_date
+            and date.fromisoformat(hold["end_date"]) > start_date)
+
+
+class HoldClaim:
+    """
+    The holds on a set of rooms, read while holds.claim keeps those rooms
+    locked, so checking them and converting them after the booking commits
+    is one atomic step against other holds and bookings of the rooms.
+    """
+
+    def __init__(self, store, stays, user_id, by_room):
+        self.store = store
+        self.user_id = str(user_id)
+        self.by_room = by_room
+        self.conflicts = {
+            index for index, (room_id, start_date, end_date) in enumerate(stays)
+            if any(hold["user_id"] != self.user_id and _overlaps(hold, start_date, end_date)
+                   for hold in by_room.get(str(room_id), {}).values())
+        }
+
+    def convert(self, stays):
+        """
+        Drop the guest's holds on the booked stays. Best effort: a hold left
+        behind only blocks dates that are booked anyway, until it expires.
+        """
+        converted, changed = set(), set()
+        for room_id, start_date, end_date in stays:
+            room_holds = self.by_room.get(str(room_id), {})
+            for hold_id, hold in list(room_holds.items()):
+                if hold["user_id"] == self.user_id and _overlaps(hold, start_date, end_date):
+                    del room_holds[hold_id]
+                    converted.add(hold_id)
+                    changed.add(str(room_id))
+        if not converted:
+            return
+        try:
+            for room_id in changed:
+                self.store._save(_room_key(room_id), self.by_room[room_id])
+            with self.store._locked(f"lock_{_user_key(self.user_id)}"):
+                user_holds = self.store._live(_user_key(self.user_id))
+                for hold_id in converted:
+                    user_holds.pop(hold_id, None)
+                self.store._save(_user_key(self.user_id), user_holds)
+        except Exception:
+            pass
+
+
+class HoldStore:
+    """
+    Short-lived room holds kept in the cache backend, so a guest in checkout
+    keeps the dates they picked for ttl seconds and other guests are turned
+    away when they try to hold or book them. Each room has its own entry and
+    lock, so holds on different rooms never contend. Bookings check and
+    convert holds under the rooms' locks (see claim), and the availability
+    search flags rooms held by others (see held). If the store cannot be
+    reached holds are not enforced and the exclusion constraint on bookings
+    still is. With the SimpleCache fallback holds are per process.
+    """
+
+    def __init__(self, ttl, max_per_user, lock_seconds, wait_seconds):
+        self.ttl = ttl
+        self.max_per_user = max_per_user
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+
+    def place(self, room_id, user_id, start_date, end_date):
+        """
+        Hold room_id for [start_date, end_date) for user_id. The user's own
+        overlapping hold on the room is replaced, which also extends it.
+        """
+        room_key, user_key = _room_key(room_id), _user_key(user_id)
+        with self._locked(f"lock_{room_key}", f"lock_{user_key}"):
+            room_holds = self._live(room_key)
+            user_holds = self._live(user_key)
+            for hold_id, hold in list(room_holds.items()):
+                if not _overlaps(hold, start_date, end_date):
+                    continue
+                if hold["user_id"] != str(user_id):
+                    raise HoldConflict("Room is held by another guest for these dates")
+                del room_holds[hold_id]
+                user_holds.pop(hold_id, None)
+
+            if len(user_holds) >= self.max_per_user:
+                raise HoldConflict(f"A guest may hold at most {self.max_per_user} rooms at a time")
+
+            hold = {
+                "hold_id": str(uuid.uuid4()),
+                "room_id": str(room_id),
+                "user_id": str(user_id),
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "expires_at": time.time() + self.ttl
+            }
+            room_holds[hold["hold_id"]] = hold
+            user_holds[hold["hold_id"]] = hold
+            self._save(room_key, room_holds)
+            self._save(user_key, user_holds)
+        return hold
+
+    def release(self, hold_id, user_id):
+        """Drop and return a hold of user_id, or None if there is no such live hold."""
+        hold_id, user_key = str(hold_id), _user_key(user_id)
+        hold = self._live(user_key).get(hold_id)
+        if hold is None:
+            return None
+
+        room_key = _room_key(hold["room_id"])
+        with self._locked(f"lock_{room_key}", f"lock_{user_key}"):
+            user_holds = self._live(user_key)
+            if user_holds.pop(hold_id, None) is None:
+                return None
+            room_holds = self._live(room_key)
+            room_holds.pop(hold_id, None)
+            self._save(room_key, room_holds)
+            self._save(user_key, user_holds)
+        return hold
+
+    def held(self, room_ids, start_date, end_date, user_id=None):
+        """
+        The ids (as strings) of room_ids with a live hold overlapping
+        [start_date, end_date) by a guest other than user_id, read in one
+        lookup without locks. An unreachable store holds nothing.
+        """
+        room_ids = [str(room_id) for room_id in room_ids]
+        if not room_ids:
+            return set()
+        try:
+            entries = cache.get_many(*(_room_key(room_id) for room_id in room_ids))
+        except Exception:
+            return set()
+        now = time.time()
+        return {
+            room_id for room_id, entry in zip(room_ids, entries)
+            if any(hold["expires_at"] > now and hold["user_id"] != str(user_id) and _overlaps(hold, start_date, end_date)
+                   for hold in (entry or {}).values())
+        }
+
+    @contextmanager
+    def claim(self, stays, user_id):
+        """
+        Lock the rooms of stays ((room_id, start_date, end_date) each) and
+        yield a HoldClaim whose conflicts are the indexes of stays held by
+        another guest. Commit the booking inside the block, then call
+        convert on the claim before leaving it.
+        """
+        room_ids = sorted({str(room_id) for room_id, _, _ in stays})
+        locks = [f"lock_{_room_key(room_id)}" for room_id in room_ids]
+        try:
+            self._acquire(locks)
+        except HoldStoreBusy:
+            raise
+        except Exception:
+            # Store unreachable: nothing to enforce or convert
+            yield HoldClaim(self, stays, user_id, {})
+            return
+
+        try:
+            try:
+                entries = cache.get_many(*(_room_key(room_id) for room_id in room_ids))
+            except Exception:
+                entries = [None] * len(room_ids)
+            now = time.time()
+            by_room = {
+                room_id: {hold_id: hold for hold_id, hold in (entry or {}).items() if hold["expires_at"] > now}
+                for room_id, entry in zip(room_ids, entries)
+            }
+            yield HoldClaim(self, stays, user_id, by_room)
+        finally:
+            self._release(locks)
+
+    def _live(self, key):
+        now = time.time()
+        return {hold_id: hold for hold_id, hold in (cache.get(key) or {}).items() if hold["expires_at"] > now}
+
+    def _save(self, key, holds):
+        if holds:
+            last = max(hold["expires_at"] for hold in holds.values())
+            cache.set(key, holds, timeout=max(int(last - time.time()) + 1, 1))
+        else:
+            cache.delete(key)
+
+    def _acquire(self, locks):
+        deadline = time.monotonic() + self.wait_seconds
+        taken = []
+        try:
+            for lock in locks:
+                while not cache.add(lock, 1, timeout=self.lock_seconds):
+                    if time.monotonic() >= deadline:
+                        raise HoldStoreBusy()
+                    time.sleep(0.01)
+                taken.append(lock)
+        except Exception:
+            self._release(taken)
+            raise
+
+    def _release(self, locks):
+        for lock in locks:
+            cache.delete(lock)
+
+    @contextmanager
+    def _locked(self, *locks):
+        self._acquire(locks)
+        try:
+            yield
+        finally:
+            self._release(locks)
+
+
+holds = HoldStore(
+    ttl=Config.HOLD_SECONDS,
+    max_per_user=Config.HOLD_MAX_PER_USER,
+    lock_seconds=Config.HOLD_LOCK_SECONDS,
+    wait_seconds=Config.HOLD_WAIT_SECONDS
+)
@@ -0,0 +1,84 @@
+import hashlib
+import time
+from functools import wraps
+from flask import current_app, g, jsonify, make_response, request
+from utils.cache import cache
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+# Answers that may change on retry (a conflict that clears, a rate limit
+# window that passes) are not stored, like 5xx
+TRANSIENT_STATUSES = {408, 409, 423, 425, 429}
+
+
+def _replay(entry):
+    fingerprint, status, body, mimetype = entry
+    response = current_app.response_class(body, status=status, mimetype=mimetype)
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _reused_key():
+    return jsonify({"message": f"{HEADER} was already used for a different request"}), 422
+
+
+def idempotent(f):
+    """
+    Honor an Idempotency-Key header on a write view. The first response, if
+    it is a 2xx or a definitive 4xx (not a conflict or rate limit, see
+    TRANSIENT_STATUSES), is stored for IDEMPOTENCY_TTL seconds under the
+    caller, method, path and key, and a retry with the same key and body gets
+    it back without running the view. Put it above the budget and limiter
+    decorators so replays do not spend the caller's quota.
+
+    A duplicate that arrives while the first request is still running waits
+    up to IDEMPOTENCY_WAIT_SECONDS for its response, then gets a 409 asking
+    it to retry. Reusing a key with a different body is a 422. Requests
+    without the header are not affected.
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        idempotency_key = request.headers.get(HEADER)
+        if idempotency_key is None:
+            return f(*args, **kwargs)
+        if not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            return jsonify({"message": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters"}), 400
+
+        scope = f"{g.current_user.user_id}:{request.method}:{request.path}:{idempotency_key}"
+        key = f"idem_{hashlib.sha256(scope.encode()).hexdigest()}"
+        lock_key = f"lock_{key}"
+        fingerprint = hashlib.sha256(request.get_data()).hexdigest()
+
+        entry = cache.get(key)
+        if entry is None and not cache.add(lock_key, fingerprint, timeout=current_app.config["IDEMPOTENCY_LOCK_SECONDS"]):
+            # The first request with this key is still running; wait for it
+            if cache.get(lock_key) not in (None, fingerprint):
+                return _reused_key()
+            deadline = time.monotonic() + current_app.config["IDEMPOTENCY_WAIT_SECONDS"]
+            while entry is None and time.monotonic() < deadline:
+                time.sleep(0.025)
+                entry = cache.get(key)
+                if entry is None and cache.get(lock_key) is None:
+                    # Finished with an answer that is not replayed; retry it
+                    break
+            if entry is None:
+                response = jsonify({"message": f"A request with this {HEADER} is still in progress, please retry shortly"})
+                response.headers["Retry-After"] = "1"
+                return response, 409
+
+        if entry is not None:
+            if entry[0] != fingerprint:
+                return _reused_key()
+            return _replay(entry)
+
+        try:
+            response = make_response(f(*args, **kwargs))
+            storable = response.status_code < 500 and response.status_code not in TRANSIENT_STATUSES
+            if storable and not response.is_streamed:
+                entry = (fingerprint, response.status_code, response.get_data(), response.mimetype)
+                cache.set(key, entry, timeout=current_app.config["IDEMPOTENCY_TTL"])
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return decorated
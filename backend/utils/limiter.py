@@ -1,7 +1,66 @@
+import time
+from flask import current_app, g, request
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from utils.auth import user_id_from_token
+from utils.metrics import LIMITER_CHECK_LATENCY, record_rate_limit
 
-limiter = Limiter(
-    key_func=get_remote_address,  
-    default_limits=["20 per hour"]  
+# Weights charged against the per-user RATELIMIT_BUDGET
+COST_READ = 1
+COST_WRITE = 5
+COST_EXPORT = 50
+
+
+class MeteredLimiter(Limiter):
+    """Limiter that records how long each rate-limit check (storage round trip included) takes."""
+
+    def _check_request_limit(self, callable_name=None, in_middleware=True):
+        started = time.perf_counter()
+        try:
+            super()._check_request_limit(callable_name=callable_name, in_middleware=in_middleware)
+        finally:
+            LIMITER_CHECK_LATENCY.labels("middleware" if in_middleware else "route").observe(
+                time.perf_counter() - started
+            )
+
+
+def rate_limit_key():
+    """
+    Count requests per authenticated user, so users behind one proxy or NAT
+    don't share a quota; anonymous requests fall back to the client address.
+    """
+    if "rate_limit_key" not in g:
+        user = g.get("current_user")
+        user_id = user.user_id if user is not None else user_id_from_token(request.headers.get("Authorization"))[0]
+        g.rate_limit_key = f"user_{user_id}" if user_id else get_remote_address()
+    return g.rate_limit_key
+
+
+def batch_cost():
+    """A batch costs one write plus one unit per booking in it."""
+    items = (request.get_json(silent=True) or {}).get('bookings')
+    return COST_WRITE + (len(items) if isinstance(items, list) else 0)
+
+
+def quote_cost():
+    """Pricing is cheap: a quote request costs one read plus one unit per 10 stays."""
+    stays = (request.get_json(silent=True) or {}).get('stays')
+    return COST_READ + (len(stays) // 10 if isinstance(stays, list) else 0)
+
+
+def budget(cost=COST_READ):
+    """Charge cost (an int or a callable) against the caller's shared RATELIMIT_BUDGET."""
+    return limiter.shared_limit(
+        lambda: current_app.config["RATELIMIT_BUDGET"],
+        scope="budget",
+        cost=cost,
+        override_defaults=False
+    )
+
+
+# Storage, fallback and key prefix come from the RATELIMIT_* settings in Config
+limiter = MeteredLimiter(
+    key_func=rate_limit_key,
+    default_limits=["20 per hour"],
+    on_breach=record_rate_limit
 )
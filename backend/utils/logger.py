@@ -1,5 +1,16 @@
+import atexit
+import copy
 import logging
 import os
+import queue
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler, WatchedFileHandler
+import orjson
+from flask import g, has_request_context, request
+from config import Config
 
 
 LOG_DIR = "logs"
@@ -7,25 +18,184 @@ if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
 
-logger = logging.getLogger("app_logger")
-logger.setLevel(logging.INFO)
+class RequestContextFilter(logging.Filter):
+    """
+    Runs in the calling thread, before the record is queued: samples records
+    per level (LOG_SAMPLE_RATES) and stamps the survivors with the current
+    request's id, route, user and elapsed time, which the listener thread
+    cannot see.
+    """
+
+    def __init__(self, sample_rates):
+        super().__init__()
+        self.sample_rates = sample_rates
+
+    def filter(self, record):
+        rate = self.sample_rates.get(record.levelname, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            return False
+
+        if has_request_context():
+            record.request_id = g.get("request_id")
+            record.route = request.endpoint
+            user = g.get("current_user")
+            record.user_id = str(user.user_id) if user is not None else None
+            started = g.get("request_started")
+            if started is not None and not hasattr(record, "duration_ms"):
+                record.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        return True
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records rather than block when the queue is full."""
+
+    dropped = 0
+
+    def prepare(self, record):
+        # The inherited prepare formats the record with the default formatter,
+        # folding the traceback into the message. Resolve the message only and
+        # keep the traceback as exc_text for JSONFormatter's "exc" field.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            DroppingQueueHandler.dropped += 1
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line; request fields are included when present."""
+
+    CONTEXT_FIELDS = ("request_id", "route", "user_id", "duration_ms", "status", "method", "path")
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self.CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        exc = self.formatException(record.exc_info) if record.exc_info else record.exc_text
+        if exc:
+            entry["exc"] = exc
+        return orjson.dumps(entry, default=str).decode()
+
+
+def parse_sample_rates(value):
+    """"INFO=0.1,DEBUG=0.01" -> {"INFO": 0.1, "DEBUG": 0.01}"""
+    rates = {}
+    for part in filter(None, (item.strip() for item in value.split(","))):
+        level, _, rate = part.partition("=")
+        rates[level.strip().upper()] = float(rate)
+    return rates
 
 
-file_handler = logging.FileHandler(os.path.join(LOG_DIR, "app.log"))
-file_handler.setLevel(logging.INFO)
+def build_file_handler():
+    """
+    This process's log file handler. By default every process appends to
+    app.log through a WatchedFileHandler, which reopens the file after an
+    external tool (logrotate) has moved it. Rotating in-process ("size" or
+    "time") is only safe with a single writer, so each process then writes
+    its own app.<pid>.log.
+    """
+    if Config.LOG_ROTATION == "time":
+        path = os.path.join(LOG_DIR, f"app.{os.getpid()}.log")
+        handler = TimedRotatingFileHandler(path, when=Config.LOG_ROTATE_WHEN, backupCount=Config.LOG_BACKUP_COUNT)
+    elif Config.LOG_ROTATION == "size":
+        path = os.path.join(LOG_DIR, f"app.{os.getpid()}.log")
+        handler = RotatingFileHandler(path, maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUP_COUNT)
+    else:
+        handler = WatchedFileHandler(os.path.join(LOG_DIR, "app.log"))
+    handler.setLevel(logging.INFO)
+    handler.setFormatter(formatter)
+    return handler
 
 
+logger = logging.getLogger("app_logger")
+logger.setLevel(logging.INFO)
+
+formatter = JSONFormatter()
+
 console_handler = logging.StreamHandler()
 console_handler.setLevel(logging.DEBUG)
+console_handler.setFormatter(formatter)
 
+# Request threads only enqueue; the listener thread formats and writes
+queue_handler = DroppingQueueHandler(queue.Queue(maxsize=Config.LOG_QUEUE_SIZE))
+queue_handler.addFilter(RequestContextFilter(parse_sample_rates(Config.LOG_SAMPLE_RATES)))
+logger.addHandler(queue_handler)
+logger.propagate = False
 
-formatter = logging.Formatter(
-    "%(asctime)s - [%(levelname)s] - %(name)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+file_handler = None
+log_listener = None
+_listener_pid = None
+
+
+def _build_log_listener():
+    global file_handler, log_listener
+    if file_handler is not None:
+        # Inherited from the parent process, which keeps writing through its own copy
+        file_handler.close()
+    file_handler = build_file_handler()
+    log_listener = QueueListener(queue_handler.queue, file_handler, console_handler, respect_handler_level=True)
+
+
+def start_log_listener():
+    """Start the writer thread in this process (a no-op if it is already running here)."""
+    global _listener_pid
+    if _listener_pid == os.getpid():
+        return
+    # A listener started in another process (before a fork) is not this one's
+    _build_log_listener()
+    log_listener.start()
+    _listener_pid = os.getpid()
+
+
+def _stop_log_listener():
+    if _listener_pid == os.getpid():
+        log_listener.stop()
+
+
+def _restart_log_listener_after_fork():
+    # A fork copies neither the writer thread nor, safely, the queue's lock
+    # (start_log_listener builds a new listener on the fresh queue)
+    queue_handler.queue = queue.Queue(maxsize=Config.LOG_QUEUE_SIZE)
+    start_log_listener()
+
+
+start_log_listener()
+atexit.register(_stop_log_listener)
+os.register_at_fork(after_in_child=_restart_log_listener_after_fork)
+
+
+def init_request_logging(app):
+    """Give each request an id (X-Request-ID, echoed back) and log one access record per request."""
 
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        g.setdefault("request_started", time.perf_counter())
 
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+    @app.after_request
+    def log_request(response):
+        response.headers["X-Request-ID"] = g.get("request_id", "")
+        logger.info("request completed", extra={
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+        })
+        return response
@@ -0,0 +1,132 @@
+import os
+import time
+from flask import Response, g, request, has_request_context
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram,
+    REGISTRY, generate_latest, multiprocess
+)
+from sqlalchemy import event
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Request latency by blueprint route",
+    ["method", "endpoint", "status"]
+)
+SQL_STATEMENTS = Histogram(
+    "db_statements_per_request",
+    "SQL statements executed per request",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+)
+DB_TIME = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL per request",
+    ["endpoint"]
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "cache.cached lookups by cached route and result (hit/miss)",
+    ["endpoint", "result"]
+)
+RATE_LIMITED = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+    ["endpoint"]
+)
+LIMITER_CHECK_LATENCY = Histogram(
+    "rate_limit_check_duration_seconds",
+    "Time spent checking rate limits against the limiter storage",
+    ["stage"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the QueuePool",
+    multiprocess_mode="livesum"
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    multiprocess_mode="livesum"
+)
+
+
+def _endpoint():
+    return request.endpoint or "unmatched"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    if has_request_context():
+        g.sql_statements = g.get("sql_statements", 0) + 1
+        g.sql_time = g.get("sql_time", 0.0) + time.perf_counter() - started
+
+
+def _handle_error(context):
+    started = context.connection.info.get("query_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def record_rate_limit(request_limit):
+    """Flask-Limiter on_breach callback."""
+    RATE_LIMITED.labels(endpoint=_endpoint()).inc()
+
+
+def instrument_engine(engine):
+    """Count SQL statements and DB time per request on engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def init_metrics(app, engine, replica_engines=()):
+    """Install the request instrumentation and the /metrics endpoint."""
+    for instrumented in (engine, *replica_engines):
+        instrument_engine(instrumented)
+
+    @app.before_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        started = g.get("request_started")
+        if started is None:
+            return response
+
+        endpoint = _endpoint()
+        REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(
+            time.perf_counter() - started
+        )
+        SQL_STATEMENTS.labels(endpoint).observe(g.get("sql_statements", 0))
+        DB_TIME.labels(endpoint).observe(g.get("sql_time", 0.0))
+
+        # Views wrapped in cache.cached expose make_cache_key; a miss runs the view
+        view = app.view_functions.get(request.endpoint)
+        if view is not None and hasattr(view, "make_cache_key") and request.method == "GET":
+            if g.get("cache_miss"):
+                CACHE_LOOKUPS.labels(endpoint, "miss").inc()
+            elif response.status_code < 400:
+                CACHE_LOOKUPS.labels(endpoint, "hit").inc()
+
+        pool = engine.pool
+        POOL_CHECKED_OUT.set(pool.checkedout())
+        POOL_OVERFLOW.set(max(pool.overflow(), 0))
+        return response
+
+    def metrics():
+        registry = REGISTRY
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            # Aggregate across gunicorn workers
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule("/metrics", "metrics", metrics)
+    return metrics
@@ -0,0 +1,251 @@
+import os
+import threading
+from datetime import date, timedelta
+import numpy as np
+from flask import current_app, has_app_context
+from config import Config
+from database import Session
+from models import Booking as B, Room as R
+from utils.cache import cache, bump_counter
+from utils.logger import logger
+
+# Shared write counter; every booking write bumps it and stores what it
+# changed under CHANGE_KEY_<version>, so a worker that falls behind replays
+# the other workers' writes instead of rebuilding its index
+VERSION_KEY = "occupancy_version"
+CHANGE_KEY = "occupancy_change"
+# Changes are kept this long (seconds); a worker further behind rebuilds
+CHANGE_TTL = 3600
+# Most changes replayed in one go before a rebuild is cheaper
+MAX_REPLAY = 1000
+# Logged in place of a change after the set of rooms changes
+REBUILD = "rebuild"
+
+
+class OccupancyIndex:
+    """
+    In-process per-room occupancy calendar: one byte array per room indexed
+    by day offset from a fixed epoch, 1 where an active booking covers that
+    night. Built from bookings once, then updated incrementally on every
+    booking write, this worker's directly and other workers' by replaying
+    the shared change log, so calendar reads need no SQL.
+    """
+
+    def __init__(self, past_days, future_days):
+        self.past_days = past_days
+        self.future_days = future_days
+        self.epoch = None
+        self.version = None
+        self._rooms = {}
+        self._room_numbers = {}
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self._rebuilding = False
+
+    @property
+    def end(self):
+        return self.epoch + timedelta(days=self.past_days + self.future_days)
+
+    def rebuild(self):
+        """Load every active or completed booking inside the window from the database."""
+        # Read the version first so writes racing the load trigger another rebuild
+        version = self._shared_version()
+        epoch = date.today() - timedelta(days=self.past_days)
+        days = self.past_days + self.future_days
+        end = epoch + timedelta(days=days)
+
+        session = Session()
+        try:
+            room_numbers = dict(session.query(R.room_id, R.room_number).all())
+            rooms = {room_id: np.zeros(days, dtype=np.uint8) for room_id in room_numbers}
+
+            # Completed stays still occupied their nights
+            bookings = session.query(B.room_id, B.start_date, B.end_date).filter(
+                B.status.in_(('active', 'completed')),
+                B.start_date < end,
+                B.end_date > epoch
+            ).yield_per(10000)
+            for room_id, start_date, end_date in bookings:
+                if room_id in rooms:
+                    first, last = self._clip(epoch, days, start_date, end_date)
+                    rooms[room_id][first:last] = 1
+        finally:
+            session.close()
+
+        with self._lock:
+            self.epoch = epoch
+            self.version = version
+            self._rooms = rooms
+            self._room_numbers = room_numbers
+
+    def refresh_if_stale(self):
+        """
+        Bring the index up to date before a read. It is built here if it
+        never was, the window has drifted or the rooms changed (here or in
+        another worker); concurrent readers wait for that one rebuild. Other workers' booking writes are
+        replayed from the change log. When that cannot catch up (changes
+        expired, too far behind, store unreachable) the index is rebuilt in
+        a background thread while reads keep using the current one.
+        """
+        if self._needs_rebuild():
+            with self._rebuild_lock:
+                if self._needs_rebuild():
+                    self.rebuild()
+            return
+
+        shared = self._shared_version()
+        if shared != self.version:
+            with self._rebuild_lock:
+                self._catch_up(shared)
+
+    def _needs_rebuild(self):
+        return self.epoch is None or (date.today() - self.epoch).days > self.past_days + 30
+
+    def _catch_up(self, shared):
+        version = self.version
+        if shared == version:
+            return
+        if version is None or shared is None or not 0 < shared - version <= MAX_REPLAY:
+            self._rebuild_in_background()
+            return
+
+        versions = range(version + 1, shared + 1)
+        try:
+            changes = cache.get_many(*(f"{CHANGE_KEY}_{v}" for v in versions))
+        except Exception:
+            changes = []
+
+        rooms_changed = False
+        with self._lock:
+            if self.version != version or self.epoch is None:
+                # Rebuilt or invalidated meanwhile
+                return
+            for change in changes:
+                # A missing change expired, or its writer has not stored it yet
+                if change is None:
+                    break
+                if change == REBUILD:
+                    rooms_changed = True
+                    break
+                room_id, start_date, end_date, value = change
+                if room_id in self._rooms:
+                    first, last = self._clip(self.epoch, len(self._rooms[room_id]), start_date, end_date)
+                    self._rooms[room_id][first:last] = value
+                self.version += 1
+            caught_up = self.version == shared
+
+        if rooms_changed:
+            # Rare, and reads must not miss a new room or show a deleted one
+            self.rebuild()
+        elif not caught_up:
+            self._rebuild_in_background()
+
+    def _rebuild_in_background(self):
+        if not has_app_context():
+            # The rebuild reads the shared version through the app's cache
+            self.rebuild()
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        app = current_app._get_current_object()
+        threading.Thread(target=self._background_rebuild, args=(app,), name="occupancy-rebuild", daemon=True).start()
+
+    def _background_rebuild(self, app):
+        try:
+            with app.app_context():
+                self.rebuild()
+        except Exception as e:
+            logger.error(f"Error rebuilding occupancy index: {str(e)}")
+        finally:
+            self._rebuilding = False
+
+    def _reset_after_fork(self):
+        # A rebuild thread running in the parent does not exist in the child
+        self._rebuild_lock = threading.Lock()
+        self._rebuilding = False
+
+    def book(self, room_id, start_date, end_date):
+        self._apply(room_id, start_date, end_date, 1)
+
+    def release(self, room_id, start_date, end_date):
+        self._apply(room_id, start_date, end_date, 0)
+
+    def invalidate(self):
+        """Force every worker to rebuild, e.g. after the set of rooms changes."""
+        self._record(REBUILD)
+        with self._lock:
+            self.version = None
+            self.epoch = None
+
+    def room_calendar(self, room_id, start_date, end_date):
+        """Occupancy of one room for the nights in [start_date, end_date)."""
+        with self._lock:
+            return self._slice(self._rooms.get(room_id), start_date, end_date)
+
+    def grid(self, start_date, end_date):
+        """(room_id, room_number, occupancy) for every room, ordered by room number."""
+        with self._lock:
+            return [
+                (room_id, number, self._slice(self._rooms[room_id], start_date, end_date))
+                for room_id, number in sorted(self._room_numbers.items(), key=lambda item: item[1])
+            ]
+
+    def has_room(self, room_id):
+        return room_id in self._room_numbers
+
+    def covers(self, start_date, end_date):
+        return self.epoch is not None and self.epoch <= start_date and end_date <= self.end
+
+    def _apply(self, room_id, start_date, end_date, value):
+        with self._lock:
+            if self.epoch is not None and room_id in self._rooms:
+                first, last = self._clip(self.epoch, len(self._rooms[room_id]), start_date, end_date)
+                self._rooms[room_id][first:last] = value
+        self._record((room_id, start_date, end_date, value))
+
+    def _record(self, change):
+        try:
+            version = bump_counter(VERSION_KEY)
+            cache.set(f"{CHANGE_KEY}_{version}", change, timeout=CHANGE_TTL)
+        except Exception:
+            return
+        with self._lock:
+            # Advance only if no other worker wrote since our last sync;
+            # otherwise the next read replays the gap, this change included
+            if self.version is not None and version == self.version + 1:
+                self.version = version
+
+    def _slice(self, days, start_date, end_date):
+        first = (start_date - self.epoch).days
+        last = (end_date - self.epoch).days
+        if days is None:
+            return np.zeros(last - first, dtype=np.uint8)
+        return days[first:last].copy()
+
+    @staticmethod
+    def _clip(epoch, days, start_date, end_date):
+        first = max((start_date - epoch).days, 0)
+        last = min((end_date - epoch).days, days)
+        return first, max(first, last)
+
+    @staticmethod
+    def _shared_version():
+        try:
+            return cache.get(VERSION_KEY) or 0
+        except Exception:
+            return None
+
+
+occupancy = OccupancyIndex(
+    past_days=Config.OCCUPANCY_PAST_DAYS,
+    future_days=Config.OCCUPANCY_FUTURE_DAYS
+)
+
+os.register_at_fork(after_in_child=occupancy._reset_after_fork)
+
+
+def to_calendar_string(days):
+    """Render an occupancy array as a compact '0'/'1' string, one char per night."""
+    return (days + ord('0')).tobytes().decode()
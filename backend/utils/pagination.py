@@ -0,0 +1,166 @@
+import base64
+import json
+import uuid
+from datetime import date
+from flask import request
+from sqlalchemy import func, select, tuple_
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 100
+
+
+def encode_cursor(values):
+    """Encode the sort-key values of the last row as an opaque cursor."""
+    raw = json.dumps([str(value) for value in values]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, keys):
+    """
+    Decode a cursor produced by encode_cursor back into typed values for keys.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(raw, list) or len(raw) != len(keys):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    try:
+        for key, value in zip(keys, raw):
+            python_type = key.type.python_type
+            if python_type is date:
+                values.append(date.fromisoformat(value))
+            elif python_type is uuid.UUID:
+                values.append(uuid.UUID(value))
+            else:
+                values.append(python_type(value))
+    except (ValueError, TypeError, AttributeError) as e:
+        raise ValueError("Invalid cursor") from e
+    return values
+
+
+def keyset_page(query, keys, cursor, per_page):
+    """
+    Fetch one page of query ordered by keys, starting after cursor.
+    Seeks with a row comparison on the (indexed) keys instead of an OFFSET,
+    so every page costs the same no matter how deep it is.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        query = query.filter(tuple_(*keys) > tuple_(*decode_cursor(cursor, keys)))
+
+    rows = query.order_by(*keys).limit(per_page + 1).all()
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.key) for key in keys])
+
+
+def estimate_count(session, query):
+    """
+    Row estimate for query (a Query or select()) taken from the planner
+    statistics (EXPLAIN), avoiding the full scan an exact COUNT needs on
+    large tables.
+    """
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(
+        dialect=session.get_bind().dialect,
+        compile_kwargs={"literal_binds": True}
+    )
+    plan = session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate(session, query, keys):
+    """
+    Paginate query according to the request's query string and return
+    (rows, pagination_metadata).
+
+    Offset mode (default): ?page=&per_page=, ordered by keys.
+    Cursor mode (opt-in): ?cursor= (empty for the first page) returns an
+    opaque next_cursor instead of page numbers.
+    ?estimate=true replaces the exact COUNT with the planner's row estimate;
+    cursor mode only reports a total when an estimate is requested.
+    """
+    per_page = request.args.get('per_page', DEFAULT_PER_PAGE, type=int)
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    cursor = request.args.get('cursor', None, type=str)
+    estimate = request.args.get('estimate', '').lower() in ('1', 'true')
+
+    if cursor is not None:
+        rows, next_cursor = keyset_page(query, keys, cursor, per_page)
+        pagination = {"per_page": per_page, "next_cursor": next_cursor}
+        if estimate:
+            pagination["total"] = estimate_count(session, query)
+            pagination["estimated"] = True
+        return rows, pagination
+
+    page = max(1, request.args.get('page', 1, type=int))
+    total_count = estimate_count(session, query) if estimate else query.count()
+    rows = query.order_by(*keys).offset((page - 1) * per_page).limit(per_page).all()
+
+    pagination = {
+        "page": page,
+        "per_page": per_page,
+        "total": total_count,
+        "pages": (total_count + per_page - 1) // per_page
+    }
+    if estimate:
+        pagination["estimated"] = True
+    return rows, pagination
+
+
+async def paginate_async(session, stmt, keys, args):
+    """
+    Async counterpart of paginate for a select() run on an AsyncSession;
+    args is the request's query-string mapping. Same modes and metadata.
+    """
+    per_page = args.get('per_page', DEFAULT_PER_PAGE, type=int)
+    per_page = max(1, min(per_page, MAX_PER_PAGE))
+    cursor = args.get('cursor', None, type=str)
+    estimate = args.get('estimate', '').lower() in ('1', 'true')
+
+    if cursor is not None:
+        page_stmt = stmt
+        if cursor:
+            page_stmt = page_stmt.where(tuple_(*keys) > tuple_(*decode_cursor(cursor, keys)))
+        rows = (await session.scalars(page_stmt.order_by(*keys).limit(per_page + 1))).all()
+
+        next_cursor = None
+        if len(rows) > per_page:
+            rows = rows[:per_page]
+            next_cursor = encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+        pagination = {"per_page": per_page, "next_cursor": next_cursor}
+        if estimate:
+            pagination["total"] = await session.run_sync(estimate_count, stmt)
+            pagination["estimated"] = True
+        return rows, pagination
+
+    page = max(1, args.get('page', 1, type=int))
+    if estimate:
+        total_count = await session.run_sync(estimate_count, stmt)
+    else:
+        total_count = await session.scalar(select(func.count()).select_from(stmt.subquery()))
+    rows = (await session.scalars(
+        stmt.order_by(*keys).offset((page - 1) * per_page).limit(per_page)
+    )).all()
+
+    pagination = {
+        "page": page,
+        "per_page": per_page,
+        "total": total_count,
+        "pages": (total_count + per_page - 1) // per_page
+    }
+    if estimate:
+        pagination["estimated"] = True
+    return rows, pagination
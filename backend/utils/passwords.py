@@ -0,0 +1,103 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from werkzeug.security import check_password_hash, generate_password_hash
+from config import Config
+
+
+class HasherBusy(Exception):
+    """The hashing pool is at capacity; the caller should answer 503."""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing (deliberately CPU-heavy) in a small process pool
+    instead of the request thread, with admission control: at most
+    max_pending hashes may be queued or running per process, further
+    requests fail fast with HasherBusy. The pool is created lazily and
+    again after a fork (see reset), so each server worker owns its own.
+    With workers=0 hashing runs inline but is still bounded.
+    """
+
+    def __init__(self, method, workers, max_pending, timeout):
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._prefix = None
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        return self._run(check_password_hash, stored_hash, password)
+
+    def needs_rehash(self, stored_hash):
+        """True when stored_hash was made with other parameters than the configured method."""
+        return stored_hash.split("$", 1)[0] != self.prefix()
+
+    def prefix(self):
+        """
+        The method as werkzeug writes it into hashes, with defaults filled in
+        ("scrypt" is stored as "scrypt:32768:8:1"), found by hashing an empty
+        password once on first use.
+        """
+        if self._prefix is None:
+            self._prefix = generate_password_hash("", self.method, salt_length=1).split("$", 1)[0]
+        return self._prefix
+
+    def _run(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HasherBusy()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+
+        try:
+            future = self._executor().submit(fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+        # A job the caller gave up on still occupies the pool until it ends,
+        # so its slot is given back when it does, not when the wait times out
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout as e:
+            raise HasherBusy() from e
+
+    def reset(self):
+        """Forget the parent's pool, in-flight slots and lock in a forked child."""
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pid = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # Forking a threaded web worker could leave the children
+                # blocked on locks held at fork time; the fork server is a
+                # clean single-threaded process to fork them from instead
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("forkserver"))
+                self._pid = os.getpid()
+            return self._pool
+
+
+passwords = PasswordHasher(
+    method=Config.PASSWORD_HASH_METHOD,
+    workers=Config.PASSWORD_HASH_WORKERS,
+    max_pending=Config.PASSWORD_HASH_MAX_PENDING,
+    timeout=Config.PASSWORD_HASH_TIMEOUT
+)
+
+os.register_at_fork(after_in_child=passwords.reset)
@@ -0,0 +1,218 @@
+import os
+import threading
+from collections import namedtuple
+from datetime import date
+import numpy as np
+from config import Config
+from database import Session
+from models import Room as R, RateRule, StayDiscount
+from utils.cache import cache, bump_counter
+
+# Shared write counter, bumped by every rate, discount or room price change;
+# a worker whose last seen value differs rebuilds its price calendar
+VERSION_KEY = "pricing_version"
+
+ROOM_TYPES = ('Single', 'Double', 'Suite')
+
+Rule = namedtuple("Rule", "room_type first last weekdays percent price")
+Quote = namedtuple("Quote", "nights subtotal discount total_price")
+
+
+def nightly_prices(base_price, room_type, rules, first_day, days):
+    """
+    Price of each of the days nights from first_day for a room of room_type
+    listed at base_price. rules are in ascending precedence, so a later
+    match overwrites an earlier one.
+    """
+    prices = np.full(days, base_price, dtype=np.int64)
+    first = first_day.toordinal()
+    # date.fromordinal(1) is a Monday, so this is date.weekday() per night
+    weekdays = (np.arange(first, first + days) - 1) % 7
+
+    for rule in rules:
+        if rule.room_type is not None and rule.room_type != room_type:
+            continue
+        lo, hi = max(rule.first - first, 0), min(rule.last - first, days)
+        if lo >= hi:
+            continue
+        on_weekday = (rule.weekdays >> weekdays[lo:hi]) & 1 == 1
+        prices[lo:hi][on_weekday] = rule.price if rule.price is not None else base_price * rule.percent // 100
+    return prices
+
+
+class PricingEngine:
+    """
+    In-process rate calendar. Rooms, rate rules and stay discounts are loaded
+    together (three small queries); each room's nightly prices over the next
+    window_days are then expanded on first use into a prefix-sum array, so a
+    stay's subtotal is one subtraction and pricing many stays of a room is a
+    single vectorized one. Stays reaching outside the window are priced
+    night by night instead. Outside a Flask app (the Quart app) the shared
+    version is read through a client handed in with use_shared.
+    """
+
+    def __init__(self, window_days):
+        self.window_days = window_days
+        self.epoch = None
+        self.version = None
+        self._rooms = {}
+        self._rules = ()
+        self._discounts = {}
+        self._prefix = {}
+        self._lock = threading.RLock()
+        self._rebuild_lock = threading.Lock()
+        self.shared = cache
+
+    def use_shared(self, client):
+        """Read the shared pricing version through client (a cachelib cache)."""
+        self.shared = client
+
+    def rebuild(self):
+        # Read the version first so changes racing the load trigger another rebuild
+        version = self._shared_version()
+
+        session = Session()
+        try:
+            rooms = {
+                room_id: (room_type, price)
+                for room_id, room_type, price in session.query(R.room_id, R.room_type, R.price_per_night)
+            }
+            rules = sorted(session.query(RateRule).all(), key=lambda rule: (rule.priority, rule.room_type is not None))
+            discounts = session.query(StayDiscount.room_type, StayDiscount.min_nights, StayDiscount.percent_off).all()
+        finally:
+            session.close()
+
+        with self._lock:
+            self.epoch = date.today()
+            self.version = version
+            self._rooms = rooms
+            self._rules = tuple(
+                Rule(rule.room_type, rule.start_date.toordinal(), rule.end_date.toordinal(),
+                     rule.weekdays, rule.percent, rule.price_per_night)
+                for rule in rules
+            )
+            self._discounts = {room_type: self._discount_table(discounts, room_type) for room_type in ROOM_TYPES}
+            self._prefix = {}
+
+    def refresh_if_stale(self):
+        """
+        Rebuild if never built, on a new day, or after a pricing change
+        anywhere. Single-flight: concurrent stale readers wait for one
+        rebuild instead of each reloading the rate tables.
+        """
+        if not self._stale():
+            return
+        with self._rebuild_lock:
+            if self._stale():
+                self.rebuild()
+
+    def _stale(self):
+        return self.epoch != date.today() or self._shared_version() != self.version
+
+    def _reset_after_fork(self):
+        # A rebuild running in the parent does not exist in the child
+        self._rebuild_lock = threading.Lock()
+
+    def invalidate(self):
+        """Make every worker rebuild, after rates, discounts or room prices change."""
+        try:
+            bump_counter(VERSION_KEY)
+        except Exception:
+            pass
+        with self._lock:
+            self.version = None
+            self.epoch = None
+
+    def quote(self, room_id, start_date, end_date):
+        """Quote for one stay, or None when the room does not exist or the stay is empty."""
+        return self.quote_many([(room_id, start_date, end_date)])[0]
+
+    def quote_many(self, stays):
+        """Quote (or None, as for quote) for each (room_id, start_date, end_date) in stays."""
+        self.refresh_if_stale()
+
+        by_room = {}
+        for index, (room_id, start_date, end_date) in enumerate(stays):
+            if end_date > start_date:
+                by_room.setdefault(room_id, []).append(index)
+        self._load_rooms([room_id for room_id in by_room if room_id not in self._rooms])
+
+        quotes = [None] * len(stays)
+        with self._lock:
+            if self.epoch is None:
+                # Invalidated since the refresh above
+                self.rebuild()
+            for room_id, indexes in by_room.items():
+                room = self._rooms.get(room_id)
+                if room is None:
+                    continue
+                room_type, base_price = room
+
+                starts = np.array([(stays[i][1] - self.epoch).days for i in indexes])
+                ends = np.array([(stays[i][2] - self.epoch).days for i in indexes])
+                nights = ends - starts
+
+                subtotals = np.zeros(len(indexes), dtype=np.int64)
+                inside = (starts >= 0) & (ends <= self.window_days)
+                if inside.any():
+                    prefix = self._room_prefix(room_id, room_type, base_price)
+                    subtotals[inside] = prefix[ends[inside]] - prefix[starts[inside]]
+                for k in np.flatnonzero(~inside):
+                    subtotals[k] = nightly_prices(base_price, room_type, self._rules, stays[indexes[k]][1], nights[k]).sum()
+
+                discounts = subtotals * self._percent_off(room_type, nights) // 100
+                for k, index in enumerate(indexes):
+                    quotes[index] = Quote(int(nights[k]), int(subtotals[k]), int(discounts[k]),
+                                          int(subtotals[k] - discounts[k]))
+        return quotes
+
+    def _room_prefix(self, room_id, room_type, base_price):
+        prefix = self._prefix.get(room_id)
+        if prefix is None:
+            prices = nightly_prices(base_price, room_type, self._rules, self.epoch, self.window_days)
+            prefix = np.concatenate(([0], np.cumsum(prices)))
+            self._prefix[room_id] = prefix
+        return prefix
+
+    def _percent_off(self, room_type, nights):
+        table = self._discounts.get(room_type)
+        if table is None:
+            return np.zeros(len(nights), dtype=np.int64)
+        thresholds, best = table
+        position = np.searchsorted(thresholds, nights, side="right") - 1
+        return np.where(position >= 0, best[np.maximum(position, 0)], 0)
+
+    def _load_rooms(self, room_ids):
+        # Rooms created since the last rebuild (or ids that do not exist)
+        if not room_ids:
+            return
+        session = Session()
+        try:
+            found = session.query(R.room_id, R.room_type, R.price_per_night).filter(R.room_id.in_(room_ids)).all()
+        finally:
+            session.close()
+        with self._lock:
+            for room_id, room_type, price in found:
+                self._rooms[room_id] = (room_type, price)
+
+    @staticmethod
+    def _discount_table(discounts, room_type):
+        # (min_nights ascending, best percent_off for at least that many nights)
+        applicable = sorted((min_nights, percent_off) for discount_type, min_nights, percent_off in discounts
+                            if discount_type is None or discount_type == room_type)
+        if not applicable:
+            return None
+        thresholds = np.array([min_nights for min_nights, _ in applicable])
+        best = np.maximum.accumulate(np.array([percent_off for _, percent_off in applicable]))
+        return thresholds, best
+
+    def _shared_version(self):
+        try:
+            return self.shared.get(VERSION_KEY) or 0
+        except Exception:
+            return None
+
+
+pricing = PricingEngine(window_days=Config.PRICING_WINDOW_DAYS)
+
+os.register_at_fork(after_in_child=pricing._reset_after_fork)
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from config import Config
+from utils.cache import cache
+
+# Lightweight, detached stand-in for the User row on g.current_user
+Principal = namedtuple("Principal", ["user_id", "role", "name"])
+
+
+class PrincipalCache:
+    """
+    Bounded in-process LRU of authenticated principals with a TTL, backed by
+    the shared cache so a principal resolved by one worker is reused by the
+    others. Lets token_required skip the users lookup on most requests.
+    Outside a Flask app (the Quart app) Flask-Caching is unusable, so that
+    app hands in its own client for the same entries (see use_shared).
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.shared = cache
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def use_shared(self, client):
+        """Read and write the shared entries through client (a cachelib cache)."""
+        self.shared = client
+
+    def get(self, user_id):
+        principal = self.get_local(user_id)
+        if principal is not None:
+            return principal
+
+        try:
+            shared = self.shared.get(f"principal_{user_id}")
+        except Exception:
+            shared = None
+        if shared is None:
+            return None
+
+        principal = Principal(user_id, shared[0], shared[1])
+        self._store(principal)
+        return principal
+
+    def get_local(self, user_id):
+        """The principal from this process's LRU only; never touches the shared cache."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                principal, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(user_id)
+                    return principal
+                del self._entries[user_id]
+        return None
+
+    def set(self, principal):
+        self._store(principal)
+        try:
+            self.shared.set(f"principal_{principal.user_id}",
+                            (principal.role, principal.name), timeout=self.ttl)
+        except Exception:
+            pass
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+        try:
+            self.shared.delete(f"principal_{user_id}")
+        except Exception:
+            pass
+
+    def _store(self, principal):
+        with self._lock:
+            self._entries[principal.user_id] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(principal.user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+principals = PrincipalCache(
+    maxsize=Config.PRINCIPAL_CACHE_SIZE,
+    ttl=Config.PRINCIPAL_CACHE_TTL
+)
+
+
+def invalidate_principal(user_id):
+    """Drop a user's cached principal after their name or role changes."""
+    principals.invalidate(user_id)
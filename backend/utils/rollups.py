@@ -0,0 +1,76 @@
+from sqlalchemy import text
+
+# Contribution of the selected bookings to booking_daily_stats: every night of
+# an active or completed stay gets one room-night and total_price / nights
+# (the remainder on the first night, so revenue sums back exactly), and a
+# cancelled booking counts once on its start date.
+CONTRIBUTIONS_SQL = """
+    SELECT night::date AS day, r.room_type,
+           b.total_price / (b.end_date - b.start_date)
+               + CASE WHEN night::date = b.start_date
+                      THEN b.total_price % (b.end_date - b.start_date) ELSE 0 END AS revenue,
+           1 AS room_nights, 0 AS cancellations
+    FROM bookings b
+    JOIN rooms r ON r.room_id = b.room_id
+    CROSS JOIN generate_series(b.start_date, b.end_date - 1, interval '1 day') AS night
+    WHERE b.status IN ('active', 'completed') AND b.end_date > b.start_date AND {where}
+    UNION ALL
+    SELECT b.start_date, r.room_type, 0, 0, 1
+    FROM bookings b
+    JOIN rooms r ON r.room_id = b.room_id
+    WHERE b.status = 'cancelled' AND {where}
+"""
+
+APPLY_SQL = """
+    INSERT INTO booking_daily_stats (day, room_type, revenue, room_nights, cancellations)
+    SELECT day, room_type, :sign * SUM(revenue), :sign * SUM(room_nights), :sign * SUM(cancellations)
+    FROM ({contributions}) AS contributions
+    GROUP BY day, room_type
+    ORDER BY day, room_type
+    ON CONFLICT (day, room_type) DO UPDATE SET
+        revenue = booking_daily_stats.revenue + EXCLUDED.revenue,
+        room_nights = booking_daily_stats.room_nights + EXCLUDED.room_nights,
+        cancellations = booking_daily_stats.cancellations + EXCLUDED.cancellations
+"""
+
+
+BY_BOOKINGS = "b.booking_id = ANY(CAST(:booking_ids AS uuid[]))"
+BY_ROOM = "b.room_id = CAST(:room_id AS uuid)"
+
+
+def _apply(session, where, params, sign):
+    sql = APPLY_SQL.format(contributions=CONTRIBUTIONS_SQL.format(where=where))
+    session.execute(text(sql), {**params, "sign": sign})
+
+
+def add_booking_stats(session, booking_ids):
+    """Add the bookings' current rows to the rollup, in the caller's transaction."""
+    if booking_ids:
+        session.flush()
+        _apply(session, BY_BOOKINGS, {"booking_ids": [str(booking_id) for booking_id in booking_ids]}, 1)
+
+
+def remove_booking_stats(session, booking_ids):
+    """
+    Subtract the bookings' rows as stored from the rollup. Call before
+    changing or deleting them.
+    """
+    if booking_ids:
+        _apply(session, BY_BOOKINGS, {"booking_ids": [str(booking_id) for booking_id in booking_ids]}, -1)
+
+
+def add_room_stats(session, room_id):
+    session.flush()
+    _apply(session, BY_ROOM, {"room_id": str(room_id)}, 1)
+
+
+def remove_room_stats(session, room_id):
+    """Subtract a room's bookings, e.g. before its room_type changes."""
+    _apply(session, BY_ROOM, {"room_id": str(room_id)}, -1)
+
+
+def rebuild_stats(session):
+    """Recompute the whole rollup from bookings, in the caller's transaction."""
+    session.execute(text("LOCK TABLE booking_daily_stats IN EXCLUSIVE MODE"))
+    session.execute(text("DELETE FROM booking_daily_stats"))
+    _apply(session, "TRUE", {}, 1)
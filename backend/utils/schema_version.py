@@ -0,0 +1,29 @@
+import os
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+
+class SchemaOutdated(RuntimeError):
+    """The database is not at the Alembic head this code was written against."""
+
+
+def check_schema_head(engine):
+    """
+    Production boots run no DDL; instead they refuse to start unless the
+    database's alembic_version matches the head of migrations/.
+    Returns the current revision.
+    """
+    # Alembic takes ~0.1 s to import; only production boots pay for it
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    expected = set(ScriptDirectory(MIGRATIONS_DIR).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+
+    if current != expected:
+        raise SchemaOutdated(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"expected {', '.join(sorted(expected))}; run `alembic upgrade head`"
+        )
+    return next(iter(current))
@@ -1,107 +1,84 @@
 import { useMemo } from "react";
 import { useQuery } from "@tanstack/react-query";
-import { getAllBookings } from "../../services/booking.api";
-import { getAllRooms } from "../../services/room.api";
+import { getAdminStats } from "../../services/admin.api";
 import DashboardCard from "../../components/DashboardCard";
 import DetailCard from "../../components/DetailCard";
 import Loader from "../../components/Loader";
 import "./AdminDashboard.scss";
 
-export default function AdminDashboard() {
-  const { data: bookings = [], isLoading: bookingsLoading } = useQuery({
-    queryKey: ["allBookings"],
-    queryFn: () => getAllBookings(),
-  });
+const formatRate = (rate: number) => `${(rate * 100).toFixed(1)}%`;
 
-  const { data: rooms = [], isLoading: roomsLoading } = useQuery({
-    queryKey: ["rooms"],
-    queryFn: () => getAllRooms(),
+export default function AdminDashboard() {
+  // Served from daily rollups, so the figures cover every booking in the range
+  const { data: stats, isLoading } = useQuery({
+    queryKey: ["adminStats", "room_type"],
+    queryFn: () => getAdminStats({ group_by: "room_type" }),
   });
 
-  const stats = useMemo(() => {
-    const activeBookings = bookings.filter((b) => b.status === "active");
-    const completedBookings = bookings.filter((b) => b.status === "completed");
-    const cancelledBookings = bookings.filter((b) => b.status === "cancelled");
-    const availableRooms = rooms.filter((r) => r.status === "available");
-    const bookedRooms = rooms.filter((r) => r.status === "booked");
-
-    const totalRevenue = bookings.reduce((sum, booking) => {
-      if (booking.status !== "cancelled") return sum + booking.total_price;
-      return sum;
-    }, 0);
-
-    const roomsByType = {
-      single: rooms.filter((r) => r.room_type === "Single").length,
-      double: rooms.filter((r) => r.room_type === "Double").length,
-      suite: rooms.filter((r) => r.room_type === "Suite").length,
-    };
+  const byType = useMemo(
+    () =>
+      Object.fromEntries(
+        (stats?.data ?? []).map((bucket) => [bucket.room_type, bucket])
+      ),
+    [stats]
+  );
 
-    return {
-      totalBookings: bookings.length,
-      activeBookings,
-      completedBookings,
-      cancelledBookings,
-      totalRooms: rooms.length,
-      availableRooms,
-      bookedRooms,
-      totalRevenue,
-      roomsByType,
-    };
-  }, [bookings, rooms]);
+  if (isLoading || !stats) return <Loader />;
 
   // Dashboard Cards Data
   const dashboardCards = [
     {
       icon: "📅",
-      value: stats.totalBookings,
-      label: "Total Bookings",
+      value: stats.totals.room_nights,
+      label: "Room-Nights Sold",
       colorClass: "bookings",
     },
     {
       icon: "✓",
-      value: stats.activeBookings.length,
-      label: "Active Bookings",
+      value: formatRate(stats.totals.occupancy_rate),
+      label: "Occupancy Rate",
       colorClass: "active",
     },
     {
       icon: "🏠",
-      value: stats.totalRooms,
+      value: stats.rooms.total,
       label: "Total Rooms",
       colorClass: "rooms",
     },
     {
       icon: "🔓",
-      value: stats.availableRooms.length,
+      value: stats.rooms.available,
       label: "Available Rooms",
       colorClass: "available",
     },
     {
       icon: "🔒",
-      value: stats.bookedRooms.length,
+      value: stats.rooms.booked,
       label: "Booked Rooms",
       colorClass: "booked",
     },
     {
       icon: "💰",
-      value: `$${stats.totalRevenue}`,
-      label: "Total Revenue",
+      value: `$${stats.totals.revenue}`,
+      label: "Revenue",
       colorClass: "revenue",
     },
   ];
 
   const bookingStatusDetails = [
-    { label: "Active:", value: stats.activeBookings.length },
-    { label: "Completed:", value: stats.completedBookings.length },
-    { label: "Cancelled:", value: stats.cancelledBookings.length },
-  ];
-
-  const roomTypeDetails = [
-    { label: "Single:", value: stats.roomsByType.single },
-    { label: "Double:", value: stats.roomsByType.double },
-    { label: "Suite:", value: stats.roomsByType.suite },
+    { label: "Room-nights:", value: stats.totals.room_nights },
+    { label: "Occupancy:", value: formatRate(stats.totals.occupancy_rate) },
+    { label: "Cancelled:", value: stats.totals.cancellations },
   ];
 
-  if (bookingsLoading || roomsLoading) return <Loader />;
+  const roomTypeDetails = (["Single", "Double", "Suite"] as const).map(
+    (roomType) => ({
+      label: `${roomType}:`,
+      value: `${stats.rooms.by_type[roomType] ?? 0} rooms, ${formatRate(
+        byType[roomType]?.occupancy_rate ?? 0
+      )} occupied`,
+    })
+  );
 
   return (
     <div className="admin-dashboard">
@@ -122,7 +99,10 @@ export default function AdminDashboard() {
 
       {/*  Detail Cards */}
       <div className="details-grid">
-        <DetailCard title="Booking Status" items={bookingStatusDetails} />
+        <DetailCard
+          title={`Bookings ${stats.from} to ${stats.to}`}
+          items={bookingStatusDetails}
+        />
         <DetailCard title="Room Types" items={roomTypeDetails} />
       </div>
     </div>
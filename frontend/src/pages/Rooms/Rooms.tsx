@@ -1,8 +1,8 @@
-import { useState, useMemo } from "react";
+import { useState, useMemo, useEffect } from "react";
 import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
-import { getAllRooms } from "../../services/room.api";
+import { getAllRooms, holdRoom, releaseHold } from "../../services/room.api";
 import { createBooking } from "../../services/booking.api";
-import type { Room } from "../../services/room.api";
+import type { Room, RoomHold } from "../../services/room.api";
 import type { CreateBookingData } from "../../services/booking.api";
 import Modal from "../../components/Modal";
 import Button from "../../components/Button";
@@ -29,6 +29,9 @@ export default function Rooms() {
     type: "success" | "error";
     text: string;
   } | null>(null);
+  // The dates stay reserved for us while the modal is open
+  const [hold, setHold] = useState<RoomHold | null>(null);
+  const [holdError, setHoldError] = useState<string | null>(null);
 
   const {
     data: rooms = [],
@@ -75,15 +78,31 @@ export default function Rooms() {
     itemsPerPage: 9,
   });
 
+  // One key per room and dates, so resubmitting the same booking after a
+  // timeout replays it instead of booking (and spending the quota) twice.
+  // Any answer other than success gets a fresh key for the next attempt.
+  const [keyRound, setKeyRound] = useState(0);
+  const bookingKey = useMemo(
+    () => crypto.randomUUID(),
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+    [selectedRoom, formData.start_date, formData.end_date, keyRound]
+  );
+
   const bookingMutation = useMutation({
-    mutationFn: createBooking,
+    mutationFn: (bookingData: CreateBookingData) =>
+      createBooking(bookingData, bookingKey),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ["rooms"] });
       setMessage({ type: "success", text: "Room booked successfully!" });
+      // The booking converted the hold, nothing to release
+      setHold(null);
       closeModal();
       setTimeout(() => setMessage(null), 3000);
     },
     onError: (error: any) => {
+      // Without a response (e.g. a timeout) the booking may have gone
+      // through, so only then is the key kept for the retry
+      if (error?.response) setKeyRound((round) => round + 1);
       setMessage({
         type: "error",
         text: error?.response?.data?.message || "Failed to book room",
@@ -107,12 +126,50 @@ export default function Rooms() {
   };
 
   const closeModal = () => {
+    if (hold) releaseHold(hold.hold_id).catch(() => {});
+    setHold(null);
+    setHoldError(null);
     setIsModalOpen(false);
     setSelectedRoom(null);
   };
 
+  // Hold the room as soon as both dates are picked, replacing any earlier hold
+  useEffect(() => {
+    if (!selectedRoom || !formData.start_date || !formData.end_date) return;
+    if (formData.start_date >= formData.end_date) return;
+
+    let cancelled = false;
+    const previous = hold;
+    (async () => {
+      if (previous) await releaseHold(previous.hold_id).catch(() => {});
+      try {
+        const placed = await holdRoom(selectedRoom.room_id, {
+          start_date: formData.start_date,
+          end_date: formData.end_date,
+        });
+        if (cancelled) {
+          releaseHold(placed.hold_id).catch(() => {});
+          return;
+        }
+        setHold(placed);
+        setHoldError(null);
+      } catch (error: any) {
+        if (cancelled) return;
+        setHold(null);
+        setHoldError(
+          error?.response?.data?.message || "Could not hold these dates"
+        );
+      }
+    })();
+    return () => {
+      cancelled = true;
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [selectedRoom, formData.start_date, formData.end_date]);
+
   const calculateTotalPrice = () => {
     if (!selectedRoom || !formData.start_date || !formData.end_date) return 0;
+    if (hold?.total_price != null) return hold.total_price;
     const start = new Date(formData.start_date);
     const end = new Date(formData.end_date);
     const nights = Math.ceil(
@@ -276,6 +333,17 @@ export default function Rooms() {
             </div>
           )}
 
+          {hold && (
+            <div className="hold-info">
+              Held for you until{" "}
+              {new Date(hold.expires_at).toLocaleTimeString([], {
+                hour: "2-digit",
+                minute: "2-digit",
+              })}
+            </div>
+          )}
+          {holdError && <div className="message message-error">{holdError}</div>}
+
           <div className="form-actions">
             <Button type="button" onClick={closeModal} variant="secondary">
               Cancel
@@ -0,0 +1,59 @@
+import axios from "axios";
+import { API_BASE_URL } from "./config";
+
+export type StatsGroupBy = "day" | "week" | "room_type";
+
+export interface StatsSummary {
+  revenue: number;
+  room_nights: number;
+  cancellations: number;
+  occupancy_rate: number;
+}
+
+export interface StatsBucket extends StatsSummary {
+  day?: string;
+  week?: string;
+  room_type?: "Single" | "Double" | "Suite";
+}
+
+export interface AdminStats {
+  from: string;
+  to: string;
+  group_by: StatsGroupBy;
+  data: StatsBucket[];
+  totals: StatsSummary;
+  rooms: {
+    total: number;
+    available: number;
+    booked: number;
+    by_type: Partial<Record<"Single" | "Double" | "Suite", number>>;
+  };
+}
+
+const getAuthHeaders = () => {
+  const token = localStorage.getItem("token");
+  return {
+    Authorization: `Bearer ${token}`,
+    "Content-Type": "application/json",
+  };
+};
+
+export const getAdminStats = async (params?: {
+  from?: string;
+  to?: string;
+  group_by?: StatsGroupBy;
+}): Promise<AdminStats> => {
+  const queryParams = new URLSearchParams();
+  if (params?.from) queryParams.append("from", params.from);
+  if (params?.to) queryParams.append("to", params.to);
+  if (params?.group_by) queryParams.append("group_by", params.group_by);
+
+  const url = `${API_BASE_URL}/admin/stats${
+    queryParams.toString() ? `?${queryParams.toString()}` : ""
+  }`;
+
+  const response = await axios.get<AdminStats>(url, {
+    headers: getAuthHeaders(),
+  });
+  return response.data;
+};
@@ -121,14 +121,22 @@ export const getBooking = async (bookingId: string): Promise<Booking> => {
   return response.data;
 };
 
+// Sending the same key again (e.g. retrying after a timeout) replays the
+// first response instead of repeating the write
+const withIdempotencyKey = (idempotencyKey?: string) =>
+  idempotencyKey
+    ? { ...getAuthHeaders(), "Idempotency-Key": idempotencyKey }
+    : getAuthHeaders();
+
 export const createBooking = async (
-  bookingData: CreateBookingData
+  bookingData: CreateBookingData,
+  idempotencyKey?: string
 ): Promise<{ message: string; booking_id: string }> => {
   const response = await axios.post<{ message: string; booking_id: string }>(
     `${API_BASE_URL}/booking`,
     bookingData,
     {
-      headers: getAuthHeaders(),
+      headers: withIdempotencyKey(idempotencyKey),
     }
   );
   return response.data;
@@ -136,26 +144,28 @@ export const createBooking = async (
 
 export const updateBooking = async (
   bookingId: string,
-  bookingData: UpdateBookingData
+  bookingData: UpdateBookingData,
+  idempotencyKey?: string
 ): Promise<{ message: string }> => {
   const response = await axios.put<{ message: string }>(
     `${API_BASE_URL}/booking/${bookingId}`,
     bookingData,
     {
-      headers: getAuthHeaders(),
+      headers: withIdempotencyKey(idempotencyKey),
     }
   );
   return response.data;
 };
 
 export const cancelBooking = async (
-  bookingId: string
+  bookingId: string,
+  idempotencyKey?: string
 ): Promise<{ message: string }> => {
   const response = await axios.post<{ message: string }>(
     `${API_BASE_URL}/booking/${bookingId}/cancel`,
     {},
     {
-      headers: getAuthHeaders(),
+      headers: withIdempotencyKey(idempotencyKey),
     }
   );
   return response.data;
@@ -166,3 +176,36 @@ export const deleteBooking = async (bookingId: string): Promise<void> => {
     headers: getAuthHeaders(),
   });
 };
+
+export interface QuoteRequest {
+  room_id: string;
+  start_date: string;
+  end_date: string;
+}
+
+export interface QuoteResult {
+  index: number;
+  status: "quoted" | "rejected";
+  room_id?: string;
+  start_date?: string;
+  end_date?: string;
+  nights?: number;
+  subtotal?: number;
+  discount?: number;
+  total_price?: number;
+  message?: string;
+  errors?: Record<string, string[]>;
+}
+
+export const getQuotes = async (
+  stays: QuoteRequest[]
+): Promise<QuoteResult[]> => {
+  const response = await axios.post<{ quotes: QuoteResult[] }>(
+    `${API_BASE_URL}/quotes`,
+    { stays },
+    {
+      headers: getAuthHeaders(),
+    }
+  );
+  return response.data.quotes;
+};
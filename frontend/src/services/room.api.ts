@@ -73,6 +73,42 @@ export const getAllRooms = async (params?: {
   return response.data as Room[];
 };
 
+export interface AvailableRoom extends Room {
+  total_price: number;
+  // Set when another guest holds the room for the searched dates
+  held?: boolean;
+}
+
+export const getAvailableRooms = async (params: {
+  start: string;
+  end: string;
+  room_type?: string;
+  min_price?: number;
+  max_price?: number;
+  page?: number;
+  per_page?: number;
+}): Promise<PaginatedResponse<AvailableRoom>> => {
+  const queryParams = new URLSearchParams();
+  queryParams.append("start", params.start);
+  queryParams.append("end", params.end);
+  if (params.room_type) queryParams.append("room_type", params.room_type);
+  if (params.min_price !== undefined)
+    queryParams.append("min_price", params.min_price.toString());
+  if (params.max_price !== undefined)
+    queryParams.append("max_price", params.max_price.toString());
+  if (params.page) queryParams.append("page", params.page.toString());
+  if (params.per_page)
+    queryParams.append("per_page", params.per_page.toString());
+
+  const response = await axios.get<PaginatedResponse<AvailableRoom>>(
+    `${API_BASE_URL}/rooms/available?${queryParams.toString()}`,
+    {
+      headers: getAuthHeaders(),
+    }
+  );
+  return response.data;
+};
+
 export const getRoom = async (roomId: string): Promise<Room> => {
   const response = await axios.get<Room>(`${API_BASE_URL}/room/${roomId}`, {
     headers: getAuthHeaders(),
@@ -106,3 +142,32 @@ export const deleteRoom = async (roomId: string): Promise<void> => {
     headers: getAuthHeaders(),
   });
 };
+
+export interface RoomHold {
+  hold_id: string;
+  room_id: string;
+  start_date: string;
+  end_date: string;
+  expires_at: string;
+  total_price: number | null;
+}
+
+export const holdRoom = async (
+  roomId: string,
+  dates: { start_date: string; end_date: string }
+): Promise<RoomHold> => {
+  const response = await axios.post<RoomHold>(
+    `${API_BASE_URL}/room/${roomId}/hold`,
+    dates,
+    {
+      headers: getAuthHeaders(),
+    }
+  );
+  return response.data;
+};
+
+export const releaseHold = async (holdId: string): Promise<void> => {
+  await axios.delete(`${API_BASE_URL}/hold/${holdId}`, {
+    headers: getAuthHeaders(),
+  });
+};